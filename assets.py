@@ -0,0 +1,166 @@
+"""
+Pipeline des assets statiques (CSS/JS extraits des templates).
+
+    python assets.py          # ou : flask assets-build
+
+Sources : static/src/css/*.css, static/src/js/*.js et static/css/style.css.
+Sortie  : static/dist/<nom>.<hash>.<ext> minifié + variantes .gz / .br, et
+static/dist/manifest.json (nom logique → fichier versionné).
+
+Les templates référencent les fichiers via asset_url("css/index.css") ; sans
+manifest (poste de dev non buildé) on retombe sur le fichier source.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # variante .br optionnelle
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIRNAME = "dist"
+MANIFEST = "manifest.json"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+bp = Blueprint("assets", __name__, cli_group=None)
+
+
+# ========= Sources =========
+def discover_sources(static_dir=STATIC_DIR):
+    """{nom logique: chemin relatif à static/}"""
+    sources = {"css/style.css": "css/style.css"}
+    for kind in ("css", "js"):
+        folder = os.path.join(static_dir, "src", kind)
+        if os.path.isdir(folder):
+            for name in sorted(os.listdir(folder)):
+                if name.endswith("." + kind):
+                    sources[f"{kind}/{name}"] = f"src/{kind}/{name}"
+    return sources
+
+
+# ========= Minification =========
+def minify_css(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    text = re.sub(r"([^\s(]):\s+", r"\1:", text)  # « a: b » → « a:b » (sans toucher « a :hover »)
+    text = text.replace(";}", "}")
+    return text.strip() + "\n"
+
+
+def minify_js(text):
+    """Minification prudente : indentation, lignes vides et commentaires de ligne entière."""
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//"):
+            continue
+        lines.append(stripped)
+    return "\n".join(lines) + "\n"
+
+
+# ========= Build =========
+def build_assets(static_dir=STATIC_DIR):
+    """Génère les fichiers versionnés + .gz/.br et le manifest. Retourne le manifest."""
+    dist_dir = os.path.join(static_dir, DIST_DIRNAME)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    for logical, rel_path in discover_sources(static_dir).items():
+        with open(os.path.join(static_dir, rel_path), encoding="utf-8") as f:
+            source = f.read()
+        ext = logical.rsplit(".", 1)[1]
+        content = (minify_css(source) if ext == "css" else minify_js(source)).encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        base = os.path.basename(logical).rsplit(".", 1)[0]
+        filename = f"{base}.{digest}.{ext}"
+        path = os.path.join(dist_dir, filename)
+
+        with open(path, "wb") as f:
+            f.write(content)
+        with open(path + ".gz", "wb") as f:
+            # mtime=0 : sortie identique d'un build à l'autre
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+                gz.write(content)
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[logical] = filename
+
+    # Nettoyage des anciennes versions
+    keep = set(manifest.values())
+    for name in os.listdir(dist_dir):
+        if name != MANIFEST and name.split(".gz")[0].split(".br")[0] not in keep:
+            os.remove(os.path.join(dist_dir, name))
+
+    with open(os.path.join(dist_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    try:
+        with open(os.path.join(static_dir, DIST_DIRNAME, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# ========= Flask =========
+def asset_url(name):
+    """URL versionnée d'un asset (fichier source si le build n'a pas été lancé)."""
+    manifest = current_app.extensions["assets_manifest"]
+    if current_app.debug:
+        manifest = load_manifest(current_app.static_folder)
+    filename = manifest.get(name)
+    if filename:
+        return url_for("assets.serve_asset", filename=filename)
+    return url_for("static", filename=discover_sources(current_app.static_folder).get(name, name))
+
+
+@bp.route("/assets/<path:filename>")
+def serve_asset(filename):
+    """Sert la variante précompressée acceptée par le client, cache immuable (nom versionné)."""
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIRNAME)
+    accepted = request.headers.get("Accept-Encoding", "")
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if candidate in accepted and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+            encoding = candidate
+            break
+
+    mimetype = "text/css" if filename.endswith(".css") else "application/javascript"
+    if encoding:
+        response = send_from_directory(dist_dir, filename + (".br" if encoding == "br" else ".gz"),
+                                       mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    response.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@bp.cli.command("assets-build")
+def assets_build_cli():
+    """Minifie, versionne et précompresse les assets statiques."""
+    manifest = build_assets(current_app.static_folder)
+    print(f"✅ {len(manifest)} assets générés dans static/{DIST_DIRNAME}/")
+
+
+def init_assets(app):
+    app.extensions["assets_manifest"] = load_manifest(app.static_folder)
+    app.jinja_env.globals["asset_url"] = asset_url
+    app.register_blueprint(bp)
+
+
+if __name__ == "__main__":
+    result = build_assets()
+    print(f"✅ {len(result)} assets générés dans static/{DIST_DIRNAME}/")
@@ -0,0 +1,97 @@
+"""
+Stockage des pièces jointes (justificatifs de formation).
+
+- écriture en flux par blocs, sha256 et taille calculés au fil de l'eau ;
+  au-delà de ATTACHMENT_MAX_BYTES l'écriture s'arrête (AttachmentTooLarge)
+- déduplication par contenu : un fichier déjà connu n'est ni réécrit ni renvoyé sur GitHub
+- noms assainis (secure_filename), fichiers locaux nommés par hash :
+  ATTACHMENT_FOLDER/<2 premiers caractères>/<sha256>
+- copie GitHub (raw) en secours si le fichier local a disparu (disque éphémère)
+"""
+import hashlib
+import mimetypes
+import os
+import tempfile
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+
+from models import db, Attachment
+
+CHUNK_SIZE = 64 * 1024
+
+
+class AttachmentTooLarge(ValueError):
+    """Fichier plus gros que ATTACHMENT_MAX_BYTES."""
+
+    def __init__(self, limit):
+        super().__init__(f"Pièce jointe supérieure à {limit} octets")
+        self.limit = limit
+
+
+def safe_name(filename):
+    """Nom d'origine sans chemin, espaces ni caractères spéciaux."""
+    return secure_filename(filename or "") or "attachment"
+
+
+def local_path(sha256):
+    return os.path.join(current_app.config["ATTACHMENT_FOLDER"], sha256[:2], sha256)
+
+
+def _spool(stream, folder, max_bytes):
+    """Copie `stream` dans un fichier temporaire de `folder` → (chemin, sha256, taille)."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise AttachmentTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+
+def store_attachment(file_storage, upload=None):
+    """
+    Enregistre un FileStorage et retourne l'Attachment (existant si même contenu).
+    `upload(path, github_path) -> (html_url, raw_url)` : copie distante optionnelle.
+    """
+    folder = current_app.config["ATTACHMENT_FOLDER"]
+    os.makedirs(folder, exist_ok=True)
+    tmp_path, sha256, size = _spool(file_storage.stream, folder,
+                                    current_app.config["ATTACHMENT_MAX_BYTES"])
+
+    existing = Attachment.query.filter_by(sha256=sha256).first()
+    if existing is not None:
+        os.remove(tmp_path)
+        return existing
+
+    path = local_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+    filename = safe_name(file_storage.filename)
+    attachment = Attachment(
+        sha256=sha256,
+        filename=filename,
+        content_type=file_storage.mimetype or mimetypes.guess_type(filename)[0],
+        size=size,
+    )
+    if upload is not None:
+        _, attachment.storage_url = upload(path, f"media/attachments/{sha256[:2]}/{sha256}_{filename}")
+
+    db.session.add(attachment)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # Même fichier envoyé en parallèle : on garde la ligne déjà commitée
+        db.session.rollback()
+        return Attachment.query.filter_by(sha256=sha256).one()
+    return attachment
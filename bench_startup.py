@@ -0,0 +1,98 @@
+"""
+Mesure du temps de démarrage d'un worker.
+
+    python bench_startup.py                 # dossier courant
+    python bench_startup.py --runs 10
+
+- cold start   : import de app.py dans un processus neuf (gunicorn sans --preload, `flask db …`)
+- first request: cold start + première réponse servie
+- fork         : worker forké depuis un maître qui a préchargé l'app (gunicorn --preload),
+                 du fork jusqu'à la première réponse
+- modules lourds chargés après l'import (reportlab, qrcode, requests, numpy)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("reportlab", "qrcode", "requests", "PIL", "numpy")
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import app
+t1 = time.perf_counter()
+client = app.test_client()
+client.get("/login")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": t2 - t0,
+                  "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _env(app_dir):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(app_dir, "startup_bench.db"))
+    env["DB_WARMUP_CONNECTIONS"] = "0"
+    env["PYTHONPATH"] = app_dir
+    env["PYTHONDONTWRITEBYTECODE"] = "0"
+    return env
+
+
+def cold_start(app_dir, runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _CHILD], cwd=app_dir, env=_env(app_dir),
+                             capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def fork_start(app_dir, runs):
+    """Temps fork → première réponse avec l'app préchargée dans le parent."""
+    os.environ.update(_env(app_dir))
+    sys.path.insert(0, app_dir)
+    os.chdir(app_dir)
+    from app import app  # préchargement (maître gunicorn)
+
+    timings = []
+    for _ in range(runs):
+        read_fd, write_fd = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            app.test_client().get("/login")
+            os.write(write_fd, repr(time.perf_counter() - start).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            timings.append(float(pipe.read()))
+        os.waitpid(pid, 0)
+    return timings
+
+
+def _ms(values):
+    return f"{statistics.median(values) * 1000:8.1f} ms (min {min(values) * 1000:.1f})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage des workers.")
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args(argv)
+    app_dir = os.path.abspath(args.app_dir)
+
+    cold = cold_start(app_dir, args.runs)
+    print(f"cold start (import app)      : {_ms([r['import'] for r in cold])}")
+    print(f"cold start → 1re réponse     : {_ms([r['first_request'] for r in cold])}")
+    print(f"modules lourds après import  : {', '.join(cold[0]['heavy']) or 'aucun'}")
+    if hasattr(os, "fork"):
+        print(f"fork préchargé → 1re réponse : {_ms(fork_start(app_dir, args.runs))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark des pages principales via le client de test Flask, sur une base
+produite par generate_data.py. L'API GitHub est simulée localement.
+
+    python generate_data.py --database-url sqlite:///bench.db --scale 0.02 --drop
+    python benchmark.py --database-url sqlite:///bench.db                  # compare à bench_baseline.json
+    python benchmark.py --database-url sqlite:///bench.db --save-baseline  # met à jour la référence
+
+Code de sortie 1 si une latence p95 dépasse la référence au-delà de la
+tolérance, ou si un scénario émet plus de requêtes SQL qu'avant.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+_QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class _FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeGitHub:
+    """Remplace le module requests de github_uploader : aucun appel réseau."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return _FakeResponse(404, {})
+
+    def put(self, url, **kwargs):
+        self.calls += 1
+        return _FakeResponse(201, {"content": {"html_url": url.replace("api.github.com/repos", "github.com")}})
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _scenarios(employee_count, rng):
+    def employee_id():
+        return rng.randint(1, employee_count)
+
+    return [
+        ("index", lambda: "/index"),
+        ("search", lambda: f"/index?search={rng.choice(['Garc', 'María', 'Lopez', 'Tre'])}"),
+        ("employee_detail", lambda: f"/employee/{employee_id()}"),
+        ("employee_public", lambda: f"/employee/{employee_id()}/public"),
+        ("generate_badge", lambda: f"/badge/{employee_id()}"),
+        ("admin_dashboard", lambda: "/admin/dashboard"),
+    ]
+
+
+def run(app, iterations, seed=0):
+    from generate_data import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+    from models import db, Employee
+
+    with app.app_context():
+        employee_count = db.session.query(db.func.max(Employee.id)).scalar() or 0
+    if not employee_count:
+        raise SystemExit("❌ Base vide : lancer generate_data.py d'abord.")
+
+    client = app.test_client()
+    response = client.post("/login", data={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+    if response.status_code != 302:
+        raise SystemExit("❌ Connexion impossible avec l'administrateur de benchmark.")
+
+    rng = random.Random(seed)
+    results = {}
+    for name, make_path in _scenarios(employee_count, rng):
+        client.get(make_path())  # échauffement (caches, compilation des templates)
+        latencies, queries = [], []
+        for _ in range(iterations):
+            path = make_path()
+            start = time.perf_counter()
+            response = client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise SystemExit(f"❌ {name}: {path} → HTTP {response.status_code}")
+            match = _QUERIES_RE.search(response.headers.get("Server-Timing", ""))
+            queries.append(int(match.group(1)) if match else 0)
+
+        results[name] = {
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies), 2),
+            "queries": max(queries),
+            "queries_mean": round(statistics.mean(queries), 1),
+        }
+    return {"employees": employee_count, "iterations": iterations, "scenarios": results}
+
+
+def compare(current, baseline, tolerance, min_delta_ms=0):
+    """Liste des régressions par rapport à la référence."""
+    regressions = []
+    if baseline.get("employees") != current["employees"]:
+        print(f"⚠️ Référence mesurée sur {baseline.get('employees')} employés, "
+              f"base actuelle : {current['employees']} — latences non comparables.")
+        check_latency = False
+    else:
+        check_latency = True
+
+    for name, result in current["scenarios"].items():
+        ref = baseline.get("scenarios", {}).get(name)
+        if not ref:
+            continue
+        if result["queries"] > ref["queries"]:
+            regressions.append(f"{name}: {result['queries']} requêtes SQL (référence {ref['queries']})")
+        if check_latency and result["p95_ms"] > ref["p95_ms"] * (1 + tolerance) + min_delta_ms:
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms (référence {ref['p95_ms']}ms)")
+    return regressions
+
+
+def print_report(current, baseline=None):
+    header = f"{'scénario':<18}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'SQL':>6}{'réf p95':>10}{'réf SQL':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in current["scenarios"].items():
+        ref = (baseline or {}).get("scenarios", {}).get(name, {})
+        print(f"{name:<18}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}{r['queries']:>6}"
+              f"{ref.get('p95_ms', '-'):>10}{ref.get('queries', '-'):>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des pages Skill Matrix.")
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Marge de latence tolérée (0.25 = +25 %%)")
+    parser.add_argument("--min-delta-ms", type=float, default=50,
+                        help="Écart absolu ignoré (bruit de mesure sur les pages rapides)")
+    parser.add_argument("--output", help="Écrit les résultats JSON dans ce fichier")
+    args = parser.parse_args(argv)
+
+    # La configuration est lue à l'import de l'app : variables posées avant
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("DB_WARMUP_CONNECTIONS", "0")
+    os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+    os.environ.setdefault("STRICT_LAZY_LOAD", "raise")  # un N+1 fait échouer le scénario
+
+    import github_uploader
+    github_uploader.requests = FakeGitHub()
+    from app import app
+    app.config["SLOW_REQUEST_MS"] = float("inf")
+
+    # Les badges générés pendant le benchmark ne doivent pas rester dans media/
+    badge_dir = os.path.join(app.root_path, "media", "qrcodes")
+    existing = set(os.listdir(badge_dir)) if os.path.isdir(badge_dir) else set()
+    try:
+        current = run(app, args.iterations)
+    finally:
+        for name in set(os.listdir(badge_dir)) - existing if os.path.isdir(badge_dir) else ():
+            os.remove(os.path.join(badge_dir, name))
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_report(current, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"💾 Référence enregistrée : {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare(current, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("❌ Régressions :")
+            for line in regressions:
+                print("  -", line)
+            return 1
+        print("✅ Aucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+def register_blueprints(app):
+    """Enregistre les blueprints de l'application."""
+    from blueprints import admin, attachments, auth, badges, changes, employees, matrix, search, skills, trainers
+
+    for module in (auth, employees, skills, trainers, search, matrix, badges, attachments, changes, admin):
+        app.register_blueprint(module.bp)
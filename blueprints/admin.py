@@ -0,0 +1,190 @@
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, abort, jsonify
+from flask_login import current_user, login_required
+from flask_babel import _
+import hmac
+import os
+
+import click
+from sqlalchemy.orm import joinedload
+
+from bulk_ops import BULK_FIELDS, bulk_update_employees, bulk_delete_employees
+from database import pool_stats, statement_timeout
+from db_routing import read_only, replica_stats
+from fragment_cache import fragment_cache_stats
+from instrumentation import metrics
+from models import db, Employee, User, AuditLog
+from plant_scope import PLANTS, assign_plants
+from query_guard import query_budget
+from utils import admin_required, audit_log
+
+# cli_group=None : commandes au premier niveau (flask bulk-employees)
+bp = Blueprint("admin", __name__, cli_group=None)
+
+
+@bp.route("/admin/dashboard")
+@read_only
+@login_required
+@query_budget(5)
+def admin_dashboard():
+    admin_required()
+    logs = AuditLog.query.options(joinedload(AuditLog.user)).order_by(AuditLog.created_at.desc()).limit(50).all()
+    users = User.query.all()
+    return render_template("admin_dashboard.html", logs=logs, users=users, plants=PLANTS)
+
+@bp.route("/admin/db/pool")
+@login_required
+def admin_pool_stats():
+    admin_required()
+    return jsonify(pool_stats())
+
+@bp.route("/admin/metrics")
+def admin_metrics():
+    # Scraper Prometheus : jeton Bearer (METRICS_TOKEN) ou session admin
+    token = current_app.config.get("METRICS_TOKEN") or os.getenv("METRICS_TOKEN")
+    header = request.headers.get("Authorization", "")
+    if not token or not header.startswith("Bearer "):
+        admin_required()
+    elif not hmac.compare_digest(header[len("Bearer "):].encode(), token.encode()):
+        admin_required()
+    gauges = {f"skill_matrix_db_pool_{k}": v for k, v in pool_stats().items() if isinstance(v, int)}
+    gauges.update({f"skill_matrix_fragment_cache_{k}": v for k, v in fragment_cache_stats().items()})
+    gauges.update({f"skill_matrix_db_{k}": v for k, v in replica_stats().items()})
+    return metrics.render(gauges), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@bp.route("/admin/employees/bulk", methods=["GET", "POST"])
+@login_required
+@statement_timeout(120000)
+def bulk_employees():
+    admin_required()
+    filters = {f: request.values.get(f"filter_{f}", "").strip() for f in BULK_FIELDS}
+
+    if request.method == "POST":
+        ids = [i.strip() for i in request.form.getlist("employee_ids") if i.strip()]
+        if not all(i.isdigit() for i in ids):
+            abort(400)
+        ids = [int(i) for i in ids]
+        action = request.form.get("action")
+        if not ids:
+            flash(_("⚠️ No employee selected."), "warning")
+        elif action == "delete":
+            count = bulk_delete_employees(ids, current_user.id, request.remote_addr, request.headers.get("User-Agent"))
+            flash(_("🗑️ %(count)s employees deleted.", count=count), "info")
+        else:
+            values = {"status": "Inactive"} if action == "deactivate" else {action: request.form.get("value", "").strip()}
+            if action not in BULK_FIELDS + ("deactivate",) or not all(values.values()):
+                flash(_("⚠️ Please choose an action and a value."), "warning")
+            else:
+                count = bulk_update_employees(ids, values, current_user.id, request.remote_addr,
+                                              request.headers.get("User-Agent"))
+                flash(_("✅ %(count)s employees updated.", count=count), "success")
+        return redirect(url_for("admin.bulk_employees", **{f"filter_{k}": v for k, v in filters.items() if v}))
+
+    employees = []
+    if any(filters.values()):
+        query = db.session.query(Employee.id, Employee.first_name, Employee.last_name, Employee.position,
+                                 Employee.department, Employee.plant, Employee.status)
+        for field, value in filters.items():
+            if value:
+                query = query.filter(getattr(Employee, field) == value)
+        employees = query.order_by(Employee.id).all()
+
+    choices = {f: [v[0] for v in db.session.query(getattr(Employee, f)).distinct().order_by(getattr(Employee, f)) if v[0]]
+               for f in BULK_FIELDS}
+    return render_template("bulk_employees.html", employees=employees, filters=filters, choices=choices)
+
+@bp.cli.command("bulk-employees")
+@click.option("--ids", help="IDs séparés par des virgules")
+@click.option("--where-plant")
+@click.option("--where-department")
+@click.option("--where-position")
+@click.option("--set-plant")
+@click.option("--set-department")
+@click.option("--set-position")
+@click.option("--deactivate", is_flag=True, help="Passe le statut à Inactive")
+@click.option("--delete", "delete_", is_flag=True, help="Supprime les employés sélectionnés")
+@click.option("--yes", is_flag=True, help="Pas de confirmation")
+def bulk_employees_cli(ids, where_plant, where_department, where_position,
+                       set_plant, set_department, set_position, deactivate, delete_, yes):
+    """Met à jour / supprime des employés en masse (une transaction)."""
+    query = db.session.query(Employee.id)
+    if ids:
+        parts = [i.strip() for i in ids.split(",") if i.strip()]
+        if not all(i.isdigit() for i in parts):
+            raise click.BadParameter("entiers séparés par des virgules attendus", param_hint="--ids")
+        query = query.filter(Employee.id.in_([int(i) for i in parts]))
+    for column, value in ((Employee.plant, where_plant), (Employee.department, where_department),
+                          (Employee.position, where_position)):
+        if value:
+            query = query.filter(column == value)
+    if not (ids or where_plant or where_department or where_position):
+        raise click.UsageError("Préciser --ids ou au moins un filtre --where-*.")
+
+    selected = [row.id for row in query]
+    values = {"plant": set_plant, "department": set_department, "position": set_position}
+    if deactivate:
+        values["status"] = "Inactive"
+    if not delete_ and not any(values.values()):
+        raise click.UsageError("Aucune action : --set-*, --deactivate ou --delete.")
+
+    click.echo(f"{len(selected)} employé(s) sélectionné(s).")
+    if not selected or not (yes or click.confirm("Continuer ?")):
+        return
+    if delete_:
+        count = bulk_delete_employees(selected, user_agent="flask bulk-employees")
+    else:
+        count = bulk_update_employees(selected, values, user_agent="flask bulk-employees")
+    click.echo(f"✅ {count} employé(s) traité(s).")
+
+@bp.route("/admin/users")
+@login_required
+def admin_users():
+    admin_required()
+    users = User.query.order_by(User.created_at.desc()).all()
+    return render_template("admin_users.html", users=users)
+
+@bp.route("/admin/users/<int:user_id>/role", methods=["POST"])
+@login_required
+def set_user_role(user_id):
+    admin_required()
+    new_role = request.form["role"]
+    if new_role not in ("user", "admin"):
+        abort(400)
+    target = User.query.get_or_404(user_id)
+    old = target.role
+    target.role = new_role
+    db.session.commit()
+    audit_log("promote_user" if new_role == "admin" else "demote_user", "User", user_id, {"old": old, "new": new_role})
+    flash(_("Role updated: %(old)s → %(new)s", old=old, new=new_role), "success")
+    return redirect(url_for("admin.admin_users"))
+
+@bp.route("/admin/users/<int:user_id>/plants", methods=["POST"])
+@login_required
+def set_user_plants(user_id):
+    admin_required()
+    plants = request.form.getlist("plants")
+    if any(p not in PLANTS for p in plants):
+        abort(400)
+    target = User.query.get_or_404(user_id)
+    assign_plants(target, plants)
+    db.session.commit()
+    audit_log("set_user_plants", "User", user_id, {"plants": plants})
+    flash(_("Plants updated for %(user)s.", user=target.username), "success")
+    return redirect(url_for("admin.admin_dashboard"))
+
+@bp.cli.command("user-plants")
+@click.argument("email")
+@click.argument("plants", nargs=-1)
+@click.option("--all", "all_plants", is_flag=True, help="Retire toute restriction (toutes les usines)")
+def user_plants_cli(email, plants, all_plants):
+    """Attribue des usines à un utilisateur (sans argument : affiche les usines actuelles)."""
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise click.UsageError(f"Utilisateur inconnu : {email}")
+    unknown = [p for p in plants if p not in PLANTS]
+    if unknown:
+        raise click.UsageError(f"Usine(s) inconnue(s) : {', '.join(unknown)} (choix : {', '.join(PLANTS)})")
+    if plants or all_plants:
+        assign_plants(user, plants)
+        db.session.commit()
+    assigned = [p.plant for p in user.plants]
+    click.echo(f"{email} : {', '.join(assigned) if assigned else 'toutes les usines'}")
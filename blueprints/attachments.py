@@ -0,0 +1,31 @@
+from flask import Blueprint, redirect, send_file, abort
+from flask_login import login_required
+import os
+
+from sqlalchemy import select
+
+from attachment_store import local_path
+from models import db, Attachment, EmployeeSkill
+
+bp = Blueprint("attachments", __name__)
+
+
+@bp.route("/attachment/<int:attachment_id>")
+@login_required
+def download_attachment(attachment_id):
+    # Fichier local : conditional=True → ETag, If-Modified-Since et requêtes Range (206)
+    # Affectation propriétaire lue par la session (filtre d'usine) : hors des usines de l'utilisateur, 404
+    owner = db.session.execute(
+        select(EmployeeSkill.id).where(EmployeeSkill.attachment_id == attachment_id).limit(1)).scalar()
+    if owner is None:
+        abort(404)
+    attachment = Attachment.query.get_or_404(attachment_id)
+    path = local_path(attachment.sha256)
+    if os.path.exists(path):
+        return send_file(path, mimetype=attachment.content_type or "application/octet-stream",
+                         download_name=attachment.filename, conditional=True, etag=attachment.sha256,
+                         max_age=3600)
+    # Disque éphémère : copie GitHub (raw.githubusercontent.com gère aussi Range)
+    if attachment.storage_url:
+        return redirect(attachment.storage_url)
+    abort(404)
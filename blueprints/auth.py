@@ -0,0 +1,61 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import login_user, logout_user, current_user, login_required
+from flask_babel import _
+
+from models import db, User
+from utils import audit_log
+
+bp = Blueprint("auth", __name__)
+
+
+@bp.route("/register", methods=["GET", "POST"])
+def register():
+    if request.method == "POST":
+        email = request.form.get("email", "").strip()
+        username = request.form.get("username", "").strip()
+        password = request.form.get("password", "").strip()
+
+        # doublon email (case-insensitive)
+        if User.query.filter(db.func.lower(User.email) == email.lower()).first():
+            flash(_("This email is already registered."), "warning")
+            return render_template("register.html")
+
+        u = User(username=username, email=email)
+        u.set_password(password)
+        u.role = "user"  # rôle par défaut
+
+        db.session.add(u)
+        db.session.commit()
+
+        audit_log("register", "User", u.id, {"email": email, "username": username})
+
+        flash(_("Account created successfully! You can now log in."), "success")
+        return redirect(url_for("auth.login"))
+
+    return render_template("register.html")
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    # ⚠️ NE PAS vider les flashes sinon ils ne s’affichent plus
+    if request.method == "POST":
+        email = request.form.get("email", "").strip().lower()
+        password = request.form.get("password", "").strip()
+
+        user = User.query.filter(db.func.lower(User.email) == email).first()
+
+        if user and user.check_password(password):
+            login_user(user)
+            audit_log("login", "User", user.id, {"email": user.email})
+            flash(_("Successfully logged in ✅"), "success")
+            return redirect(url_for("employees.index"))
+
+        flash(_("Invalid email or password ❌"), "danger")
+
+    return render_template("login.html")
+
+@bp.route("/logout")
+@login_required
+def logout():
+    audit_log("logout", "User", current_user.id, {"email": current_user.email})
+    logout_user()
+    return redirect(url_for("auth.login"))
@@ -0,0 +1,167 @@
+from flask import Blueprint, current_app, render_template, send_file
+import os
+
+from sqlalchemy.orm import joinedload
+
+from db_routing import read_only
+from fragment_cache import LazyQuery
+from instrumentation import timed
+from models import Employee, EmployeeSkill
+from plant_scope import SKIP_PLANT_SCOPE
+from query_guard import query_budget
+
+bp = Blueprint("badges", __name__)
+
+
+@bp.route("/badge/<int:employee_id>")
+def generate_badge(employee_id):
+    # ReportLab chargé au premier badge seulement (démarrage des workers plus rapide)
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    # Badge imprimable sans session (comme la fiche publique) : pas de filtre d'usine
+    employee = Employee.query.execution_options(**SKIP_PLANT_SCOPE).filter_by(id=employee_id).first_or_404()
+
+    media_qr_folder = os.path.join(current_app.root_path, "media", "qrcodes")
+    os.makedirs(media_qr_folder, exist_ok=True)
+
+    badge_path = os.path.join(media_qr_folder, f"badge_{employee.id}.pdf")
+
+    width, height = (5.9 * cm, 8.4 * cm)
+    c = canvas.Canvas(badge_path, pagesize=(width, height))
+
+    # === Contour ===
+    c.setStrokeColorRGB(0, 0, 0)
+    c.rect(0.1 * cm, 0.1 * cm, width - 0.2 * cm, height - 0.2 * cm)
+
+    # === Logos ===
+    assymex_logo = os.path.join(current_app.root_path, "static", "img", "logo_assymex.jpg")
+    electric_logo = os.path.join(current_app.root_path, "static", "img", "electric_assymex.jpg")
+    avocarbon_logo = os.path.join(current_app.root_path, "static", "img", "avocarbon_logo.png")
+
+    plant_name = (employee.plant or "").strip().lower()
+
+    # === Adresse & Logo selon le plant ===
+    if "assymex" in plant_name:
+        header_lines = [
+            "ASSYMEX MONTERREY, S.A. DE C.V.",
+            "San Sebastián No.110 Col. Los Lermas",
+            "67190 Guadalupe, N.L. México",
+            "Tels. +52 81 8127 2833 y +52 81 8127 2835"
+        ]
+        main_logo = assymex_logo
+
+    elif "rayones" in plant_name:
+        header_lines = [
+            "Electric Assymex del Sur, S.A. de C.V.",
+            "Entrada a Rayones, KM 49",
+            "Junto a bodega las Parcelas C.P. 67650",
+            "Rayones, N.L., México",
+            "Tél. : 81 8127 28 33 / 81 8127 28 35"
+        ]
+        main_logo = electric_logo
+
+    elif "galeana" in plant_name:
+        header_lines = [
+            "Electric Assymex del Sur, S.A. de C.V.",
+            "Galeana, N.L., MÉXICO",
+            "Tél. : 81 8127 28 33 / 81 8127 28 35"
+        ]
+        main_logo = electric_logo
+
+    else:
+        # Par défaut si le plant est vide ou inconnu
+        header_lines = [
+            "Electric Assymex del Sur, S.A. de C.V.",
+            "Galeana, N.L., MÉXICO",
+            "Tél. : 81 8127 28 33 / 81 8127 28 35"
+        ]
+        main_logo = electric_logo
+
+    # === Texte d’en-tête ===
+    c.setFont("Helvetica-Bold", 7)
+    y = height - 0.8 * cm
+    for line in header_lines:
+        c.drawCentredString(width / 2, y, line)
+        y -= 0.4 * cm
+
+    # Ligne de séparation
+    c.setStrokeColorRGB(0.75, 0.75, 0.75)
+    c.setLineWidth(0.4)
+    c.line(0.5 * cm, y - 0.2 * cm, width - 0.5 * cm, y - 0.2 * cm)
+
+    # === Logo principal (plant) ===
+    if os.path.exists(main_logo):
+        c.drawImage(main_logo, 0.7 * cm, height - 4.0 * cm,
+                    width=2.2 * cm, height=0.9 * cm,
+                    preserveAspectRatio=True, mask='auto')
+
+    # === QR Code ===
+    if employee.qr_code_path:
+        try:
+            with timed("http"):  # téléchargement de l'image GitHub par ReportLab
+                c.drawImage(employee.qr_code_path, 0.9 * cm, 1.9 * cm,
+                            width=2.0 * cm, height=2.0 * cm, mask='auto')
+        except Exception as e:
+            print(f"QR draw error: {e}")
+
+    # === Photo ===
+    if employee.photo_path:
+        try:
+            with timed("http"):
+                c.drawImage(employee.photo_path, 3.3 * cm, 1.9 * cm,
+                            width=2.4 * cm, height=3.2 * cm,
+                            preserveAspectRatio=True, mask='auto')
+        except Exception as e:
+            print(f"Photo draw error: {e}")
+            c.rect(3.3 * cm, 1.9 * cm, 2.4 * cm, 3.2 * cm)
+            c.setFont("Helvetica-Oblique", 6)
+            c.drawString(3.5 * cm, 3.8 * cm, "No Photo")
+    else:
+        c.rect(3.3 * cm, 1.9 * cm, 2.4 * cm, 3.2 * cm)
+        c.setFont("Helvetica-Oblique", 6)
+        c.drawString(3.5 * cm, 3.8 * cm, "No Photo")
+
+    # === Logo Avocarbon ===
+    if os.path.exists(avocarbon_logo):
+        c.drawImage(avocarbon_logo, width - 2.2 * cm, 0.25 * cm,
+                    width=1.7 * cm, height=0.7 * cm,
+                    preserveAspectRatio=True, mask='auto')
+
+    # === Nom et poste ===
+    c.setFillColorRGB(0.17, 0.35, 0.69)
+    c.rect(0.4 * cm, 0.6 * cm, width - 0.8 * cm, 1.2 * cm, fill=True, stroke=False)
+    c.setFillColorRGB(1, 1, 1)
+
+    full_name = f"{employee.first_name.upper()} {employee.last_name.upper()}"
+    c.setFont("Helvetica-Bold", 7)
+    c.drawCentredString(width / 2, 1.1 * cm, full_name)
+    if employee.position:
+        c.setFont("Helvetica", 6)
+        c.drawCentredString(width / 2, 0.7 * cm, employee.position.upper())
+
+    # === ID ===
+    c.setStrokeColorRGB(0.3, 0.3, 0.3)
+    c.setFillColorRGB(0.95, 0.95, 0.95)
+    c.rect(0.4 * cm, 0.2 * cm, 2.2 * cm, 0.35 * cm, fill=True, stroke=True)
+    c.setFont("Helvetica", 6)
+    c.setFillColorRGB(0, 0, 0)
+    c.drawString(0.6 * cm, 0.32 * cm, f"ID: {employee.id}")
+
+    with timed("pdf"):
+        c.save()
+    return send_file(badge_path, as_attachment=True)
+
+@bp.route("/employee/<int:employee_id>/public")
+@read_only
+@query_budget(4)
+def employee_public(employee_id):
+    # Fiche publique (QR code) : même contenu pour tous, sans filtre d'usine
+    employee = Employee.query.execution_options(**SKIP_PLANT_SCOPE).filter_by(id=employee_id).first_or_404()
+    # Compétences lues seulement si le fragment « public_skills » n'est pas en cache
+    skills = LazyQuery(EmployeeSkill.query
+                       .execution_options(**SKIP_PLANT_SCOPE)
+                       .options(joinedload(EmployeeSkill.skill))
+                       .filter_by(employee_id=employee_id)
+                       .order_by(EmployeeSkill.id))
+    return render_template("employee_public.html", employee=employee, skills=skills)
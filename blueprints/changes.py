@@ -0,0 +1,94 @@
+from flask import Blueprint, current_app, request, jsonify, abort
+from datetime import datetime
+import hmac
+import time
+
+import click
+
+from change_feed import cursor_since, push_subscription, push_subscriptions, read_changes
+from db_routing import read_only
+from models import db, ChangeLog, WebhookSubscription
+from utils import admin_required
+
+# cli_group=None : commandes au premier niveau (flask change-feed-push)
+bp = Blueprint("changes", __name__, cli_group=None)
+
+
+def _feed_client_required():
+    # Clients RH / MES : jeton Bearer (CHANGE_FEED_TOKENS) ou session admin
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        token = header[len("Bearer "):]
+        if any(hmac.compare_digest(token, t) for t in current_app.config.get("CHANGE_FEED_TOKENS", [])):
+            return
+    admin_required()
+
+
+@bp.route("/api/changes")
+@read_only
+def api_changes():
+    """?cursor=<seq> (ou ?since=AAAA-MM-JJTHH:MM:SS) &limit=500 → changements suivants."""
+    _feed_client_required()
+    config = current_app.config
+    limit = request.args.get("limit", config["CHANGE_FEED_PAGE_SIZE"], type=int)
+    limit = max(1, min(limit, config["CHANGE_FEED_MAX_PAGE_SIZE"]))
+    if "cursor" in request.args:
+        cursor = request.args.get("cursor", type=int)
+        if cursor is None or cursor < 0:
+            abort(400)
+    elif request.args.get("since"):
+        try:
+            cursor = cursor_since(datetime.fromisoformat(request.args["since"]))
+        except ValueError:
+            abort(400)
+    else:
+        cursor = 0
+    return jsonify(read_changes(cursor, limit))
+
+
+@bp.cli.command("change-feed-subscribe")
+@click.argument("name")
+@click.argument("url")
+@click.option("--secret", help="Clé HMAC-SHA256 (en-tête X-SkillMatrix-Signature)")
+@click.option("--from-start", is_flag=True, help="Envoie tout l'historique (sinon : à partir de maintenant)")
+def change_feed_subscribe(name, url, secret, from_start):
+    """Ajoute ou met à jour un abonné webhook du flux de changements."""
+    subscription = WebhookSubscription.query.filter_by(name=name).first()
+    if subscription is None:
+        subscription = WebhookSubscription(name=name, cursor=0)
+        if not from_start:
+            subscription.cursor = db.session.query(db.func.max(ChangeLog.id)).scalar() or 0
+        db.session.add(subscription)
+    elif from_start:
+        subscription.cursor = 0
+    subscription.url = url
+    subscription.secret = secret or subscription.secret
+    subscription.active = True
+    db.session.commit()
+    click.echo(f"✅ {name} → {url} (curseur {subscription.cursor})")
+
+
+@bp.cli.command("change-feed-push")
+@click.option("--name", help="Un seul abonné (par défaut : tous les actifs)")
+@click.option("--loop", "interval", type=int, default=0, help="Recommence toutes les N secondes")
+def change_feed_push(name, interval):
+    """Envoie par lots les changements en attente aux abonnés webhook."""
+    config = current_app.config
+    options = dict(batch_size=config["WEBHOOK_BATCH_SIZE"], timeout=config["WEBHOOK_TIMEOUT_SECONDS"],
+                   retries=config["WEBHOOK_RETRIES"])
+    while True:
+        if name:
+            subscription = WebhookSubscription.query.filter_by(name=name).first()
+            if subscription is None:
+                raise click.UsageError(f"Abonné inconnu : {name}")
+            results = {name: push_subscription(subscription, **options)}
+        else:
+            results = push_subscriptions(**options)
+        for sub_name, sent in results.items():
+            subscription = WebhookSubscription.query.filter_by(name=sub_name).first()
+            status = f"⚠️ {subscription.last_error}" if subscription.last_error else "ok"
+            click.echo(f"{sub_name}: {sent} changement(s), curseur {subscription.cursor} — {status}")
+        db.session.remove()
+        if not interval:
+            break
+        time.sleep(interval)
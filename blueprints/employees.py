@@ -0,0 +1,368 @@
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, abort
+from flask_login import current_user, login_required
+from flask_babel import _
+from datetime import datetime
+import os
+
+from sqlalchemy.orm import selectinload
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from models import db, Employee, Skill, EmployeeSkill
+from attachment_store import AttachmentTooLarge, store_attachment
+from db_routing import read_only
+from fragment_cache import LazyQuery
+from plant_scope import plant_allowed
+from query_guard import query_budget
+from trainers import resolve_trainer
+from utils import admin_required, audit_log
+
+bp = Blueprint("employees", __name__)
+
+
+def upload_to_github(file_path, github_path):
+    # Import paresseux : github_uploader / requests chargés au premier upload seulement
+    from github_uploader import upload_to_github as _upload
+    return _upload(file_path, github_path)
+
+
+def flash_attachment_too_large():
+    limit = current_app.config["ATTACHMENT_MAX_BYTES"]
+    flash(_("❌ Attachment too large (max %(size)s MB).", size=limit // (1024 * 1024)), "danger")
+
+
+@bp.app_errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    """Corps > MAX_CONTENT_LENGTH : refusé avant lecture, même message que AttachmentTooLarge."""
+    if request.path.startswith("/api/"):
+        return error
+    flash_attachment_too_large()
+    employee_id = (request.view_args or {}).get("employee_id")
+    if employee_id is not None:
+        return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+    return redirect(request.referrer or url_for("employees.index"))
+
+
+def make_qr_image(data):
+    """🔳 Image QR (qrcode/PIL importés au premier usage)."""
+    import qrcode
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=10, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.make_image(fill_color="black", back_color="white")
+
+
+@bp.route("/")
+def home():
+    if current_user.is_authenticated:
+        return redirect(url_for("employees.index"))
+    return redirect(url_for("auth.login"))
+
+@bp.route("/index")
+@read_only
+@login_required
+@query_budget(5)
+def index():
+    employee_id = request.args.get("id", "").strip()
+    search = request.args.get("search", "").strip()
+    position = request.args.get("position", "").strip()
+    department = request.args.get("department", "").strip()
+
+    query = Employee.query
+
+    if employee_id:
+        query = query.filter(Employee.id == employee_id)
+
+    if search:
+        query = query.filter(
+            (Employee.first_name.ilike(f"%{search}%")) |
+            (Employee.last_name.ilike(f"%{search}%"))
+        )
+
+    if position:
+        query = query.filter(Employee.position == position)
+
+    if department:
+        query = query.filter(Employee.department == department)
+
+    # Exécutée seulement si le fragment « employee_list » n'est pas en cache
+    employees = LazyQuery(query)
+    positions = [p[0] for p in db.session.query(Employee.position).distinct().all() if p[0]]
+    departments = [d[0] for d in db.session.query(Employee.department).distinct().all() if d[0]]
+
+    return render_template("index.html", employees=employees, positions=positions, departments=departments)
+
+@bp.route("/add_employee", methods=["GET", "POST"])
+@login_required
+def add_employee():
+    if request.method == "POST":
+        if not plant_allowed(request.form.get("plant")):
+            abort(403)
+        try:
+            id_value = int(request.form["id"])
+            first_name = request.form["first_name"]
+            last_name = request.form["last_name"]
+            position = request.form.get("position")
+            department = request.form.get("department")
+            hire_date_str = request.form.get("hire_date")
+            plant = request.form['plant']
+            hire_date = datetime.strptime(hire_date_str, "%Y-%m-%d").date() if hire_date_str else None
+
+            emp = Employee(
+                id=id_value,
+                first_name=first_name,
+                last_name=last_name,
+                position=position,
+                department=department,
+                plant=plant,
+                hire_date=hire_date
+            )
+            db.session.add(emp)
+            db.session.commit()
+
+            # 📸 Photo (optionnelle)
+            photo = request.files.get("photo")
+            if photo and photo.filename != "":
+                photos_folder = os.path.join(current_app.static_folder, "photos")
+                os.makedirs(photos_folder, exist_ok=True)
+                photo_filename = f"employee_{emp.id}.jpg"
+                photo_path = os.path.join(photos_folder, photo_filename)
+                photo.save(photo_path)
+
+                html_url, raw_url = upload_to_github(photo_path, f"media/photos/{photo_filename}")
+                emp.photo_path = raw_url
+                db.session.commit()
+                try:
+                    os.remove(photo_path)
+                except Exception:
+                    pass
+
+            # 🔳 QR Code
+            os.makedirs(current_app.config["UPLOAD_FOLDER"], exist_ok=True)
+            qr_data = url_for('badges.employee_public', employee_id=emp.id, _external=True)
+            qr_img = make_qr_image(qr_data)
+            qr_path = os.path.join(current_app.config["UPLOAD_FOLDER"], f"employee_{emp.id}.png")
+            qr_img.save(qr_path)
+
+            html_url, raw_url = upload_to_github(qr_path, f"media/qrcodes/employee_{emp.id}.png")
+            emp.qr_code_path = raw_url
+            db.session.commit()
+            try:
+                os.remove(qr_path)
+            except Exception:
+                pass
+
+            # 🧾 Audit
+            audit_log("add_employee", "Employee", emp.id, {
+                "name": f"{first_name} {last_name}",
+                "position": position,
+                "department": department
+            })
+
+            flash(_("✅ Employee added successfully!"), "success")
+            return redirect(url_for("employees.index"))
+
+        except Exception as e:
+            db.session.rollback()
+            # Audit best effort (si emp existe)
+            try:
+                if 'emp' in locals() and emp.id:
+                    audit_log("add_employee_failed", "Employee", emp.id, {"error": str(e)})
+            except Exception:
+                pass
+            flash(f"❌ {str(e)}", "danger")
+
+    return render_template("add_employee.html")
+
+@bp.route("/employee/<int:employee_id>")
+@read_only
+@login_required
+@query_budget(6)
+def employee_detail(employee_id):
+    employee = (Employee.query
+                .options(selectinload(Employee.skills).joinedload(EmployeeSkill.skill))
+                .filter_by(id=employee_id)
+                .first_or_404())
+    skills = Skill.query.all()
+    return render_template("employee_detail.html", employee=employee, skills=skills)
+
+@bp.route("/employee/<int:employee_id>/update_info", methods=["POST"])
+@login_required
+def update_employee_info(employee_id):
+    # Admin only
+    if current_user.role != "admin":
+        abort(403)
+
+    employee = Employee.query.get_or_404(employee_id)
+
+    # Get form data
+    new_position = request.form.get("position")
+    new_department = request.form.get("department")
+    new_plant = request.form.get("plant")
+
+    # Validation
+    if not new_position or not new_department or not new_plant:
+        flash(_("⚠️ Please fill in all fields."), "warning")
+        return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+    # Store old values for audit
+    old_position = employee.position
+    old_department = employee.department
+    old_plant = employee.plant
+
+    # Update values
+    employee.position = new_position
+    employee.department = new_department
+    employee.plant = new_plant
+
+    db.session.commit()
+
+    # Audit log
+    audit_log("update_employee_info", "Employee", employee_id, {
+        "old_position": old_position,
+        "new_position": new_position,
+        "old_department": old_department,
+        "new_department": new_department,
+        "old_plant": old_plant,
+        "new_plant": new_plant
+    })
+
+    flash(_("✅ Employee information updated successfully!"), "success")
+    return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+@bp.route('/employee/<int:employee_id>/skill/<int:skill_id>/delete', methods=['POST'])
+@login_required
+def delete_employee_skill(employee_id, skill_id):
+    if current_user.role != "admin":
+        abort(403)
+
+    employee_skill = EmployeeSkill.query.get_or_404(skill_id)
+    db.session.delete(employee_skill)
+    db.session.commit()
+
+    flash(_("🗑️ Skill deleted successfully!"), "success")
+    return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+@bp.route('/employee/<int:employee_id>/skill/<int:skill_id>/update', methods=['POST'])
+@login_required
+def update_employee_skill(employee_id, skill_id):
+    if current_user.role != "admin":
+        abort(403)
+
+    es = EmployeeSkill.query.get_or_404(skill_id)
+    old_level, old_trainer = es.level, es.trainer
+    trainer = resolve_trainer(request.form.get('trainer'))  # avant les modifications (autoflush)
+    es.level = request.form.get('level')
+    es.trainer = request.form.get('trainer')  # texte saisi conservé
+    es.trainer_id = trainer.id if trainer else None
+    es.remarks = request.form.get('remarks')
+    last_assessed_str = request.form.get('last_assessed')  # réévaluation : date du jour par défaut
+    es.last_assessed = datetime.strptime(last_assessed_str, "%Y-%m-%d").date() if last_assessed_str else datetime.now().date()
+
+    db.session.commit()
+
+    audit_log("update_employee_skill", "EmployeeSkill", es.id, {
+        "employee_id": employee_id,
+        "skill_id": es.skill_id,
+        "old_level": old_level,
+        "new_level": es.level,
+        "old_trainer": old_trainer,
+        "new_trainer": es.trainer,
+        "last_assessed": es.last_assessed.isoformat()
+    })
+    flash(_("✅ Skill updated successfully!"), "success")
+    return redirect(url_for('employees.employee_detail', employee_id=employee_id))
+
+@bp.route("/employee/<int:employee_id>/update_photo", methods=["POST"])
+@login_required
+def update_employee_photo(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    photo = request.files.get("photo")
+    if not photo or photo.filename == "":
+        flash(_("⚠️ No file selected."), "warning")
+        return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+    photos_folder = os.path.join(current_app.static_folder, "photos")
+    os.makedirs(photos_folder, exist_ok=True)
+    photo_filename = f"employee_{employee.id}.jpg"
+    photo_path = os.path.join(photos_folder, photo_filename)
+    photo.save(photo_path)
+
+    html_url, raw_url = upload_to_github(photo_path, f"media/photos/{photo_filename}")
+    employee.photo_path = raw_url
+    db.session.commit()
+    try:
+        os.remove(photo_path)
+    except Exception:
+        pass
+
+    audit_log("update_employee_photo", "Employee", employee_id)
+    flash(_("✅ Profile photo updated successfully!"), "success")
+    return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+@bp.route("/employee/<int:employee_id>/add_skill", methods=["POST"])
+@login_required
+def add_skill_to_employee(employee_id):
+    if db.session.get(Employee, employee_id) is None:  # hors des usines de l'utilisateur : 404
+        abort(404)
+    skill_id = request.form["skill_id"]
+    level = request.form["level"]
+    trainer_name = request.form.get("trainer")
+    trainer = resolve_trainer(trainer_name)
+    remarks = request.form.get("remarks")
+    last_assessed_str = request.form.get("last_assessed")
+    last_assessed = datetime.strptime(last_assessed_str, "%Y-%m-%d").date() if last_assessed_str else datetime.now().date()
+
+    attachment_file = request.files.get("attachment")
+    attachment = None
+
+    if attachment_file and attachment_file.filename != "":
+        try:
+            attachment = store_attachment(attachment_file, upload=upload_to_github)
+        except AttachmentTooLarge:
+            flash_attachment_too_large()
+            return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+    new_entry = EmployeeSkill(
+        employee_id=employee_id,
+        skill_id=skill_id,
+        level=level,
+        last_assessed=last_assessed,
+        trainer=trainer_name,
+        trainer_id=trainer.id if trainer else None,
+        remarks=remarks,
+        attachment_id=attachment.id if attachment else None,
+    )
+    db.session.add(new_entry)
+    db.session.commit()
+
+    audit_log("assign_skill", "EmployeeSkill", new_entry.id, {
+        "employee_id": employee_id,
+        "skill_id": skill_id,
+        "level": level,
+        "trainer": trainer_name,
+        "attachment_id": attachment.id if attachment else None
+    })
+    flash(_("🧠 Skill added successfully!"), "success")
+    return redirect(url_for("employees.employee_detail", employee_id=employee_id))
+
+@bp.route("/employee/<int:employee_id>/delete", methods=["POST"])
+@login_required
+def delete_employee(employee_id):
+    admin_required()
+
+    employee = Employee.query.get_or_404(employee_id)
+
+    # supprimer liaisons
+    EmployeeSkill.query.filter_by(employee_id=employee.id).delete()
+
+    db.session.delete(employee)
+    db.session.commit()
+
+    audit_log("delete_employee", "Employee", employee_id, {
+        "name": f"{employee.first_name} {employee.last_name}",
+        "position": employee.position,
+        "department": employee.department,
+    })
+
+    flash(_("🗑️ Employee deleted successfully!"), "info")
+    return redirect(url_for("employees.index"))
@@ -0,0 +1,214 @@
+from flask import Blueprint, render_template, request, jsonify, abort
+from flask_login import login_required
+from datetime import datetime, date, time, timedelta
+
+from db_routing import read_only
+from models import db, Employee, Skill
+from plant_scope import plant_filter, visible_plants
+from skill_history import matrix_as_of, progression
+
+bp = Blueprint("matrix", __name__)
+
+
+def _as_of_arg():
+    """?date=AAAA-MM-JJ → fin de journée (exclue) ; aujourd'hui par défaut."""
+    raw = request.args.get("date", "").strip()
+    try:
+        day = datetime.strptime(raw, "%Y-%m-%d").date() if raw else date.today()
+    except ValueError:
+        abort(400)
+    return day, datetime.combine(day + timedelta(days=1), time.min)
+
+
+@bp.route("/matrix/history")
+@read_only
+@login_required
+def matrix_history():
+    day, as_of = _as_of_arg()
+    plant = request.args.get("plant", "").strip()
+    line = request.args.get("line", "").strip()
+    lines = [l[0] for l in db.session.query(Skill.category).distinct().order_by(Skill.category).all() if l[0]]
+
+    # Pivot employés × compétences, seulement sur une usine ou une ligne (sinon trop large)
+    employees, skills, levels = {}, {}, {}
+    if plant or line:
+        for row in matrix_as_of(as_of, plant=plant_filter(plant), category=line or None):
+            employees[row.employee_id] = f"{row.first_name or ''} {row.last_name or ''}".strip() or f"#{row.employee_id}"
+            skills[row.skill_id] = row.skill_name or f"#{row.skill_id}"
+            levels[(row.employee_id, row.skill_id)] = row.level
+
+    return render_template("matrix_history.html", day=day, plant=plant, line=line, plants=visible_plants(),
+                           lines=lines, employees=employees, skills=skills, levels=levels)
+
+
+@bp.route("/api/matrix/as-of")
+@read_only
+@login_required
+def api_matrix_as_of():
+    day, as_of = _as_of_arg()
+    rows = matrix_as_of(as_of, plant=plant_filter(request.args.get("plant")),
+                        category=request.args.get("line") or None)
+    return jsonify({
+        "date": day.isoformat(),
+        "items": [{
+            "employee_id": r.employee_id,
+            "skill_id": r.skill_id,
+            "skill_name": r.skill_name,
+            "level": r.level,
+            "plant": r.plant,
+            "since": r.changed_at.isoformat(),
+        } for r in rows],
+    })
+
+
+@bp.route("/api/employee/<int:employee_id>/progression")
+@read_only
+@login_required
+def api_employee_progression(employee_id):
+    if db.session.get(Employee, employee_id) is None:
+        abort(404)
+    skill_id = request.args.get("skill_id", type=int)
+    return jsonify({
+        "employee_id": employee_id,
+        "items": [{
+            "skill_id": r.skill_id,
+            "skill_name": r.skill_name,
+            "change": r.change_type,
+            "from": r.previous_level,
+            "to": r.level,
+            "trainer": r.trainer,
+            "at": r.changed_at.isoformat(),
+        } for r in progression(employee_id, skill_id)],
+    })
+
+
+@bp.route("/employee/<int:employee_id>/similar")
+@read_only
+@login_required
+def employee_similar(employee_id):
+    from skill_vectors import METRICS  # NumPy chargé à la première recherche seulement
+
+    employee = Employee.query.get_or_404(employee_id)
+    plant = request.args.get("plant", employee.plant or "").strip()
+    line = request.args.get("line", "").strip()
+    metric = request.args.get("metric", "cosine")
+    if metric not in METRICS:
+        abort(400)
+    results = _similar_with_employees(employee_id, request.args.get("k", 10, type=int), plant, line, metric)
+    lines = [l[0] for l in db.session.query(Skill.category).distinct().order_by(Skill.category).all() if l[0]]
+    return render_template("similar_employees.html", employee=employee, results=results, plant=plant,
+                           line=line, metric=metric, plants=visible_plants(), lines=lines, metrics=METRICS)
+
+
+@bp.route("/api/employee/<int:employee_id>/similar")
+@read_only
+@login_required
+def api_employee_similar(employee_id):
+    from skill_vectors import METRICS
+
+    if db.session.get(Employee, employee_id) is None:
+        abort(404)
+    metric = request.args.get("metric", "cosine")
+    if metric not in METRICS:
+        abort(400)
+    results = _similar_with_employees(employee_id, request.args.get("k", 10, type=int),
+                                      request.args.get("plant"), request.args.get("line"), metric)
+    return jsonify({
+        "employee_id": employee_id,
+        "metric": metric,
+        "items": [{
+            "employee_id": e.id,
+            "name": f"{e.first_name} {e.last_name}",
+            "plant": e.plant,
+            "score": round(score, 4),
+            "shared_skills": shared,
+        } for e, score, shared in results],
+    })
+
+
+def _similar_with_employees(employee_id, k, plant, line, metric):
+    """Top-k de la matrice NumPy + une requête pour les fiches des candidats."""
+    from skill_vectors import similar_employees
+
+    k = max(1, min(k or 10, 100))
+    try:
+        ranked = similar_employees(employee_id, k=k, plant=plant_filter(plant), line=line or None, metric=metric)
+    except KeyError:
+        return []
+    employees = {e.id: e for e in Employee.query.filter(Employee.id.in_([r[0] for r in ranked]))}
+    return [(employees[eid], score, shared) for eid, score, shared in ranked if eid in employees]
+
+
+def _staffing_args():
+    """Ligne, usine, niveaux minimaux (?min_<skill_id>=B) et absents (?exclude=12,57)."""
+    from skill_vectors import LEVEL_SCORES
+
+    line = request.args.get("line", "").strip()
+    plant = request.args.get("plant", "").strip()
+    min_levels = {}
+    for key, value in request.args.items():
+        if key.startswith("min_") and key[4:].isdigit() and value:
+            if value not in LEVEL_SCORES:
+                abort(400)
+            min_levels[int(key[4:])] = value
+    exclude = set()
+    for raw in request.args.getlist("exclude"):
+        for part in raw.replace(" ", "").split(","):
+            if part:
+                if not part.isdigit():
+                    abort(400)
+                exclude.add(int(part))
+    return line, plant, min_levels, exclude
+
+
+def _with_employees(plan):
+    employees = {e.id: e for e in Employee.query.filter(
+        Employee.id.in_([st["employee_id"] for st in plan["stations"] if st["employee_id"]]))}
+    for station in plan["stations"]:
+        station["employee"] = employees.get(station["employee_id"])
+    return plan
+
+
+@bp.route("/staffing")
+@read_only
+@login_required
+def staffing():
+    from skill_vectors import LEVEL_SCORES
+    from staffing import staff_line
+
+    line, plant, min_levels, exclude = _staffing_args()
+    lines = [l[0] for l in db.session.query(Skill.category).distinct().order_by(Skill.category).all() if l[0]]
+    plan = _with_employees(staff_line(line, plant=plant_filter(plant), min_levels=min_levels,
+                                      exclude=exclude)) if line else None
+    return render_template("staffing.html", line=line, plant=plant, plants=visible_plants(), lines=lines,
+                           levels=list(LEVEL_SCORES), exclude=",".join(map(str, sorted(exclude))), plan=plan)
+
+
+@bp.route("/api/staffing")
+@read_only
+@login_required
+def api_staffing():
+    from staffing import staff_line
+
+    line, plant, min_levels, exclude = _staffing_args()
+    if not line:
+        abort(400)
+    plan = _with_employees(staff_line(line, plant=plant_filter(plant), min_levels=min_levels, exclude=exclude))
+    return jsonify({
+        "line": line,
+        "plant": plant or None,
+        "operators": plan["operators"],
+        "covered": plan["covered"],
+        "uncovered": plan["uncovered"],
+        "score": plan["score"],
+        "stations": [{
+            "skill_id": st["skill"].id,
+            "skill_name": st["skill"].skill_name,
+            "min_level": st["min_level"],
+            "employee_id": st["employee_id"],
+            "name": f"{st['employee'].first_name} {st['employee'].last_name}" if st["employee"] else None,
+            "level": st["level"],
+            "qualified_operators": st["qualified"],
+            "uncovered": st["employee_id"] is None,
+        } for st in plan["stations"]],
+    })
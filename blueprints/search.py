@@ -0,0 +1,65 @@
+from flask import Blueprint, render_template, request, jsonify, abort
+from flask_babel import get_locale
+from flask_login import login_required
+
+import click
+
+from db_routing import read_only
+from models import db
+from search import PER_PAGE, ensure_search_index, search_remarks, search_skills
+
+# cli_group=None : commandes au premier niveau (flask search-rebuild)
+bp = Blueprint("search", __name__, cli_group=None)
+
+SCOPES = {"skills": search_skills, "remarks": search_remarks}
+
+
+def _search_args():
+    q = request.args.get("q", "").strip()
+    scope = request.args.get("scope", "skills")
+    if scope not in SCOPES:
+        abort(400)
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = max(1, min(request.args.get("per_page", PER_PAGE, type=int), 100))
+    return q, scope, page, per_page
+
+
+@bp.route("/search")
+@read_only
+@login_required
+def search():
+    q, scope, page, per_page = _search_args()
+    results, pagination, counts = [], None, {}
+    if q:
+        locale = get_locale()
+        for name, fn in SCOPES.items():
+            items, pages = fn(q, locale=locale, page=page if name == scope else 1,
+                              per_page=per_page if name == scope else 1)
+            counts[name] = pages["total"]
+            if name == scope:
+                results, pagination = items, pages
+    return render_template("search.html", q=q, scope=scope, results=results,
+                           pagination=pagination, counts=counts)
+
+
+@bp.route("/api/search")
+@read_only
+@login_required
+def api_search():
+    q, scope, page, per_page = _search_args()
+    items, pagination = SCOPES[scope](q, locale=get_locale(), page=page, per_page=per_page)
+    return jsonify({
+        "q": q,
+        "scope": scope,
+        **pagination,
+        "items": [{k: str(v) if k in ("name", "category", "snippet") else v for k, v in item.items()}
+                  for item in items],
+    })
+
+
+@bp.cli.command("search-rebuild")
+def search_rebuild():
+    """Crée les index plein texte manquants (FTS5 reconstruit sous SQLite)."""
+    with db.engine.begin() as connection:
+        ensure_search_index(connection)
+    click.echo("✅ Index de recherche à jour")
@@ -0,0 +1,63 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import login_required
+from flask_babel import _
+
+from db_routing import read_only
+from fragment_cache import LazyQuery
+from models import db, Skill, EmployeeSkill
+from utils import admin_required, audit_log
+
+bp = Blueprint("skills", __name__)
+
+LEVELS = ("E", "A", "B", "C", "D")
+
+
+@bp.route("/skills")
+@read_only
+@login_required
+def skills_list():
+    line = request.args.get("line", "").strip()
+    query = Skill.query
+    if line:
+        query = query.filter(Skill.category == line)
+    skills = LazyQuery(query)
+    lines = [l[0] for l in db.session.query(Skill.category).distinct().all() if l[0]]
+    return render_template("skills.html", skills=skills, lines=lines)
+
+@bp.route("/add_skill", methods=["GET", "POST"])
+@login_required
+def add_skill():
+    if request.method == "POST":
+        s = Skill(
+            skill_name=request.form["skill_name"],
+            category=request.form.get("category"),
+            description=request.form.get("description"),
+            min_level=request.form.get("min_level") if request.form.get("min_level") in LEVELS else None,
+        )
+        db.session.add(s)
+        db.session.commit()
+        audit_log("add_skill", "Skill", s.id, {"name": s.skill_name, "category": s.category})
+        flash(_("✨ Skill added successfully!"), "success")
+        return redirect(url_for("skills.skills_list"))
+    return render_template("add_skill.html")
+
+@bp.route("/skill/<int:skill_id>/delete", methods=["POST"])
+@login_required
+def delete_skill(skill_id):
+    admin_required()
+
+    skill = Skill.query.get_or_404(skill_id)
+
+    # Supprimer relations
+    EmployeeSkill.query.filter_by(skill_id=skill.id).delete()
+
+    db.session.delete(skill)
+    db.session.commit()
+
+    audit_log("delete_skill", "Skill", skill_id, {
+        "name": skill.skill_name,
+        "category": skill.category
+    })
+
+    flash(_("🗑️ Skill deleted successfully!"), "info")
+    return redirect(url_for("skills.skills_list"))
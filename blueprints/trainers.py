@@ -0,0 +1,63 @@
+from flask import Blueprint, render_template, request, jsonify, abort
+from flask_login import login_required
+
+from db_routing import read_only
+from models import db, Trainer
+from trainers import (assessments_per_month, pending_requalifications, requalification_cutoff,
+                      search_trainers, workload)
+
+bp = Blueprint("trainers", __name__)
+
+
+@bp.route("/trainers")
+@read_only
+@login_required
+def trainers_list():
+    return render_template("trainers.html", rows=workload(), cutoff=requalification_cutoff())
+
+
+@bp.route("/trainer/<int:trainer_id>")
+@read_only
+@login_required
+def trainer_report(trainer_id):
+    trainer = db.session.get(Trainer, trainer_id)
+    if trainer is None:
+        abort(404)
+    months = assessments_per_month(trainer_id)
+    return render_template("trainer_report.html", trainer=trainer, months=months,
+                           peak=max((n for _, _, n in months), default=0),
+                           pending=pending_requalifications(trainer_id), cutoff=requalification_cutoff())
+
+
+@bp.route("/api/trainers")
+@read_only
+@login_required
+def api_trainers():
+    """Autocomplétion des formulaires d'affectation : ?q=jua"""
+    limit = max(1, min(request.args.get("limit", 10, type=int), 50))
+    return jsonify([{"id": t.id, "name": t.name} for t in search_trainers(request.args.get("q", ""), limit)])
+
+
+@bp.route("/api/trainer/<int:trainer_id>/report")
+@read_only
+@login_required
+def api_trainer_report(trainer_id):
+    trainer = db.session.get(Trainer, trainer_id)
+    if trainer is None:
+        abort(404)
+    return jsonify({
+        "trainer": {"id": trainer.id, "name": trainer.name},
+        "requalification_before": requalification_cutoff().isoformat(),
+        "assessments_per_month": [{"month": f"{y:04d}-{m:02d}", "count": n}
+                                  for y, m, n in assessments_per_month(trainer_id)],
+        "pending_requalifications": [{
+            "employee_skill_id": r.id,
+            "employee_id": r.employee_id,
+            "name": f"{r.first_name} {r.last_name}",
+            "plant": r.plant,
+            "skill_name": r.skill_name,
+            "line": r.category,
+            "level": r.level,
+            "last_assessed": r.last_assessed.isoformat(),
+        } for r in pending_requalifications(trainer_id)],
+    })
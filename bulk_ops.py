@@ -0,0 +1,127 @@
+"""
+Opérations en masse sur les employés (réorganisations, départs).
+
+Une seule transaction par action : un UPDATE/DELETE ensembliste sur la
+liste d'IDs, les lignes « transfer » de l'historique si l'usine change, et
+un INSERT groupé des entrées d'audit.
+"""
+from datetime import datetime
+import os
+
+from sqlalchemy import delete, insert, select, update
+
+from models import db, Employee, EmployeeSkill, AuditLog
+from skill_history import record_plant_changes
+
+BULK_FIELDS = ("plant", "department", "position", "status")
+
+
+def _audit_rows(action, entries, user_id, ip_address, user_agent):
+    now = datetime.utcnow()
+    return [
+        {
+            "created_at": now,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": "Employee",
+            "entity_id": str(emp_id),
+            "plant": plant,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        }
+        for emp_id, plant, details in entries
+    ]
+
+
+def bulk_update_employees(ids, values, user_id=None, ip_address=None, user_agent=None):
+    """Applique `values` (plant/department/position/status) à tous les employés `ids`."""
+    values = {k: v for k, v in values.items() if k in BULK_FIELDS and v not in (None, "")}
+    ids = sorted({int(i) for i in ids})
+    if not ids or not values:
+        return 0
+
+    columns = [getattr(Employee, field) for field in values]
+    before = db.session.execute(
+        select(Employee.id, Employee.plant.label("current_plant"), *columns).where(Employee.id.in_(ids))
+    ).all()
+    found = [row[0] for row in before]
+    if not found:
+        return 0
+
+    db.session.execute(
+        update(Employee).where(Employee.id.in_(found)).values(**values),
+        execution_options={"synchronize_session": False},
+    )
+    if "plant" in values:
+        moved = {row[0]: values["plant"] for row in before if row.current_plant != values["plant"]}
+        if moved:
+            record_plant_changes(db.session.connection(), moved)
+    entries = [
+        (row[0], values.get("plant", row.current_plant),
+         {**{f"old_{f}": row[i + 2] for i, f in enumerate(values)},
+          **{f"new_{f}": v for f, v in values.items()}})
+        for row in before
+    ]
+    db.session.execute(insert(AuditLog), _audit_rows("bulk_update_employee", entries, user_id, ip_address, user_agent))
+    db.session.commit()
+
+    invalidate_employee_media(found, keep_photos=True)
+    return len(found)
+
+
+def bulk_delete_employees(ids, user_id=None, ip_address=None, user_agent=None):
+    """Supprime les employés `ids` et leurs compétences en une transaction."""
+    ids = sorted({int(i) for i in ids})
+    if not ids:
+        return 0
+
+    before = db.session.execute(
+        select(Employee.id, Employee.first_name, Employee.last_name, Employee.position, Employee.department,
+               Employee.plant)
+        .where(Employee.id.in_(ids))
+    ).all()
+    found = [row.id for row in before]
+    if not found:
+        return 0
+
+    db.session.execute(delete(EmployeeSkill).where(EmployeeSkill.employee_id.in_(found)),
+                       execution_options={"synchronize_session": False})
+    db.session.execute(delete(Employee).where(Employee.id.in_(found)),
+                       execution_options={"synchronize_session": False})
+    entries = [
+        (row.id, row.plant, {"name": f"{row.first_name} {row.last_name}", "position": row.position,
+                             "department": row.department})
+        for row in before
+    ]
+    db.session.execute(insert(AuditLog), _audit_rows("bulk_delete_employee", entries, user_id, ip_address, user_agent))
+    db.session.commit()
+
+    invalidate_employee_media(found)
+    return len(found)
+
+
+def invalidate_employee_media(ids, keep_photos=False):
+    """🧹 Supprime les fichiers générés localement (badges, QR, photos) des employés."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    patterns = [
+        os.path.join(root, "media", "qrcodes", "badge_{id}.pdf"),
+        os.path.join(root, "static", "qrcodes", "badge_{id}.pdf"),
+    ]
+    if not keep_photos:
+        patterns += [
+            os.path.join(root, "media", "qrcodes", "employee_{id}.png"),
+            os.path.join(root, "static", "qrcodes", "employee_{id}.png"),
+            os.path.join(root, "static", "photos", "employee_{id}.jpg"),
+        ]
+    removed = 0
+    for emp_id in ids:
+        for pattern in patterns:
+            try:
+                os.remove(pattern.format(id=emp_id))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Impossible de supprimer {pattern.format(id=emp_id)} : {e}")
+    return removed
@@ -0,0 +1,255 @@
+"""
+Flux de changements pour la synchronisation RH / MES (table change_log).
+
+Chaque INSERT / UPDATE / DELETE d'un employé, d'une compétence ou d'une
+affectation ajoute une ligne dans la même transaction (after_flush, et
+UPDATE / DELETE ORM en masse via do_orm_execute). L'id de change_log est la
+séquence : un client garde le dernier id reçu (curseur) et demande la suite.
+
+Sous PostgreSQL, un verrou consultatif de transaction sérialise les
+transactions qui écrivent dans le flux : un id n'est visible qu'une fois tous
+les ids inférieurs commités, un curseur ne saute donc jamais de changement.
+Le verrou est pris avant la première écriture d'une entité suivie (before_flush,
+INSERT / UPDATE / DELETE ORM en masse), avant les verrous de ligne de ces
+écritures ; les transactions qui n'en écrivent pas (audit, connexions,
+pièces jointes, curseurs de webhooks) ne le prennent pas.
+
+    page = read_changes(cursor=1200, limit=500)
+    push_subscriptions()   # flask change-feed-push
+"""
+from datetime import datetime
+import hashlib
+import hmac
+import json
+import time
+
+from sqlalchemy import event, func, insert, literal, select, text
+
+from models import db, ChangeLog, Employee, EmployeeSkill, Skill, WebhookSubscription
+
+ENTITIES = {
+    Employee: "employee",
+    Skill: "skill",
+    EmployeeSkill: "employeeskill",
+}
+MODELS = {name: model for model, name in ENTITIES.items()}
+LOCK_KEY = 73110  # pg_advisory_xact_lock : écritures du flux
+_LOCKED = "change_feed_locked"  # session.info : transaction qui détient le verrou
+
+
+def _entity(cls):
+    for model, name in ENTITIES.items():
+        if issubclass(cls, model):
+            return name
+    return None
+
+
+def _lock(session):
+    """Verrou pris une seule fois par transaction, avant sa première écriture."""
+    connection = session.connection()  # démarre la transaction si besoin
+    transaction = session.get_transaction()
+    if session.info.get(_LOCKED) is transaction:
+        return
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+    session.info[_LOCKED] = transaction
+
+
+# ========= Enregistrement =========
+def _before_flush(session, flush_context, instances):
+    if any(_entity(type(obj)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        _lock(session)
+
+
+def _before_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and _entity(mapper.class_):
+        _lock(orm_execute_state.session)
+
+
+def _after_flush(session, flush_context):
+    changes = []
+    for operation, objects in (
+        ("insert", session.new),
+        ("update", (o for o in session.dirty if session.is_modified(o, include_collections=False))),
+        ("delete", session.deleted),
+    ):
+        for obj in objects:
+            name = _entity(type(obj))
+            if name is not None:
+                changes.append({"entity_type": name, "entity_id": obj.id, "operation": operation})
+    if not changes:
+        return
+    connection = session.connection()
+    now = datetime.utcnow()
+    connection.execute(insert(ChangeLog), [{**c, "changed_at": now} for c in changes])
+
+
+def _on_orm_execute(orm_execute_state):
+    # update(Employee)… / delete(EmployeeSkill)… / Query.delete() : lignes visées avant exécution
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    name = _entity(mapper.class_) if mapper is not None else None
+    if name is None:
+        return
+    statement = orm_execute_state.statement
+    table = mapper.local_table
+    source = select(literal(name), table.c.id,
+                    literal("update" if orm_execute_state.is_update else "delete"),
+                    literal(datetime.utcnow()))
+    if statement.whereclause is not None:
+        source = source.where(statement.whereclause)
+    connection = orm_execute_state.session.connection()
+    c = ChangeLog.__table__.c
+    connection.execute(insert(ChangeLog).from_select(
+        [c.entity_type, c.entity_id, c.operation, c.changed_at], source.order_by(table.c.id)))
+
+
+def backfill_statements():
+    """INSERT … SELECT : un « insert » par ligne existante (employés par updated_at)."""
+    c = ChangeLog.__table__.c
+    columns = [c.entity_type, c.entity_id, c.operation, c.changed_at]
+    e, s, es = Employee.__table__, Skill.__table__, EmployeeSkill.__table__
+    now = literal(datetime.utcnow())
+    return [
+        insert(ChangeLog).from_select(columns, select(
+            literal("skill"), s.c.id, literal("insert"), now).order_by(s.c.id)),
+        insert(ChangeLog).from_select(columns, select(
+            literal("employee"), e.c.id, literal("insert"),
+            func.coalesce(e.c.updated_at, e.c.created_at, now)).order_by(e.c.updated_at, e.c.id)),
+        insert(ChangeLog).from_select(columns, select(
+            literal("employeeskill"), es.c.id, literal("insert"), now).order_by(es.c.id)),
+    ]
+
+
+# ========= Lecture =========
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def serialize(name, obj):
+    if name == "employee":
+        return {"id": obj.id, "first_name": obj.first_name, "last_name": obj.last_name,
+                "position": obj.position, "department": obj.department, "plant": obj.plant,
+                "status": obj.status, "hire_date": _iso(obj.hire_date), "updated_at": _iso(obj.updated_at)}
+    if name == "skill":
+        return {"id": obj.id, "skill_name": obj.skill_name, "category": obj.category,
+                "description": obj.description, "min_level": obj.min_level}
+    return {"id": obj.id, "employee_id": obj.employee_id, "skill_id": obj.skill_id, "level": obj.level,
+            "trainer": obj.trainer, "trainer_id": obj.trainer_id, "last_assessed": _iso(obj.last_assessed)}
+
+
+def cursor_since(since):
+    """Curseur juste avant le premier changement à partir de `since` (datetime)."""
+    first = db.session.execute(select(ChangeLog.id).where(ChangeLog.changed_at >= since)
+                               .order_by(ChangeLog.id).limit(1)).scalar()
+    if first is not None:
+        return first - 1
+    return db.session.execute(select(func.max(ChangeLog.id))).scalar() or 0
+
+
+def read_changes(cursor=0, limit=500):
+    """
+    Changements d'id > `cursor`, dans l'ordre : {"changes", "next_cursor", "has_more"}.
+    `data` = état actuel de la ligne (None si supprimée depuis).
+    """
+    rows = db.session.execute(
+        select(ChangeLog).where(ChangeLog.id > cursor).order_by(ChangeLog.id).limit(limit + 1)
+    ).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Une requête par type d'entité pour l'état actuel
+    current = {}
+    for name, model in MODELS.items():
+        ids = {r.entity_id for r in rows if r.entity_type == name and r.operation != "delete"}
+        if ids:
+            current[name] = {o.id: o for o in db.session.execute(
+                select(model).where(model.id.in_(ids))).scalars()}
+
+    changes = []
+    for r in rows:
+        obj = current.get(r.entity_type, {}).get(r.entity_id)
+        changes.append({
+            "seq": r.id,
+            "entity": r.entity_type,
+            "id": r.entity_id,
+            "op": r.operation,
+            "at": _iso(r.changed_at),
+            "data": serialize(r.entity_type, obj) if obj is not None else None,
+        })
+    return {"changes": changes, "next_cursor": rows[-1].id if rows else cursor, "has_more": has_more}
+
+
+# ========= Webhooks =========
+def sign(secret, body):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _post(url, body, headers, timeout, retries, backoff):
+    """POST avec nouvelles tentatives (backoff exponentiel) sur 5xx / erreur réseau ; 4xx : abandon."""
+    import requests  # import paresseux : chargé au premier envoi (cf. upload_to_github)
+
+    for attempt in range(retries + 1):
+        try:
+            response = requests.post(url, data=body, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            if attempt == retries or (status is not None and status < 500):
+                raise
+        time.sleep(backoff * 2 ** attempt)
+
+
+def push_subscription(subscription, batch_size=500, timeout=10, max_batches=None, retries=3, backoff=1.0):
+    """
+    Envoie les changements en attente par lots (POST JSON) ; le curseur avance
+    après chaque réponse 2xx. Retourne le nombre de changements acquittés.
+    """
+    import requests
+
+    sent = batches = 0
+    while max_batches is None or batches < max_batches:
+        page = read_changes(subscription.cursor, batch_size)
+        if not page["changes"]:
+            break
+        body = json.dumps({"subscription": subscription.name, **page}).encode()
+        headers = {"Content-Type": "application/json"}
+        if subscription.secret:
+            headers["X-SkillMatrix-Signature"] = sign(subscription.secret, body)
+        try:
+            _post(subscription.url, body, headers, timeout, retries, backoff)
+        except requests.RequestException as e:
+            subscription.last_error = str(e)[:1000]
+            db.session.commit()
+            break
+        subscription.cursor = page["next_cursor"]
+        subscription.last_pushed_at = datetime.utcnow()
+        subscription.last_error = None
+        db.session.commit()
+        sent += len(page["changes"])
+        batches += 1
+        if not page["has_more"]:
+            break
+    return sent
+
+
+def push_subscriptions(batch_size=500, timeout=10, retries=3, backoff=1.0):
+    """{nom: changements envoyés} pour chaque abonné actif."""
+    return {
+        sub.name: push_subscription(sub, batch_size=batch_size, timeout=timeout, retries=retries, backoff=backoff)
+        for sub in WebhookSubscription.query.filter_by(active=True).order_by(WebhookSubscription.id).all()
+    }
+
+
+def init_change_feed(app):
+    if not event.contains(db.session, "after_flush", _after_flush):
+        # Verrou en tête : avant les écritures des autres écouteurs (historique, usines)
+        event.listen(db.session, "before_flush", _before_flush, insert=True)
+        event.listen(db.session, "do_orm_execute", _before_bulk_write, insert=True)
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "do_orm_execute", _on_orm_execute)
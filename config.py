@@ -1,5 +1,18 @@
 import os
 
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
 class Config:
     # Informations de connexion
     DB_HOST = "avo-adb-002.postgres.database.azure.com"
@@ -9,12 +22,104 @@ class Config:
     DB_DATABASE = "Personnel_skill_matrix"
     SSL_MODE = "require"
 
-    SQLALCHEMY_DATABASE_URI = (
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or (
         f"postgresql+psycopg2://{DB_LOGIN}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}?sslmode={SSL_MODE}"
     )
 
+    # ===== Pool de connexions =====
+    # Valeurs surchargeables par variables d'environnement (App Service > Configuration)
+    DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)        # secondes d'attente d'une connexion libre
+    DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)      # recycle avant le timeout d'inactivité Azure
+    DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)   # détecte les connexions coupées par le load balancer
+    DB_CONNECT_TIMEOUT = _env_int("DB_CONNECT_TIMEOUT", 10)
+    DB_STATEMENT_TIMEOUT_MS = _env_int("DB_STATEMENT_TIMEOUT_MS", 15000)  # 0 = désactivé
+    DB_PGBOUNCER = _env_bool("DB_PGBOUNCER", False)          # mode transaction PgBouncer
+    DB_WARMUP_CONNECTIONS = _env_int("DB_WARMUP_CONNECTIONS", 2)  # 0 = pas de warm-up
+
+    # Dev / tests : "raise" ou "warn" pour détecter les lazy loads (N+1) dans les templates
+    STRICT_LAZY_LOAD = os.environ.get("STRICT_LAZY_LOAD") or None
+
+    # Cache de fragments Jinja ({% cache %}), par processus
+    FRAGMENT_CACHE_ENABLED = _env_bool("FRAGMENT_CACHE_ENABLED", True)
+    FRAGMENT_CACHE_MAX_ENTRIES = _env_int("FRAGMENT_CACHE_MAX_ENTRIES", 512)
+    FRAGMENT_CACHE_MAX_BYTES = _env_int("FRAGMENT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+    # Réplica en lecture seule (optionnel) pour les routes @read_only
+    DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL") or None
+    DB_REPLICA_CHECK_SECONDS = _env_int("DB_REPLICA_CHECK_SECONDS", 10)    # intervalle du contrôle de santé
+    DB_REPLICA_MAX_LAG_SECONDS = _env_int("DB_REPLICA_MAX_LAG_SECONDS", 30)  # au-delà : lectures sur le primaire
+    DB_REPLICA_STICKY_SECONDS = _env_int("DB_REPLICA_STICKY_SECONDS", 5)   # primaire après une écriture (cookie)
+
+    # Pièces jointes : taille maximale et stockage local (nommé par sha256)
+    ATTACHMENT_MAX_BYTES = _env_int("ATTACHMENT_MAX_BYTES", 20 * 1024 * 1024)
+    # Corps de requête refusé (413) avant lecture : pièce jointe + champs du formulaire
+    MAX_CONTENT_LENGTH = ATTACHMENT_MAX_BYTES + _env_int("FORM_OVERHEAD_BYTES", 1024 * 1024)
+    ATTACHMENT_FOLDER = os.environ.get("ATTACHMENT_FOLDER") or os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), "media", "attachments")
+
+    # Affectation des postes : niveau minimal d'un poste sans Skill.min_level
+    STAFFING_DEFAULT_MIN_LEVEL = os.environ.get("STAFFING_DEFAULT_MIN_LEVEL") or "B"
+
+    # Formateurs : évaluation plus ancienne que N jours = requalification en attente
+    REQUALIFICATION_DAYS = _env_int("REQUALIFICATION_DAYS", 365)
+
+    # Flux de changements (/api/changes) : jetons Bearer des clients RH / MES, séparés par des virgules
+    CHANGE_FEED_TOKENS = [t.strip() for t in os.environ.get("CHANGE_FEED_TOKENS", "").split(",") if t.strip()]
+    CHANGE_FEED_PAGE_SIZE = _env_int("CHANGE_FEED_PAGE_SIZE", 500)
+    CHANGE_FEED_MAX_PAGE_SIZE = _env_int("CHANGE_FEED_MAX_PAGE_SIZE", 5000)
+    WEBHOOK_BATCH_SIZE = _env_int("WEBHOOK_BATCH_SIZE", 500)
+    WEBHOOK_TIMEOUT_SECONDS = _env_int("WEBHOOK_TIMEOUT_SECONDS", 10)
+    WEBHOOK_RETRIES = _env_int("WEBHOOK_RETRIES", 3)  # nouvelles tentatives sur 5xx (backoff 1 s, 2 s, 4 s…)
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.environ.get("SECRET_KEY") or "votre_cle_secrete_tres_tres_securisee"
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), "static/qrcodes")
     ALLOW_SELF_SIGNUP = True # RH uniquement crée les comptes
-    SECRET_KEY = "change-moi-en-variable-d-environnement"
\ No newline at end of file
+    SECRET_KEY = "change-moi-en-variable-d-environnement"
+
+    @classmethod
+    def engine_options(cls, uri=None):
+        """Options passées à create_engine selon le type de base."""
+        uri = uri or cls.SQLALCHEMY_DATABASE_URI
+        if not uri.startswith("postgresql"):
+            # SQLite / tests locaux : options par défaut de SQLAlchemy
+            return {"pool_pre_ping": cls.DB_POOL_PRE_PING}
+
+        connect_args = {
+            "connect_timeout": cls.DB_CONNECT_TIMEOUT,
+            "application_name": "skill-matrix",
+            # Keepalives TCP : évite les coupures silencieuses derrière le load balancer
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 5,
+        }
+
+        if cls.DB_PGBOUNCER:
+            # PgBouncer fait déjà le pooling : pas de double pool côté app,
+            # et pas de paramètres de démarrage (« options ») qu'il refuserait.
+            from sqlalchemy.pool import NullPool
+            return {
+                "poolclass": NullPool,
+                "pool_pre_ping": cls.DB_POOL_PRE_PING,
+                "connect_args": connect_args,
+            }
+
+        return {
+            "pool_size": cls.DB_POOL_SIZE,
+            "max_overflow": cls.DB_MAX_OVERFLOW,
+            "pool_timeout": cls.DB_POOL_TIMEOUT,
+            "pool_recycle": cls.DB_POOL_RECYCLE,
+            "pool_pre_ping": cls.DB_POOL_PRE_PING,
+            "pool_use_lifo": True,  # les connexions en trop vieillissent et sont recyclées
+            "connect_args": connect_args,
+        }
+
+
+Config.SQLALCHEMY_ENGINE_OPTIONS = Config.engine_options()
+Config.SQLALCHEMY_BINDS = (
+    {"replica": {"url": Config.DATABASE_REPLICA_URL, **Config.engine_options(Config.DATABASE_REPLICA_URL)}}
+    if Config.DATABASE_REPLICA_URL else {}
+)
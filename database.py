@@ -0,0 +1,97 @@
+from functools import wraps
+import threading
+
+from flask import g, has_request_context, current_app
+from sqlalchemy import event, text
+
+from models import db
+
+# Compteurs du pool (par worker), exposés pour le monitoring
+_pool_counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+_counters_lock = threading.Lock()
+
+
+def _bump(name):
+    with _counters_lock:
+        _pool_counters[name] += 1
+
+
+def init_engine(app):
+    """Branche les événements du pool et le statement_timeout sur l'engine principal."""
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, "connect", lambda *a: _bump("connects"))
+    event.listen(engine, "checkout", lambda *a: _bump("checkouts"))
+    event.listen(engine, "checkin", lambda *a: _bump("checkins"))
+    event.listen(engine, "invalidate", lambda *a: _bump("invalidations"))
+
+    # Session partagée entre les apps créées par create_app() : un seul listener
+    if not event.contains(db.session, "after_begin", _set_statement_timeout):
+        event.listen(db.session, "after_begin", _set_statement_timeout)
+
+    return engine
+
+
+def _set_statement_timeout(session, transaction, connection):
+    # SET LOCAL : limité à la transaction, compatible PgBouncer (mode transaction)
+    if connection.dialect.name != "postgresql":
+        return
+    timeout_ms = current_statement_timeout()
+    if timeout_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def current_statement_timeout():
+    """Timeout de la requête HTTP en cours (surchargé par @statement_timeout) ou valeur par défaut."""
+    default = current_app.config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    if has_request_context():
+        return g.get("statement_timeout_ms", default)
+    return default
+
+
+def statement_timeout(ms):
+    """Décorateur : timeout SQL spécifique à une route (ex. exports ou actions en masse)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.statement_timeout_ms = ms
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def warm_up_pool(app):
+    """🔥 Ouvre quelques connexions au démarrage du worker (handshake TLS payé avant la 1re requête)."""
+    count = app.config.get("DB_WARMUP_CONNECTIONS", 0)
+    with app.app_context():
+        engine = db.engine
+        pool_size = engine.pool.size() if hasattr(engine.pool, "size") else 0
+        count = min(count, pool_size)
+        connections = []
+        try:
+            for _ in range(count):
+                conn = engine.connect()
+                conn.execute(text("SELECT 1"))
+                connections.append(conn)
+        except Exception as e:
+            print("⚠️ Warm-up du pool impossible :", e)
+        finally:
+            for conn in connections:
+                conn.close()  # retour au pool, la connexion reste ouverte
+    return len(connections)
+
+
+def pool_stats(app=None):
+    """Statistiques du pool de connexions pour le monitoring."""
+    app = app or current_app
+    with app.app_context():
+        pool = db.engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    with _counters_lock:
+        stats.update(_pool_counters)
+    return stats
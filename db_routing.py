@@ -0,0 +1,175 @@
+"""
+Routage des lectures vers un réplica PostgreSQL (optionnel).
+
+DATABASE_REPLICA_URL non défini → tout va sur le primaire, comme avant.
+
+Une requête SELECT part sur le réplica seulement si :
+- la route est marquée @read_only ;
+- la session n'a encore rien écrit (après un flush / INSERT / UPDATE / DELETE,
+  tout le reste de la requête HTTP reste sur le primaire) ;
+- le navigateur n'a pas écrit il y a moins de DB_REPLICA_STICKY_SECONDS
+  (cookie posé après une écriture : le GET qui suit un POST lit ses écritures
+  malgré le retard de réplication) ;
+- ce n'est pas un SELECT … FOR UPDATE ;
+- le réplica est sain : SELECT 1 (et retard de réplication sous PostgreSQL)
+  vérifié au plus toutes les DB_REPLICA_CHECK_SECONDS, et toute erreur de
+  connexion le met de côté jusqu'à la vérification suivante.
+
+Test local avec deux bases SQLite :
+    DATABASE_URL=sqlite:////tmp/primary.db DATABASE_REPLICA_URL=sqlite:////tmp/replica.db
+"""
+from functools import wraps
+import logging
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+logger = logging.getLogger("skill_matrix.replica")
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "db_primary_until"
+
+
+# ========= Santé du réplica =========
+class ReplicaHealth:
+    """État sain / en panne du réplica, partagé par les threads du worker."""
+
+    def __init__(self, check_interval=10, max_lag_seconds=30):
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._lock = threading.RLock()  # mark_down() peut être appelé pendant _check()
+        self._healthy = True
+        self._checked_at = 0.0
+        self.routed = 0  # requêtes SQL envoyées au réplica
+
+    def mark_down(self, reason):
+        with self._lock:
+            if self._healthy:
+                logger.warning("🔁 Réplica indisponible (%s) : lectures sur le primaire", reason)
+            self._healthy = False
+            self._checked_at = time.monotonic()
+
+    def is_healthy(self, engine):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._healthy
+        if not self._lock.acquire(blocking=False):
+            return self._healthy  # vérification déjà en cours dans un autre thread
+        try:
+            self._checked_at = now
+            healthy = self._check(engine)
+            if healthy and not self._healthy:
+                logger.info("✅ Réplica de nouveau disponible")
+            self._healthy = healthy
+            return healthy
+        finally:
+            self._lock.release()
+
+    def _check(self, engine):
+        try:
+            with engine.connect() as conn:
+                if engine.dialect.name == "postgresql":
+                    lag = conn.execute(text(
+                        "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    )).scalar()
+                    if lag is not None and lag > self.max_lag_seconds:
+                        logger.warning("🐢 Retard du réplica : %.1f s", lag)
+                        return False
+                else:
+                    conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.warning("🔁 Réplica injoignable : %s", e)
+            return False
+
+    def stats(self):
+        return {"replica_healthy": int(self._healthy), "replica_routed": self.routed}
+
+
+# ========= Session =========
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy qui envoie les lectures des routes @read_only au réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._can_use_replica(clause):
+            engine = self._db.engines.get(REPLICA_BIND)
+            health = current_app.extensions.get("replica_health")
+            if engine is not None and health is not None and health.is_healthy(engine):
+                health.routed += 1
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _can_use_replica(self, clause):
+        if not has_request_context() or not g.get("db_read_only") or g.get("db_sticky"):
+            return False
+        if self._flushing or self.info.get("wrote"):
+            return False
+        if clause is None or not getattr(clause, "is_select", False):
+            return False
+        return getattr(clause, "_for_update_arg", None) is None
+
+
+def _mark_write(session, *args):
+    session.info["wrote"] = True
+    if has_request_context():
+        g.db_wrote = True
+
+
+def _mark_write_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write(orm_execute_state.session)
+
+
+def read_only(view):
+    """Décorateur : les SELECT de la route peuvent être servis par le réplica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+# ========= Flask =========
+def replica_stats(app=None):
+    health = (app or current_app).extensions.get("replica_health")
+    return health.stats() if health is not None else {}
+
+
+def init_replica(app, db):
+    """Active le routage si SQLALCHEMY_BINDS contient « replica »."""
+    if not event.contains(db.session, "after_flush", _mark_write):
+        event.listen(db.session, "after_flush", _mark_write)
+        event.listen(db.session, "do_orm_execute", _mark_write_statement)
+
+    if REPLICA_BIND not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return None
+
+    health = ReplicaHealth(check_interval=app.config.get("DB_REPLICA_CHECK_SECONDS", 10),
+                           max_lag_seconds=app.config.get("DB_REPLICA_MAX_LAG_SECONDS", 30))
+    app.extensions["replica_health"] = health
+    with app.app_context():
+        engine = db.engines[REPLICA_BIND]
+
+    @event.listens_for(engine, "handle_error")
+    def _on_replica_error(context):
+        if context.is_disconnect or context.connection is None:
+            health.mark_down(type(context.original_exception).__name__)
+
+    sticky_seconds = app.config.get("DB_REPLICA_STICKY_SECONDS", 5)
+
+    @app.before_request
+    def _replica_stickiness():
+        until = request.cookies.get(STICKY_COOKIE, type=float)
+        g.db_sticky = bool(until and until > time.time())
+
+    @app.after_request
+    def _remember_write(response):
+        if g.get("db_wrote") and sticky_seconds:
+            response.set_cookie(STICKY_COOKIE, str(int(time.time() + sticky_seconds)),
+                                max_age=sticky_seconds, httponly=True, samesite="Lax")
+        return response
+
+    return engine
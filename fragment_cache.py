@@ -0,0 +1,215 @@
+"""
+Cache de fragments HTML pour les templates Jinja.
+
+    {% cache "employee_list", ["employees"], request.query_string, current_user.role %}
+      ... rendu coûteux ...
+    {% endcache %}
+
+Clé = nom + locale (get_locale) + version courante de chaque espace de données
+listé + valeurs « vary ». Les versions (table data_versions) sont incrémentées
+dans la même transaction que l'écriture (after_flush et UPDATE/DELETE ORM en
+masse) : après commit, toute nouvelle requête voit une nouvelle clé, les
+anciennes entrées sortent du LRU. Cohérent entre workers sans invalidation.
+
+FRAGMENT_CACHE_ENABLED    : désactive le cache (rendu direct)
+FRAGMENT_CACHE_MAX_ENTRIES: nombre maximal de fragments par processus
+FRAGMENT_CACHE_MAX_BYTES  : taille maximale cumulée des fragments par processus
+"""
+from collections import OrderedDict
+import threading
+
+from flask import current_app, g, has_request_context
+from flask_babel import get_locale
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import event, insert, select, update
+
+from models import db, DataVersion, Employee, Skill, EmployeeSkill
+
+# Modèle → espace de versions
+NAMESPACES = {
+    Employee: "employees",
+    Skill: "skills",
+    EmployeeSkill: "employeeskills",
+}
+
+
+# ========= LRU =========
+class FragmentCache:
+    """LRU thread-safe borné en nombre d'entrées et en octets."""
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.encode("utf-8"))
+            self._data[key] = value
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+# ========= Versions =========
+def current_versions():
+    """{espace: version}, lu une seule fois par requête."""
+    if has_request_context() and "data_versions" in g:
+        return g.data_versions
+    versions = dict(db.session.execute(select(DataVersion.name, DataVersion.version)).all())
+    if has_request_context():
+        g.data_versions = versions
+    return versions
+
+
+def bump_versions(connection, names):
+    """Incrémente les versions `names` sur la connexion de la transaction en cours."""
+    names = sorted(set(names))
+    if not names:
+        return
+    table = DataVersion.__table__
+    result = connection.execute(
+        update(table).where(table.c.name.in_(names)).values(version=table.c.version + 1)
+    )
+    if result.rowcount < len(names):
+        existing = set(connection.execute(select(table.c.name).where(table.c.name.in_(names))).scalars())
+        missing = [{"name": n, "version": 1} for n in names if n not in existing]
+        if missing:
+            connection.execute(insert(table), missing)
+
+
+def _namespace(cls):
+    for model, name in NAMESPACES.items():
+        if issubclass(cls, model):
+            return name
+    return None
+
+
+def _after_flush(session, flush_context):
+    changed = [*session.new, *session.deleted,
+               *(obj for obj in session.dirty if session.is_modified(obj, include_collections=False))]
+    names = {_namespace(type(obj)) for obj in changed}
+    names.discard(None)
+    if names:
+        bump_versions(session.connection(), names)
+
+
+def _after_bulk_statement(orm_execute_state):
+    # update(Employee)… / delete(EmployeeSkill)… / Query.delete() ne passent pas par le flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    names = {_namespace(m.class_) for m in orm_execute_state.all_mappers}
+    names.discard(None)
+    if not names:
+        return None
+    result = orm_execute_state.invoke_statement()
+    bump_versions(orm_execute_state.session.connection(), names)
+    return result
+
+
+# ========= Jinja =========
+class FragmentCacheExtension(Extension):
+    """Balise {% cache nom, [espaces], vary... %} … {% endcache %}."""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(["name:endcache"], drop_needle=True)
+        call = self.call_method("_render", [nodes.List(args)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, args, caller):
+        if len(args) < 2:
+            raise ValueError("{% cache %} attend au moins un nom et une liste d'espaces de données")
+        name, namespaces, *vary = args
+        cache = current_app.extensions.get("fragment_cache")
+        if cache is None:
+            return caller()
+
+        versions = current_versions()
+        key = (
+            name,
+            str(get_locale()),
+            tuple((ns, versions.get(ns, 0)) for ns in namespaces),
+            tuple(v.decode() if isinstance(v, bytes) else str(v) for v in vary),
+        )
+        html = cache.get(key)
+        if html is None:
+            html = str(caller())
+            cache.set(key, html)
+        return Markup(html)
+
+
+class LazyQuery:
+    """Résultat de requête exécuté au premier accès (rien à lire si le fragment est en cache)."""
+
+    def __init__(self, query):
+        self._query = query
+        self._rows = None
+
+    def _load(self):
+        if self._rows is None:
+            self._rows = self._query.all()
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __bool__(self):
+        return bool(self._load())
+
+
+def fragment_cache_stats(app=None):
+    cache = (app or current_app).extensions.get("fragment_cache")
+    return cache.stats() if cache is not None else {}
+
+
+def init_fragment_cache(app):
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    if app.config.get("FRAGMENT_CACHE_ENABLED", True):
+        app.extensions["fragment_cache"] = FragmentCache(
+            max_entries=app.config.get("FRAGMENT_CACHE_MAX_ENTRIES", 512),
+            max_bytes=app.config.get("FRAGMENT_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        )
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "do_orm_execute", _after_bulk_statement)
@@ -0,0 +1,195 @@
+"""
+Générateur de données synthétiques (volumes de production) pour reproduire
+les lenteurs en local et alimenter benchmark.py.
+
+    python generate_data.py --database-url sqlite:///bench.db            # volumes complets
+    python generate_data.py --database-url sqlite:///bench.db --scale 0.02  # jeu réduit (CI / poste dev)
+    python generate_data.py --database-url postgresql+psycopg2://localhost/skill_bench
+
+Crée aussi un administrateur bench@example.com / « bench » pour le client de test.
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+
+from models import db, Employee, Skill, EmployeeSkill, User, AuditLog
+from change_feed import backfill_statements as change_feed_backfill
+from search import ensure_search_index
+from skill_history import backfill_statement
+from trainers import backfill_trainers
+
+BENCH_ADMIN_EMAIL = "bench@example.com"
+BENCH_ADMIN_PASSWORD = "bench"
+
+PLANTS = ["Assymex", "Electric Galeana", "Electric Rayones"]
+LEVELS = ["E", "A", "B", "C", "D"]
+LEVEL_WEIGHTS = [10, 25, 30, 25, 10]
+FIRST_NAMES = ["José", "María", "Juan", "Guadalupe", "Luis", "Ana", "Carlos", "Rosa", "Jorge", "Laura",
+               "Miguel", "Patricia", "Pedro", "Verónica", "Alejandro", "Claudia", "Ricardo", "Adriana",
+               "Fernando", "Gabriela", "Héctor", "Sofía", "Raúl", "Daniela", "Arturo", "Leticia"]
+LAST_NAMES = ["García", "Hernández", "Martínez", "López", "González", "Rodríguez", "Pérez", "Sánchez",
+              "Ramírez", "Cruz", "Flores", "Gómez", "Morales", "Vázquez", "Reyes", "Jiménez", "Torres",
+              "Díaz", "Gutiérrez", "Ruiz", "Mendoza", "Aguilar", "Ortiz", "Moreno", "Castillo", "Treviño"]
+POSITIONS = ["Operator", "Senior Operator", "Line Leader", "Technician", "Quality Inspector",
+             "Maintenance", "Supervisor", "Setter", "Material Handler", "Trainer"]
+DEPARTMENTS = [f"Line {n}" for n in range(1, 31)] + ["Quality", "Maintenance", "Warehouse", "Tooling"]
+TRAINERS = ["Juan Pérez", "juan perez", "J. Pérez", "María López", "Maria Lopez", "Carlos Ruiz",
+            "Ana Torres", "Luis Garza", "Rosa Treviño", "Rosa Trevino", None]
+ACTIONS = ["login", "logout", "add_employee", "update_employee_info", "assign_skill",
+           "update_employee_skill", "delete_employee_skill", "update_employee_photo"]
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn, table, rows, batch_size, label, total):
+    start = time.perf_counter()
+    done = 0
+    for batch in _batches(rows, batch_size):
+        conn.execute(table.insert(), batch)
+        done += len(batch)
+        if done % (batch_size * 20) == 0 or done == total:
+            print(f"  {label}: {done:,}/{total:,} ({time.perf_counter() - start:.1f}s)", flush=True)
+
+
+def generate(url, employees, skills, skills_per_employee, audit_logs, seed=42, batch_size=10000, drop=False):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    if drop:
+        db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+
+    skills_per_employee = min(skills_per_employee, skills)
+    today = date.today()
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Employee.__table__)).scalar():
+            raise SystemExit("❌ La base contient déjà des employés : relancer avec --drop.")
+
+        print(f"👷 {employees:,} employés")
+        plants = {}  # usine de chaque employé, recopiée dans employeeskills / audit_logs
+        _insert(conn, Employee.__table__, (
+            {
+                "id": i,
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "position": rng.choice(POSITIONS),
+                "department": rng.choice(DEPARTMENTS),
+                "plant": plants.setdefault(i, rng.choice(PLANTS)),
+                "hire_date": today - timedelta(days=rng.randint(30, 25 * 365)),
+                "status": "Active" if rng.random() > 0.05 else "Inactive",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            } for i in range(1, employees + 1)
+        ), batch_size, "employees", employees)
+
+        print(f"🧠 {skills:,} compétences")
+        lines = [f"Line {n}" for n in range(1, 31)]
+        _insert(conn, Skill.__table__, (
+            {
+                "id": i,
+                "skill_name": f"Station {i:04d} - {rng.choice(['Crimping', 'Winding', 'Welding', 'Assembly', 'Testing', 'Packing', 'Molding'])}",
+                "category": lines[i % len(lines)],
+                "description": "Synthetic skill generated for benchmarking.",
+            } for i in range(1, skills + 1)
+        ), batch_size, "skills", skills)
+
+        total_es = employees * skills_per_employee
+        print(f"🔗 {total_es:,} affectations EmployeeSkill")
+        skill_ids = list(range(1, skills + 1))
+
+        def employee_skills():
+            for emp_id in range(1, employees + 1):
+                for skill_id in rng.sample(skill_ids, skills_per_employee):
+                    yield {
+                        "employee_id": emp_id,
+                        "skill_id": skill_id,
+                        "plant": plants[emp_id],
+                        "level": rng.choices(LEVELS, LEVEL_WEIGHTS)[0],
+                        "last_assessed": today - timedelta(days=rng.randint(0, 3 * 365)),
+                        "trainer": rng.choice(TRAINERS),
+                        "remarks": rng.choice([None, None, "Requalification needed", "OK", "Revisar con supervisor"]),
+                    }
+
+        _insert(conn, EmployeeSkill.__table__, employee_skills(), batch_size, "employeeskills", total_es)
+        print(f"🎓 {backfill_trainers(conn)} formateurs (variantes regroupées)")
+        conn.execute(backfill_statement())
+        for statement in change_feed_backfill():
+            conn.execute(statement)
+        ensure_search_index(conn)
+
+        admin = User(username="bench", email=BENCH_ADMIN_EMAIL, role="admin", display_name="Benchmark")
+        admin.set_password(BENCH_ADMIN_PASSWORD)
+        conn.execute(User.__table__.insert(), [{
+            "username": admin.username, "email": admin.email, "role": admin.role,
+            "display_name": admin.display_name, "password_hash": admin.password_hash,
+        }])
+        admin_id = conn.execute(select(User.__table__.c.id).where(User.__table__.c.email == BENCH_ADMIN_EMAIL)).scalar()
+
+        print(f"📜 {audit_logs:,} entrées d'audit")
+        now = datetime.utcnow()
+
+        def audit_rows():
+            for _ in range(audit_logs):
+                created_at = now - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+                user_id = admin_id if rng.random() > 0.1 else None
+                action = rng.choice(ACTIONS)
+                emp_id = rng.randint(1, employees)
+                yield {
+                    "created_at": created_at,
+                    "user_id": user_id,
+                    "action": action,
+                    "entity_type": "Employee",
+                    "entity_id": str(emp_id),
+                    "plant": plants[emp_id],
+                    "details": {},
+                    "ip_address": "127.0.0.1",
+                    "user_agent": "generate_data.py",
+                }
+
+        _insert(conn, AuditLog.__table__, audit_rows(), batch_size, "audit_logs", audit_logs)
+
+    engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un jeu de données Skill Matrix synthétique.")
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--skills", type=int, default=500)
+    parser.add_argument("--skills-per-employee", type=int, default=20)
+    parser.add_argument("--audit-logs", type=int, default=5_000_000)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Facteur appliqué aux employés et aux logs d'audit (ex. 0.02)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--drop", action="store_true", help="Supprime et recrée les tables avant génération")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generate(
+        args.database_url,
+        employees=max(1, int(args.employees * args.scale)),
+        skills=args.skills,
+        skills_per_employee=args.skills_per_employee,
+        audit_logs=int(args.audit_logs * args.scale),
+        seed=args.seed,
+        batch_size=args.batch_size,
+        drop=args.drop,
+    )
+    print(f"✅ Données générées en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,23 @@
 import base64
+import json
 import os
+import tempfile
 import requests
 
+from instrumentation import timed
+
+# Multiple de 3 : les blocs base64 se concatènent sans padding intermédiaire
+_B64_CHUNK = 3 * 64 * 1024
+
+
+def _write_json_body(out, file_path, fields):
+    """Écrit {…fields, "content": "<base64>"} dans `out` en lisant le fichier par blocs."""
+    out.write(json.dumps(fields)[:-1].encode("utf-8") + b', "content": "')
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_B64_CHUNK), b""):
+            out.write(base64.b64encode(chunk))
+    out.write(b'"}')
+
 def upload_to_github(file_path, github_path):
     """
     Upload ou met à jour un fichier sur GitHub via l'API REST.
@@ -15,10 +31,6 @@ def upload_to_github(file_path, github_path):
     if not token or not repo:
         raise RuntimeError("⚠️ Variables d’environnement GitHub manquantes (GITHUB_TOKEN ou repo)")
 
-    # Lecture du fichier local
-    with open(file_path, "rb") as f:
-        content = base64.b64encode(f.read()).decode("utf-8")
-
     url = f"https://api.github.com/repos/{repo}/contents/{github_path}"
     headers = {
         "Authorization": f"token {token}",
@@ -27,14 +39,14 @@ def upload_to_github(file_path, github_path):
 
     # Vérifie si le fichier existe déjà (pour éviter l’erreur 'sha wasn’t supplied')
     sha = None
-    check = requests.get(url, headers=headers)
+    with timed("http"):
+        check = requests.get(url, headers=headers)
     if check.status_code == 200:
         sha = check.json().get("sha")
 
     # Corps de la requête
     payload = {
         "message": f"Upload {os.path.basename(file_path)}",
-        "content": content,
         "branch": branch
     }
 
@@ -42,8 +54,15 @@ def upload_to_github(file_path, github_path):
     if sha:
         payload["sha"] = sha
 
-    # Upload / mise à jour
-    response = requests.put(url, json=payload, headers=headers)
+    # Upload / mise à jour : corps JSON (base64 ≈ 1,33 × le fichier) construit
+    # dans un fichier temporaire et envoyé en flux, jamais chargé en mémoire
+    with tempfile.TemporaryFile() as body:
+        _write_json_body(body, file_path, payload)
+        size = body.tell()
+        body.seek(0)
+        with timed("http"):
+            response = requests.put(url, data=body, headers={
+                **headers, "Content-Type": "application/json", "Content-Length": str(size)})
 
     # Vérifie le succès
     if response.status_code not in (200, 201):
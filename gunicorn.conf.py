@@ -0,0 +1,35 @@
+# Configuration gunicorn (Azure App Service : gunicorn -c gunicorn.conf.py app:app)
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+# Préchargement : l'app est importée une fois dans le maître puis partagée par fork
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+
+def when_ready(server):
+    """Maître prêt : avec preload, charge aussi les modules importés paresseusement."""
+    if server.cfg.preload_app:
+        import reportlab.pdfgen.canvas  # noqa: F401  (badges)
+        import qrcode  # noqa: F401
+        import github_uploader  # noqa: F401  (requests)
+
+
+def post_fork(server, worker):
+    """Les connexions héritées du maître ne doivent pas être partagées entre workers."""
+    if server.cfg.preload_app:
+        from app import app
+        from models import db
+
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Warm-up du pool SQL une fois l'application chargée dans le worker."""
+    from app import app
+    from database import warm_up_pool
+
+    opened = warm_up_pool(app)
+    worker.log.info("Pool SQL préchauffé : %s connexion(s)", opened)
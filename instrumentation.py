@@ -0,0 +1,205 @@
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+
+logger = logging.getLogger("skill_matrix.perf")
+
+# Bornes des histogrammes (secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Métriques en mémoire du worker (un registre par processus gunicorn)."""
+
+    HISTOGRAMS = {
+        "skill_matrix_request_duration_seconds": ("Latence totale par endpoint", LATENCY_BUCKETS),
+        "skill_matrix_request_sql_seconds": ("Temps SQL par requête HTTP", LATENCY_BUCKETS),
+        "skill_matrix_request_sql_queries": ("Nombre de requêtes SQL par requête HTTP", QUERY_COUNT_BUCKETS),
+        "skill_matrix_request_http_seconds": ("Temps des appels HTTP sortants (GitHub, images)", LATENCY_BUCKETS),
+        "skill_matrix_request_render_seconds": ("Temps de rendu des templates", LATENCY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._slow_requests = {}
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(self.HISTOGRAMS[name][1])
+            hist.observe(value)
+
+    def count_slow(self, endpoint):
+        with self._lock:
+            self._slow_requests[endpoint] = self._slow_requests.get(endpoint, 0) + 1
+
+    def render(self, gauges=None):
+        """Exposition texte Prometheus (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                series = [(labels, h) for (n, labels), h in sorted(self._histograms.items()) if n == name]
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in series:
+                    base = _format_labels(labels)
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', _fmt(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{name}_sum{base} {_fmt(hist.sum)}")
+                    lines.append(f"{name}_count{base} {hist.count}")
+
+            lines.append("# HELP skill_matrix_slow_requests_total Requêtes au-dessus des seuils de lenteur")
+            lines.append("# TYPE skill_matrix_slow_requests_total counter")
+            for endpoint, count in sorted(self._slow_requests.items()):
+                lines.append(f"skill_matrix_slow_requests_total{_format_labels((('endpoint', endpoint),))} {count}")
+
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _fmt(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels)
+    return "{" + body + "}"
+
+
+metrics = MetricsRegistry()
+
+
+# ========= Mesures par requête =========
+def _perf():
+    """Compteurs de la requête HTTP en cours (None hors requête)."""
+    if not has_request_context():
+        return None
+    return g.get("_perf")
+
+
+@contextmanager
+def timed(kind):
+    """⏱️ Mesure un bloc (« http », « render »…) et l'ajoute à la requête en cours."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        perf = _perf()
+        if perf is not None:
+            perf[f"{kind}_ms"] = perf.get(f"{kind}_ms", 0.0) + (time.perf_counter() - start) * 1000
+            perf[f"{kind}_count"] = perf.get(f"{kind}_count", 0) + 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    perf = _perf()
+    if perf is not None:
+        perf["sql_ms"] += (time.perf_counter() - context._query_start) * 1000
+        perf["sql_count"] += 1
+
+
+def _before_render(sender, template, context, **extra):
+    perf = _perf()
+    if perf is not None:
+        perf.setdefault("_render_start", []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    perf = _perf()
+    if perf is not None and perf.get("_render_start"):
+        perf["render_ms"] += (time.perf_counter() - perf["_render_start"].pop()) * 1000
+
+
+def init_instrumentation(app, engine):
+    """Branche les compteurs SQL / rendu / latence et l'en-tête Server-Timing."""
+    app.config.setdefault("SERVER_TIMING_ENABLED", True)
+    app.config.setdefault("SLOW_REQUEST_MS", 1000)
+    app.config.setdefault("SLOW_REQUEST_QUERIES", 50)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def _start_perf():
+        g._perf = {
+            "start": time.perf_counter(),
+            "sql_ms": 0.0, "sql_count": 0,
+            "http_ms": 0.0, "http_count": 0,
+            "render_ms": 0.0,
+        }
+
+    @app.after_request
+    def _finish_perf(response):
+        perf = g.pop("_perf", None)
+        if perf is None:
+            return response
+
+        total_ms = (time.perf_counter() - perf["start"]) * 1000
+        endpoint = request.endpoint or "unknown"
+        labels = {"endpoint": endpoint, "method": request.method}
+        metrics.observe("skill_matrix_request_duration_seconds", labels, total_ms / 1000)
+        metrics.observe("skill_matrix_request_sql_seconds", labels, perf["sql_ms"] / 1000)
+        metrics.observe("skill_matrix_request_sql_queries", labels, perf["sql_count"])
+        metrics.observe("skill_matrix_request_render_seconds", labels, perf["render_ms"] / 1000)
+        if perf["http_count"]:
+            metrics.observe("skill_matrix_request_http_seconds", labels, perf["http_ms"] / 1000)
+
+        if app.config["SERVER_TIMING_ENABLED"]:
+            timings = [
+                f'db;dur={perf["sql_ms"]:.1f};desc="{perf["sql_count"]} queries"',
+                f'http;dur={perf["http_ms"]:.1f};desc="{perf["http_count"]} calls"',
+                f'render;dur={perf["render_ms"]:.1f}',
+            ]
+            # Blocs mesurés avec timed() hors catégories standard (ex. « pdf »)
+            for key, value in perf.items():
+                kind = key[:-3]
+                if key.endswith("_ms") and kind not in ("sql", "http", "render"):
+                    timings.append(f"{kind};dur={value:.1f}")
+            timings.append(f"total;dur={total_ms:.1f}")
+            response.headers.add("Server-Timing", ", ".join(timings))
+
+        if total_ms >= app.config["SLOW_REQUEST_MS"] or perf["sql_count"] >= app.config["SLOW_REQUEST_QUERIES"]:
+            metrics.count_slow(endpoint)
+            logger.warning(
+                "🐢 Requête lente %s %s [%s] total=%.0fms sql=%d/%.0fms http=%d/%.0fms render=%.0fms",
+                request.method, request.path, endpoint, total_ms,
+                perf["sql_count"], perf["sql_ms"], perf["http_count"], perf["http_ms"], perf["render_ms"],
+            )
+        return response
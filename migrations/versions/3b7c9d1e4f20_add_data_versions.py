@@ -0,0 +1,34 @@
+"""add data_versions (clés du cache de fragments)
+
+Revision ID: 3b7c9d1e4f20
+Revises: ef12fa2c8083
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7c9d1e4f20'
+down_revision = 'ef12fa2c8083'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_versions = op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Lignes créées d'avance : les écritures ne font qu'un UPDATE version = version + 1
+    op.bulk_insert(data_versions, [
+        {'name': 'employees', 'version': 1},
+        {'name': 'skills', 'version': 1},
+        {'name': 'employeeskills', 'version': 1},
+    ])
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,42 @@
+"""add attachments (pièces jointes dédupliquées par sha256)
+
+Revision ID: 5d2e8a6b1c34
+Revises: 3b7c9d1e4f20
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a6b1c34'
+down_revision = '3b7c9d1e4f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('storage_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attachment_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('employeeskills_attachment_id_fkey', 'attachments',
+                                    ['attachment_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.drop_constraint('employeeskills_attachment_id_fkey', type_='foreignkey')
+        batch_op.drop_column('attachment_id')
+
+    op.drop_table('attachments')
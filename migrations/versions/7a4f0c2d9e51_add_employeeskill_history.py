@@ -0,0 +1,76 @@
+"""add employeeskill_history (historique append-only des niveaux)
+
+Revision ID: 7a4f0c2d9e51
+Revises: 5d2e8a6b1c34
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4f0c2d9e51'
+down_revision = '5d2e8a6b1c34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('employeeskill_history',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('employee_skill_id', sa.Integer(), nullable=True),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('plant', sa.String(length=100), nullable=True),
+    sa.Column('change_type', sa.String(length=10), nullable=False),
+    sa.Column('level', sa.String(length=1), nullable=True),
+    sa.Column('previous_level', sa.String(length=1), nullable=True),
+    sa.Column('trainer', sa.String(length=100), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.Column('changed_by', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.create_index('ix_esh_employee_skill_changed', ['employee_id', 'skill_id', 'changed_at'], unique=False)
+        batch_op.create_index('ix_esh_plant_changed', ['plant', 'changed_at'], unique=False)
+        batch_op.create_index('ix_esh_skill_changed', ['skill_id', 'changed_at'], unique=False)
+
+    # État actuel repris comme point de départ (date = dernière évaluation)
+    op.execute("""
+        INSERT INTO employeeskill_history
+            (employee_skill_id, employee_id, skill_id, plant, change_type, level, trainer, changed_at)
+        SELECT es.id, es.employee_id, es.skill_id, e.plant, 'backfill', es.level, es.trainer,
+               COALESCE(es.last_assessed, CURRENT_DATE)
+        FROM employeeskills es
+        LEFT JOIN employees e ON e.id = es.employee_id
+        WHERE es.employee_id IS NOT NULL AND es.skill_id IS NOT NULL
+    """)
+
+    # Ajout seul, y compris pour le SQL écrit à la main
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            CREATE FUNCTION employeeskill_history_append_only() RETURNS trigger AS $$
+            BEGIN
+                RAISE EXCEPTION 'employeeskill_history is append-only';
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER employeeskill_history_append_only
+            BEFORE UPDATE OR DELETE ON employeeskill_history
+            FOR EACH ROW EXECUTE FUNCTION employeeskill_history_append_only()
+        """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS employeeskill_history_append_only ON employeeskill_history")
+        op.execute("DROP FUNCTION IF EXISTS employeeskill_history_append_only()")
+
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_esh_skill_changed')
+        batch_op.drop_index('ix_esh_plant_changed')
+        batch_op.drop_index('ix_esh_employee_skill_changed')
+
+    op.drop_table('employeeskill_history')
@@ -0,0 +1,26 @@
+"""add skills.min_level (niveau minimal d'un poste pour l'affectation)
+
+Revision ID: 9b3d5f7a1c62
+Revises: 7a4f0c2d9e51
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3d5f7a1c62'
+down_revision = '7a4f0c2d9e51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('skills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('min_level', sa.String(length=1), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('skills', schema=None) as batch_op:
+        batch_op.drop_column('min_level')
@@ -0,0 +1,89 @@
+"""add user_plants, employeeskills.plant / audit_logs.plant et index (plant, …)
+
+Revision ID: a6c2e9f4d317
+Revises: f3b9d1e7a245
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e9f4d317'
+down_revision = 'f3b9d1e7a245'
+branch_labels = None
+depends_on = None
+
+# Triggers FTS5 de employeeskills (migration f3b9d1e7a245), perdus quand SQLite recrée la table
+SQLITE_FTS_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ai AFTER INSERT ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ad AFTER DELETE ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_au AFTER UPDATE OF remarks ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+    "INSERT INTO employeeskills_fts(employeeskills_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    op.create_table('user_plants',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plant', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'plant')
+    )
+
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('plant', sa.String(length=100), nullable=True))
+    with op.batch_alter_table('audit_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('plant', sa.String(length=100), nullable=True))
+
+    # Usine recopiée depuis employees (UPDATE … FROM), avant la création des index
+    op.execute("""
+        UPDATE employeeskills SET plant = e.plant
+        FROM employees AS e WHERE e.id = employeeskills.employee_id
+    """)
+    op.execute("""
+        UPDATE audit_logs SET plant = e.plant
+        FROM employees AS e
+        WHERE audit_logs.entity_type = 'Employee' AND audit_logs.entity_id = CAST(e.id AS VARCHAR)
+    """)
+    op.execute("""
+        UPDATE audit_logs SET plant = es.plant
+        FROM employeeskills AS es
+        WHERE audit_logs.entity_type = 'EmployeeSkill' AND audit_logs.entity_id = CAST(es.id AS VARCHAR)
+    """)
+
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.create_index('ix_employees_plant_name', ['plant', 'last_name', 'first_name'], unique=False)
+        batch_op.create_index('ix_employees_plant_department', ['plant', 'department'], unique=False)
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.create_index('ix_employeeskills_plant_employee', ['plant', 'employee_id'], unique=False)
+        batch_op.create_index('ix_employeeskills_plant_skill_level', ['plant', 'skill_id', 'level'], unique=False)
+    with op.batch_alter_table('audit_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_audit_logs_plant_created', ['plant', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('audit_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_audit_logs_plant_created')
+        batch_op.drop_column('plant')
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.drop_index('ix_employeeskills_plant_skill_level')
+        batch_op.drop_index('ix_employeeskills_plant_employee')
+        batch_op.drop_column('plant')
+    if op.get_bind().dialect.name == 'sqlite':
+        # DROP COLUMN en mode batch recrée employeeskills : triggers FTS5 perdus
+        for statement in SQLITE_FTS_TRIGGERS:
+            op.execute(statement)
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.drop_index('ix_employees_plant_department')
+        batch_op.drop_index('ix_employees_plant_name')
+
+    op.drop_table('user_plants')
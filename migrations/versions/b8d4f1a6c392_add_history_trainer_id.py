@@ -0,0 +1,48 @@
+"""add employeeskill_history.trainer_id (évaluations par formateur et par mois)
+
+Revision ID: b8d4f1a6c392
+Revises: a6c2e9f4d317
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4f1a6c392'
+down_revision = 'a6c2e9f4d317'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trainer_id', sa.Integer(), nullable=True))
+
+    # Lignes existantes : formateur retrouvé par le texte saisi (correspondance
+    # texte → trainer_id établie par la reprise des formateurs)
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    if postgresql:
+        op.execute("ALTER TABLE employeeskill_history DISABLE TRIGGER employeeskill_history_append_only")
+    op.execute("""
+        UPDATE employeeskill_history
+        SET trainer_id = m.trainer_id
+        FROM (
+            SELECT trainer, MIN(trainer_id) AS trainer_id FROM employeeskills
+            WHERE trainer IS NOT NULL AND trainer_id IS NOT NULL
+            GROUP BY trainer
+        ) AS m
+        WHERE m.trainer = employeeskill_history.trainer
+    """)
+    if postgresql:
+        op.execute("ALTER TABLE employeeskill_history ENABLE TRIGGER employeeskill_history_append_only")
+
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.create_index('ix_esh_trainer_changed', ['trainer_id', 'changed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_esh_trainer_changed')
+        batch_op.drop_column('trainer_id')
@@ -0,0 +1,64 @@
+"""add change_log (flux de changements) et webhook_subscriptions
+
+Revision ID: c4e8a2f6b913
+Revises: 9b3d5f7a1c62
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2f6b913'
+down_revision = '9b3d5f7a1c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.create_index('ix_change_log_changed_at', ['changed_at'], unique=False)
+
+    op.create_table('webhook_subscriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('secret', sa.String(length=255), nullable=True),
+    sa.Column('cursor', sa.BigInteger(), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('last_pushed_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+    # Point de départ : un « insert » par ligne existante (curseur 0 = export complet)
+    op.execute("""
+        INSERT INTO change_log (entity_type, entity_id, operation, changed_at)
+        SELECT 'skill', id, 'insert', CURRENT_TIMESTAMP FROM skills ORDER BY id
+    """)
+    op.execute("""
+        INSERT INTO change_log (entity_type, entity_id, operation, changed_at)
+        SELECT 'employee', id, 'insert', COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)
+        FROM employees ORDER BY updated_at, id
+    """)
+    op.execute("""
+        INSERT INTO change_log (entity_type, entity_id, operation, changed_at)
+        SELECT 'employeeskill', id, 'insert', CURRENT_TIMESTAMP FROM employeeskills ORDER BY id
+    """)
+
+
+def downgrade():
+    op.drop_table('webhook_subscriptions')
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_changed_at')
+    op.drop_table('change_log')
@@ -0,0 +1,26 @@
+"""drop ix_esh_plant_changed (matrix_as_of filtre sur employees.plant avant ROW_NUMBER)
+
+Revision ID: c7e3a9d2f514
+Revises: b8d4f1a6c392
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a9d2f514'
+down_revision = 'b8d4f1a6c392'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plan : employees (plant, …) → ids, puis ix_esh_employee_skill_changed ; l'index plant n'est plus lu
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_esh_plant_changed')
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.create_index('ix_esh_plant_changed', ['plant', 'changed_at'], unique=False)
@@ -0,0 +1,25 @@
+"""add ix_employeeskills_attachment (téléchargement : affectation propriétaire)
+
+Revision ID: d2f6b8e1a453
+Revises: c7e3a9d2f514
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b8e1a453'
+down_revision = 'c7e3a9d2f514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.create_index('ix_employeeskills_attachment', ['attachment_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.drop_index('ix_employeeskills_attachment')
@@ -0,0 +1,105 @@
+"""add trainers (formateurs normalisés) et employeeskills.trainer_id
+
+Revision ID: e1a7c3b5d820
+Revises: c4e8a2f6b913
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from collections import Counter
+import difflib
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a7c3b5d820'
+down_revision = 'c4e8a2f6b913'
+branch_labels = None
+depends_on = None
+
+# Regroupement figé à la date de la migration (copie de trainers.py, sans import de l'application)
+MATCH_CUTOFF = 0.85
+
+
+def _normalize(name):
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", name).split())[:100]
+
+
+def _match(key, keys):
+    """Clé existante : exacte, proche (difflib) ou initiale + nom si une seule correspond."""
+    if key in keys:
+        return key
+    close = difflib.get_close_matches(key, keys, n=1, cutoff=MATCH_CUTOFF)
+    if close:
+        return close[0]
+    tokens = key.split()
+    if len(tokens) < 2 or len(tokens[0]) != 1:
+        return None
+    found = [k for k in keys if k.split()[-1] == tokens[-1] and k.split()[0].startswith(tokens[0])
+             and len(k.split()[0]) > 1]
+    return found[0] if len(found) == 1 else None
+
+
+def _backfill_trainers(connection):
+    """Crée un formateur par groupe de variantes et renseigne employeeskills.trainer_id."""
+    by_key = {}
+    for raw, count in connection.execute(sa.text(
+            "SELECT trainer, COUNT(*) FROM employeeskills WHERE trainer IS NOT NULL GROUP BY trainer")):
+        key = _normalize(raw)
+        if key:
+            by_key.setdefault(key, Counter())[raw] += count
+
+    clusters = {}  # clé fondatrice (la plus fréquente) → variantes
+    for key in sorted(by_key, key=lambda k: (-sum(by_key[k].values()), len(k.split()[0]) == 1, k)):
+        clusters.setdefault(_match(key, list(clusters)) or key, Counter()).update(by_key[key])
+
+    for key, variants in sorted(clusters.items()):
+        name = max(variants, key=lambda v: (variants[v], v != _normalize(v), len(v)))
+        connection.execute(sa.text("INSERT INTO trainers (name, name_key, active) VALUES (:name, :key, :active)"),
+                           {"name": name.strip()[:100], "key": key, "active": True})
+        trainer_id = connection.execute(sa.text("SELECT id FROM trainers WHERE name_key = :key"),
+                                        {"key": key}).scalar()
+        connection.execute(
+            sa.text("UPDATE employeeskills SET trainer_id = :id WHERE trainer = :variant AND trainer_id IS NULL"),
+            [{"id": trainer_id, "variant": v} for v in sorted(variants)],
+        )
+
+
+def upgrade():
+    op.create_table('trainers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('name_key', sa.String(length=100), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name_key')
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        # LIKE 'préfixe%' de l'autocomplétion indexé quelle que soit la collation
+        op.execute("CREATE INDEX ix_trainers_name_key_pattern ON trainers (name_key text_pattern_ops)")
+
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trainer_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('employeeskills_trainer_id_fkey', 'trainers',
+                                    ['trainer_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_index('ix_employeeskills_trainer_assessed', ['trainer_id', 'last_assessed'], unique=False)
+
+    # Regroupement des variantes d'écriture (clé normalisée, difflib, initiales)
+    _backfill_trainers(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskills', schema=None) as batch_op:
+        batch_op.drop_index('ix_employeeskills_trainer_assessed')
+        batch_op.drop_constraint('employeeskills_trainer_id_fkey', type_='foreignkey')
+        batch_op.drop_column('trainer_id')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_trainers_name_key_pattern")
+    op.drop_table('trainers')
@@ -0,0 +1,26 @@
+"""restore ix_esh_plant_changed (matrix_as_of filtre sur l'usine historisée)
+
+Revision ID: e4a8c2f6b917
+Revises: d2f6b8e1a453
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8c2f6b917'
+down_revision = 'd2f6b8e1a453'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les mutations d'usine ajoutent des lignes « transfer » : l'usine à une date se lit dans l'historique
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.create_index('ix_esh_plant_changed', ['plant', 'changed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('employeeskill_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_esh_plant_changed')
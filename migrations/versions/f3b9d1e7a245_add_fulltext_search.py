@@ -0,0 +1,91 @@
+"""add full-text search (GIN tsvector english/spanish, FTS5 sous SQLite)
+
+Revision ID: f3b9d1e7a245
+Revises: e1a7c3b5d820
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d1e7a245'
+down_revision = 'e1a7c3b5d820'
+branch_labels = None
+depends_on = None
+
+# Expressions identiques à search.SKILL_DOCUMENT / REMARKS_DOCUMENT (sinon GIN ne sert pas)
+POSTGRES_INDEXES = [
+    """CREATE INDEX IF NOT EXISTS ix_skills_fts_english ON skills USING GIN ((
+        setweight(to_tsvector('english', coalesce(skills.skill_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(skills.category, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(skills.description, '')), 'C')))""",
+    """CREATE INDEX IF NOT EXISTS ix_employeeskills_remarks_fts_english ON employeeskills
+        USING GIN ((to_tsvector('english', coalesce(employeeskills.remarks, ''))))""",
+    """CREATE INDEX IF NOT EXISTS ix_skills_fts_spanish ON skills USING GIN ((
+        setweight(to_tsvector('spanish', coalesce(skills.skill_name, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(skills.category, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(skills.description, '')), 'C')))""",
+    """CREATE INDEX IF NOT EXISTS ix_employeeskills_remarks_fts_spanish ON employeeskills
+        USING GIN ((to_tsvector('spanish', coalesce(employeeskills.remarks, ''))))""",
+]
+
+# SQLite : tables FTS5 à contenu externe tenues à jour par triggers
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
+        skill_name, category, description, content='skills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_ai AFTER INSERT ON skills BEGIN
+        INSERT INTO skills_fts(rowid, skill_name, category, description)
+        VALUES (new.id, new.skill_name, new.category, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_ad AFTER DELETE ON skills BEGIN
+        INSERT INTO skills_fts(skills_fts, rowid, skill_name, category, description)
+        VALUES ('delete', old.id, old.skill_name, old.category, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_au AFTER UPDATE ON skills BEGIN
+        INSERT INTO skills_fts(skills_fts, rowid, skill_name, category, description)
+        VALUES ('delete', old.id, old.skill_name, old.category, old.description);
+        INSERT INTO skills_fts(rowid, skill_name, category, description)
+        VALUES (new.id, new.skill_name, new.category, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS employeeskills_fts USING fts5(
+        remarks, content='employeeskills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ai AFTER INSERT ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ad AFTER DELETE ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_au AFTER UPDATE OF remarks ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+    "INSERT INTO skills_fts(skills_fts) VALUES ('rebuild')",
+    "INSERT INTO employeeskills_fts(employeeskills_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_INDEXES:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in SQLITE_SCHEMA:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for config in ('english', 'spanish'):
+            op.execute(f"DROP INDEX IF EXISTS ix_skills_fts_{config}")
+            op.execute(f"DROP INDEX IF EXISTS ix_employeeskills_remarks_fts_{config}")
+    elif dialect == 'sqlite':
+        for name in ('skills_fts_ai', 'skills_fts_ad', 'skills_fts_au',
+                     'employeeskills_fts_ai', 'employeeskills_fts_ad', 'employeeskills_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS skills_fts")
+        op.execute("DROP TABLE IF EXISTS employeeskills_fts")
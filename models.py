@@ -1,8 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from db_routing import RoutingSession
 from datetime import datetime
 from flask_login import UserMixin
 
-db = SQLAlchemy()
+# RoutingSession : lectures des routes @read_only vers le réplica s'il est configuré
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 class Employee(db.Model):
     __tablename__ = "employees"  # ✅ correspond à ta table
@@ -22,17 +24,23 @@ class Employee(db.Model):
 
     skills = db.relationship("EmployeeSkill", back_populates="employee", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        db.Index("ix_employees_plant_name", "plant", "last_name", "first_name"),
+        db.Index("ix_employees_plant_department", "plant", "department"),
+    )
+
 class Skill(db.Model):
     __tablename__ = "skills"  # ✅ correspond à ta table
     id = db.Column(db.Integer, primary_key=True)
     skill_name = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(100))
     description = db.Column(db.Text)
+    min_level = db.Column(db.String(1))  # niveau minimal pour tenir le poste (affectation)
 
     employees = db.relationship("EmployeeSkill", back_populates="skill", cascade="all, delete-orphan")
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
-    id = db.Column(db.BigInteger, primary_key=True)
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)  # autoincrement SQLite (tests locaux)
     created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     action = db.Column(db.String(50), nullable=False)
@@ -41,7 +49,12 @@ class AuditLog(db.Model):
     details = db.Column(db.JSON)
     ip_address = db.Column(db.String(64))
     user_agent = db.Column(db.Text)
+    plant = db.Column(db.String(100))  # usine de l'entité (Employee / EmployeeSkill), renseignée au flush
     user = db.relationship("User", backref="audit_logs", lazy=True)
+
+    __table_args__ = (
+        db.Index("ix_audit_logs_plant_created", "plant", "created_at"),
+    )
 class EmployeeSkill(db.Model):
     __tablename__ = "employeeskills"  # ✅ correspond à ta table
     id = db.Column(db.Integer, primary_key=True)
@@ -51,11 +64,21 @@ class EmployeeSkill(db.Model):
     last_assessed = db.Column(db.Date)
     trainer = db.Column(db.String(100))
     remarks = db.Column(db.Text)
-    attachment = db.Column(db.String(255))
+    attachment = db.Column(db.String(255))  # URL GitHub (anciennes pièces jointes)
+    attachment_id = db.Column(db.Integer, db.ForeignKey("attachments.id", ondelete="SET NULL"))
+    trainer_id = db.Column(db.Integer, db.ForeignKey("trainers.id", ondelete="SET NULL"))  # formateur normalisé
+    plant = db.Column(db.String(100))  # copie de employees.plant (filtre d'usine, partitionnement)
 
     employee = db.relationship("Employee", back_populates="skills")
     skill = db.relationship("Skill", back_populates="employees")
 
+    __table_args__ = (
+        db.Index("ix_employeeskills_trainer_assessed", "trainer_id", "last_assessed"),
+        db.Index("ix_employeeskills_plant_employee", "plant", "employee_id"),
+        db.Index("ix_employeeskills_plant_skill_level", "plant", "skill_id", "level"),
+        db.Index("ix_employeeskills_attachment", "attachment_id"),
+    )
+
 from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(UserMixin, db.Model):
@@ -66,9 +89,91 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     display_name = db.Column(db.String(120))
     role = db.Column(db.String(20), default="user")  # 'admin' or 'user'
+    # Usines attribuées, chargées avec l'utilisateur (même requête que le user_loader)
+    plants = db.relationship("UserPlant", lazy="joined", cascade="all, delete-orphan", order_by="UserPlant.plant")
 
     def set_password(self, password: str):
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
+
+class EmployeeSkillHistory(db.Model):
+    """Historique append-only des niveaux (une ligne par changement, jamais modifiée)."""
+    __tablename__ = "employeeskill_history"
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    employee_skill_id = db.Column(db.Integer)  # pas de FK : la ligne survit à la suppression
+    employee_id = db.Column(db.Integer, nullable=False)
+    skill_id = db.Column(db.Integer, nullable=False)
+    plant = db.Column(db.String(100))  # usine de l'employé au moment du changement
+    change_type = db.Column(db.String(10), nullable=False)  # assign / update / remove / transfer / backfill
+    level = db.Column(db.String(1))  # NULL = compétence retirée
+    previous_level = db.Column(db.String(1))
+    trainer = db.Column(db.String(100))
+    trainer_id = db.Column(db.Integer)  # formateur normalisé ; pas de FK (SET NULL = UPDATE refusé)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    changed_by = db.Column(db.Integer)
+
+    __table_args__ = (
+        db.Index("ix_esh_employee_skill_changed", "employee_id", "skill_id", "changed_at"),
+        db.Index("ix_esh_plant_changed", "plant", "changed_at"),
+        db.Index("ix_esh_skill_changed", "skill_id", "changed_at"),
+        db.Index("ix_esh_trainer_changed", "trainer_id", "changed_at"),
+    )
+
+class Attachment(db.Model):
+    """Pièce jointe dédupliquée par contenu (sha256)."""
+    __tablename__ = "attachments"
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    filename = db.Column(db.String(255), nullable=False)  # nom d'origine assaini
+    content_type = db.Column(db.String(100))
+    size = db.Column(db.BigInteger, nullable=False)
+    storage_url = db.Column(db.String(500))  # copie GitHub (raw)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DataVersion(db.Model):
+    """Compteur de version par type de données (clé des caches de fragments)."""
+    __tablename__ = "data_versions"
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+class Trainer(db.Model):
+    """Formateur ; name_key = nom normalisé (minuscules, sans accents ni ponctuation)."""
+    __tablename__ = "trainers"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    name_key = db.Column(db.String(100), unique=True, nullable=False)
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ChangeLog(db.Model):
+    """Flux de changements (employés, compétences, affectations) : id = séquence monotone."""
+    __tablename__ = "change_log"
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # employee / skill / employeeskill
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # insert / update / delete
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_change_log_changed_at", "changed_at"),
+    )
+
+class WebhookSubscription(db.Model):
+    """Abonné au flux de changements : envoi par lots, curseur = dernier id acquitté."""
+    __tablename__ = "webhook_subscriptions"
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    url = db.Column(db.String(500), nullable=False)
+    secret = db.Column(db.String(255))  # signature HMAC-SHA256 des envois
+    cursor = db.Column(db.BigInteger, nullable=False, default=0)
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    last_pushed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+
+class UserPlant(db.Model):
+    """Usines attribuées à un utilisateur (aucune = toutes les usines)."""
+    __tablename__ = "user_plants"
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    plant = db.Column(db.String(100), primary_key=True)
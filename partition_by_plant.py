@@ -0,0 +1,134 @@
+"""
+Partitionnement déclaratif PostgreSQL (PARTITION BY LIST (plant)) de
+employeeskills et audit_logs : une partition par usine + une partition DEFAULT
+(usines inconnues, plant NULL). Les requêtes filtrées par usine (plant_scope)
+ne lisent plus qu'une partition.
+
+Optionnel, à lancer une fois après `flask db upgrade` (colonnes plant
+renseignées), pendant une fenêtre de maintenance : chaque table est recopiée
+sous verrou exclusif, dans une seule transaction.
+
+    python partition_by_plant.py --database-url postgresql+psycopg2://localhost/skill_matrix --dry-run
+    python partition_by_plant.py --database-url postgresql+psycopg2://localhost/skill_matrix --drop-old
+
+La clé primaire d'une table partitionnée doit contenir la clé de partition ;
+plant pouvant être NULL, elle est remplacée par un index unique (id, plant),
+l'unicité de id restant assurée par la séquence. Les autres index (dont les
+index GIN de la recherche) et les clés étrangères sont recréés à l'identique.
+"""
+import argparse
+import os
+import re
+import time
+
+from sqlalchemy import create_engine, text
+
+from plant_scope import PLANTS
+
+TABLES = ("employeeskills", "audit_logs")
+OLD_SUFFIX = "_unpartitioned"
+
+
+def _name(*parts):
+    """Identifiant PostgreSQL (63 caractères max)."""
+    return re.sub(r"[^a-z0-9_]+", "_", "_".join(parts).lower())[:63]
+
+
+def _plants(conn):
+    found = conn.execute(text("SELECT DISTINCT plant FROM employees WHERE plant IS NOT NULL")).scalars()
+    return sorted(set(PLANTS) | set(found))
+
+
+def partition_statements(conn, table, plants, drop_old=False):
+    """Instructions SQL de conversion de `table` (liste vide si déjà partitionnée)."""
+    if conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}).scalar() == "p":
+        return []
+    old = _name(table, OLD_SUFFIX)
+    indexes = conn.execute(text("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = to_regclass(:t) AND NOT x.indisprimary
+        ORDER BY i.relname
+    """), {"t": table}).all()
+    foreign_keys = conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(:t) AND contype = 'f' ORDER BY conname
+    """), {"t": table}).all()
+    identity = conn.execute(text("""
+        SELECT is_identity = 'YES' FROM information_schema.columns
+        WHERE table_name = :t AND column_name = 'id'
+    """), {"t": table}).scalar()
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}).scalar()
+
+    statements = [
+        f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {table} RENAME TO {old}",
+    ]
+    # Les noms d'index sont globaux au schéma : ceux de l'ancienne table sont renommés
+    statements += [f"ALTER INDEX {name} RENAME TO {_name(name, OLD_SUFFIX)}" for name, _ in indexes]
+    statements += [
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+        f"INCLUDING IDENTITY INCLUDING STORAGE) PARTITION BY LIST (plant)",
+        f"CREATE UNIQUE INDEX {_name(table, 'id_plant')} ON {table} (id, plant)",
+    ]
+    for plant in plants:
+        literal = plant.replace("'", "''")
+        statements.append(f"CREATE TABLE {_name(table, plant)} PARTITION OF {table} FOR VALUES IN ('{literal}')")
+    statements.append(f"CREATE TABLE {_name(table, 'default')} PARTITION OF {table} DEFAULT")
+
+    statements.append(f"INSERT INTO {table} OVERRIDING SYSTEM VALUE SELECT * FROM {old}")
+    if identity:
+        statements.append(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                          f"(SELECT coalesce(max(id), 0) + 1 FROM {table}), false)")
+    elif sequence:
+        # La séquence (serial) suit la nouvelle table : DROP de l'ancienne sans la supprimer
+        statements.append(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+
+    for name, definition in indexes:
+        definition = re.sub(rf"ON (ONLY )?(\w+\.)?{table}\b", f"ON {table}", definition, count=1)
+        statements.append(definition)
+    statements += [f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}" for name, definition in foreign_keys]
+
+    if drop_old:
+        statements.append(f"DROP TABLE {old}")
+    statements.append(f"ANALYZE {table}")
+    return statements
+
+
+def partition(url, tables=TABLES, drop_old=False, dry_run=False):
+    engine = create_engine(url)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("❌ Partitionnement déclaratif : PostgreSQL uniquement.")
+    for table in tables:
+        # --dry-run : simple lecture du catalogue, annulée à la fermeture
+        with engine.connect() if dry_run else engine.begin() as conn:
+            statements = partition_statements(conn, table, _plants(conn), drop_old=drop_old)
+            if not statements:
+                print(f"⏭️  {table} déjà partitionnée")
+                continue
+            start = time.perf_counter()
+            for statement in statements:
+                if dry_run:
+                    print(f"{statement};")
+                else:
+                    conn.execute(text(statement))
+            if not dry_run:
+                print(f"🗂️  {table} partitionnée par usine en {time.perf_counter() - start:.1f}s")
+    engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partitionne employeeskills et audit_logs par usine (PostgreSQL).")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--table", action="append", choices=TABLES, help="Une table seulement (répétable)")
+    parser.add_argument("--drop-old", action="store_true",
+                        help=f"Supprime les tables d'origine (sinon conservées en <table>{OLD_SUFFIX})")
+    parser.add_argument("--dry-run", action="store_true", help="Affiche le SQL sans rien modifier")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url (ou DATABASE_URL) requis")
+    partition(args.database_url, tables=args.table or TABLES, drop_old=args.drop_old, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Cloisonnement par usine : un utilisateur ne voit que les usines qui lui sont
+attribuées (table user_plants). Aucune usine attribuée, ou rôle admin : toutes.
+
+- Lectures : chaque SELECT ORM reçoit `plant IN (...)` sur Employee et
+  EmployeeSkill (with_loader_criteria : jointures, get(), chargements
+  paresseux compris). Les tables Core (Employee.__table__) ne sont pas
+  filtrées, ni les requêtes marquées execution_options(**SKIP_PLANT_SCOPE)
+  (matrice NumPy partagée, fiche publique du QR code).
+- Écritures : employeeskills.plant et audit_logs.plant copient l'usine de
+  l'employé (flush, UPDATE d'employés en masse) ; les index (plant, …) et le
+  partitionnement par usine (partition_by_plant.py) s'appuient dessus.
+
+    current_plants()          # None = pas de restriction, sinon ("Assymex",)
+    plant_filter("Assymex")   # 403 si l'usine n'est pas attribuée
+"""
+from flask import abort, has_request_context
+from flask_login import current_user
+from sqlalchemy import String, cast, event, select, update
+from sqlalchemy.orm import util as orm_util, with_loader_criteria
+
+from models import db, AuditLog, Employee, EmployeeSkill, User, UserPlant
+
+PLANTS = ["Assymex", "Electric Galeana", "Electric Rayones"]
+SKIP_PLANT_SCOPE = {"skip_plant_scope": True}  # execution_options : lecture non filtrée
+
+
+# ========= Usines de l'utilisateur =========
+def assign_plants(user, plants):
+    """Remplace les usines attribuées (liste vide = toutes les usines)."""
+    wanted = set(plants)
+    kept = [p for p in user.plants if p.plant in wanted]
+    user.plants = kept + [UserPlant(plant=p) for p in sorted(wanted - {p.plant for p in kept})]
+
+
+def current_plants():
+    """
+    Usines visibles pendant la requête HTTP : tuple, ou None si pas de restriction.
+    Aucune requête : User.plants est chargé avec l'utilisateur (user_loader).
+    """
+    if not has_request_context() or not getattr(current_user, "is_authenticated", False):
+        return None
+    if current_user.role == "admin":
+        return None
+    return tuple(p.plant for p in current_user.plants) or None
+
+
+def plant_allowed(plant):
+    plants = current_plants()
+    return plants is None or plant in plants
+
+
+def visible_plants():
+    return [p for p in PLANTS if plant_allowed(p)]
+
+
+def plant_filter(plant=None):
+    """Usine demandée (403 si non attribuée), sinon les usines de l'utilisateur (None = toutes)."""
+    if plant:
+        if not plant_allowed(plant):
+            abort(403)
+        return plant
+    return current_plants()
+
+
+# ========= Lectures =========
+def _on_orm_execute(orm_execute_state):
+    if (not orm_execute_state.is_select or orm_execute_state.is_column_load
+            or orm_execute_state.execution_options.get("skip_plant_scope")):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (User, UserPlant):
+        return  # chargement de current_user par Flask-Login : ne pas le redemander ici
+    plants = current_plants()
+    if plants is None:
+        return
+    orm_execute_state.statement = orm_execute_state.statement.options(
+        with_loader_criteria(Employee, lambda cls: cls.plant.in_(plants), include_aliases=True),
+        with_loader_criteria(EmployeeSkill, lambda cls: cls.plant.in_(plants), include_aliases=True),
+    )
+
+
+# ========= Écritures =========
+def _employee_plants(session, employee_ids):
+    """{employee_id: plant}, depuis la session puis une requête Core (non filtrée)."""
+    plants, missing = {}, set()
+    new = {o.id: o for o in session.new if isinstance(o, Employee)}
+    for employee_id in employee_ids:
+        employee = new.get(employee_id) or session.identity_map.get(orm_util.identity_key(Employee, employee_id))
+        if employee is not None:
+            plants[employee_id] = employee.plant
+        elif employee_id is not None:
+            missing.add(employee_id)
+    if missing:
+        e = Employee.__table__
+        plants.update(session.connection().execute(select(e.c.id, e.c.plant).where(e.c.id.in_(missing))).all())
+    return plants
+
+
+def _entity_id(log):
+    try:
+        return int(log.entity_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _before_flush(session, flush_context, instances):
+    skills = [o for o in session.new if isinstance(o, EmployeeSkill)]
+    skills += [o for o in session.dirty if isinstance(o, EmployeeSkill)
+               and db.inspect(o).attrs.employee_id.history.has_changes()]
+    logs = [o for o in session.new if isinstance(o, AuditLog) and o.plant is None
+            and o.entity_type in ("Employee", "EmployeeSkill")]
+    if not skills and not logs:
+        return
+
+    for es in skills:
+        employee = es.__dict__.get("employee")  # relation déjà chargée / affectée
+        if employee is not None:
+            es.plant = employee.plant
+    pending = [es for es in skills if es.__dict__.get("employee") is None]
+    plants = _employee_plants(session, {es.employee_id for es in pending})
+    for es in pending:
+        es.plant = plants.get(es.employee_id)
+
+    employee_logs = [log for log in logs if log.entity_type == "Employee"]
+    plants = _employee_plants(session, {_entity_id(log) for log in employee_logs})
+    for log in employee_logs:
+        log.plant = plants.get(_entity_id(log))
+    for log in logs:
+        if log.entity_type == "EmployeeSkill" and _entity_id(log) is not None:
+            es = session.identity_map.get(orm_util.identity_key(EmployeeSkill, _entity_id(log)))
+            if es is not None:
+                log.plant = es.plant
+            else:
+                log.plant = session.connection().execute(
+                    select(EmployeeSkill.__table__.c.plant).where(EmployeeSkill.__table__.c.id == _entity_id(log))
+                ).scalar()
+
+
+def sync_statement(employee_ids=None):
+    """UPDATE … FROM employees : employeeskills.plant = usine actuelle de l'employé."""
+    es, e = EmployeeSkill.__table__, Employee.__table__
+    statement = (update(es).where(es.c.employee_id == e.c.id, es.c.plant.is_distinct_from(e.c.plant))
+                 .values(plant=e.c.plant))
+    if employee_ids is not None:
+        statement = statement.where(e.c.id.in_(employee_ids))
+    return statement
+
+
+def backfill_statements():
+    """Copie initiale de l'usine dans employeeskills puis audit_logs (UPDATE … FROM)."""
+    es, e, a = EmployeeSkill.__table__, Employee.__table__, AuditLog.__table__
+    return [
+        sync_statement(),
+        update(a).where(a.c.entity_type == "Employee", a.c.entity_id == cast(e.c.id, String))
+        .values(plant=e.c.plant),
+        update(a).where(a.c.entity_type == "EmployeeSkill", a.c.entity_id == cast(es.c.id, String))
+        .values(plant=es.c.plant),
+    ]
+
+
+def _after_flush(session, flush_context):
+    moved = [o.id for o in session.dirty if isinstance(o, Employee)
+             and db.inspect(o).attrs.plant.history.has_changes()]
+    if moved:
+        session.connection().execute(sync_statement(moved))
+
+
+def _after_bulk_update(orm_execute_state):
+    # update(Employee)… : employés visés relus avant l'UPDATE (le filtre peut porter sur plant)
+    if not orm_execute_state.is_update:
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, Employee):
+        return None
+    e = Employee.__table__
+    source = select(e.c.id)
+    if orm_execute_state.statement.whereclause is not None:
+        source = source.where(orm_execute_state.statement.whereclause)
+    connection = orm_execute_state.session.connection()
+    ids = list(connection.execute(source).scalars())
+    result = orm_execute_state.invoke_statement()
+    if ids:
+        connection.execute(sync_statement(ids))
+    return result
+
+
+def init_plant_scope(app):
+    if not event.contains(db.session, "before_flush", _before_flush):
+        event.listen(db.session, "before_flush", _before_flush)
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "do_orm_execute", _on_orm_execute)
+        event.listen(db.session, "do_orm_execute", _after_bulk_update)
+
+    @app.context_processor
+    def inject_plant_scope():
+        return dict(plant_scope=current_plants, visible_plants=visible_plants)
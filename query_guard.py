@@ -0,0 +1,131 @@
+"""
+Détection des lazy loads (N+1) en développement / tests.
+
+STRICT_LAZY_LOAD=raise : tout chargement paresseux d'une relation lève LazyLoadError
+STRICT_LAZY_LOAD=warn  : le chargement est journalisé (logger skill_matrix.lazyload)
+
+Le message indique la route, le template et la ligne qui ont déclenché la requête.
+"""
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import sys
+import threading
+
+from flask import g, has_request_context, request, current_app
+from sqlalchemy import event
+
+from models import db
+
+logger = logging.getLogger("skill_matrix.lazyload")
+
+
+class LazyLoadError(RuntimeError):
+    """Relation chargée paresseusement alors que le mode strict est actif."""
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Plus de requêtes SQL que le budget autorisé."""
+
+
+def _template_location():
+    """(template, ligne) du frame Jinja le plus proche dans la pile, sinon (None, None)."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        template = frame.f_globals.get("__jinja_template__")
+        if template is not None:
+            return template.name or "<string>", template.get_corresponding_lineno(frame.f_lineno)
+        frame = frame.f_back
+    return None, None
+
+
+def _describe(orm_execute_state):
+    parent = orm_execute_state.lazy_loaded_from
+    path = orm_execute_state.loader_strategy_path
+    relationship = path[-1].key if path and hasattr(path[-1], "key") else "?"
+    template, line = _template_location()
+    route = request.endpoint if has_request_context() else None
+    where = f"{template}:{line}" if template else "code Python"
+    return (f"Lazy load {parent.mapper.class_.__name__}.{relationship} "
+            f"(route={route or '-'}, {where})")
+
+
+def _check_lazy_load(orm_execute_state):
+    if not orm_execute_state.is_relationship_load or orm_execute_state.lazy_loaded_from is None:
+        return
+    mode = current_app.config.get("STRICT_LAZY_LOAD")
+    if not mode:
+        return
+    message = _describe(orm_execute_state)
+    if has_request_context():
+        g.setdefault("lazy_loads", []).append(message)
+    if mode == "raise":
+        raise LazyLoadError(message + " — ajouter selectinload()/joinedload() dans la vue")
+    logger.warning("🐌 %s", message)
+
+
+# ========= Budgets de requêtes =========
+_budget_lock = threading.Lock()
+_active_counters = []
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    with _budget_lock:
+        for counter in _active_counters:
+            counter["count"] += 1
+            counter["statements"].append(statement)
+
+
+@contextmanager
+def assert_query_budget(max_queries):
+    """
+    Pour les tests : échoue si le bloc exécute plus de `max_queries` requêtes SQL.
+
+        with assert_query_budget(5):
+            client.get("/employee/1")
+    """
+    counter = {"count": 0, "statements": []}
+    with _budget_lock:
+        _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _budget_lock:
+            _active_counters.remove(counter)
+    if counter["count"] > max_queries:
+        raise QueryBudgetExceeded(
+            f"{counter['count']} requêtes SQL pour un budget de {max_queries} :\n  "
+            + "\n  ".join(s.split("\n")[0][:120] for s in counter["statements"])
+        )
+
+
+def query_budget(max_queries):
+    """Décorateur de vue : budget SQL vérifié après chaque requête en mode strict."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_budget = max_queries
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def init_query_guard(app, engine):
+    """À appeler après init_instrumentation (lit les compteurs SQL de la requête)."""
+    app.config.setdefault("STRICT_LAZY_LOAD", None)
+    if not event.contains(db.session, "do_orm_execute", _check_lazy_load):
+        event.listen(db.session, "do_orm_execute", _check_lazy_load)
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+    @app.after_request
+    def _check_route_budget(response):
+        budget = g.get("query_budget")
+        perf = g.get("_perf")
+        if budget is None or perf is None or not app.config.get("STRICT_LAZY_LOAD"):
+            return response
+        if perf["sql_count"] > budget:
+            message = f"{request.endpoint}: {perf['sql_count']} requêtes SQL (budget {budget})"
+            if app.config["STRICT_LAZY_LOAD"] == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning("📈 %s", message)
+        return response
@@ -0,0 +1,223 @@
+"""
+Recherche plein texte classée sur le catalogue de compétences et les remarques.
+
+PostgreSQL : index GIN sur des expressions to_tsvector, une par configuration
+(english / spanish, d'après la locale en / es_MX), requêtes websearch_to_tsquery,
+classement ts_rank_cd, extraits ts_headline. Les documents (SKILL_DOCUMENT,
+REMARKS_DOCUMENT) sont repris tels quels par la migration : la requête doit
+utiliser exactement l'expression de l'index pour que GIN serve.
+
+SQLite (tests locaux) : tables FTS5 à contenu externe (skills_fts,
+employeeskills_fts) tenues à jour par triggers, classement bm25, highlight /
+snippet. Pas de racinisation : les mots sont cherchés par préfixe.
+
+Les remarques passent par les tables Core : le filtre d'usine de la session
+ne s'applique pas, search_remarks le reprend sur employeeskills.plant.
+
+    results = search_skills("soldadura", locale="es_MX", page=2)
+"""
+import re
+
+from markupsafe import Markup, escape
+from sqlalchemy import bindparam, func, literal_column, select, text
+
+from models import db, Employee, EmployeeSkill, Skill
+from plant_scope import current_plants
+
+CONFIGS = {"en": "english", "es": "spanish"}  # locale → configuration PostgreSQL
+PER_PAGE = 20
+MARK_START, MARK_END = "⟦", "⟧"  # délimiteurs ⟦ ⟧ remplacés par <mark> après échappement
+
+SKILL_DOCUMENT = (
+    "setweight(to_tsvector('{config}', coalesce(skills.skill_name, '')), 'A') || "
+    "setweight(to_tsvector('{config}', coalesce(skills.category, '')), 'B') || "
+    "setweight(to_tsvector('{config}', coalesce(skills.description, '')), 'C')"
+)
+REMARKS_DOCUMENT = "to_tsvector('{config}', coalesce(employeeskills.remarks, ''))"
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=30, MinWords=8, MaxFragments=2"
+
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
+        skill_name, category, description, content='skills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_ai AFTER INSERT ON skills BEGIN
+        INSERT INTO skills_fts(rowid, skill_name, category, description)
+        VALUES (new.id, new.skill_name, new.category, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_ad AFTER DELETE ON skills BEGIN
+        INSERT INTO skills_fts(skills_fts, rowid, skill_name, category, description)
+        VALUES ('delete', old.id, old.skill_name, old.category, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS skills_fts_au AFTER UPDATE ON skills BEGIN
+        INSERT INTO skills_fts(skills_fts, rowid, skill_name, category, description)
+        VALUES ('delete', old.id, old.skill_name, old.category, old.description);
+        INSERT INTO skills_fts(rowid, skill_name, category, description)
+        VALUES (new.id, new.skill_name, new.category, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS employeeskills_fts USING fts5(
+        remarks, content='employeeskills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ai AFTER INSERT ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_ad AFTER DELETE ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employeeskills_fts_au AFTER UPDATE OF remarks ON employeeskills BEGIN
+        INSERT INTO employeeskills_fts(employeeskills_fts, rowid, remarks) VALUES ('delete', old.id, old.remarks);
+        INSERT INTO employeeskills_fts(rowid, remarks) VALUES (new.id, new.remarks);
+    END""",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS skills_fts_ai", "DROP TRIGGER IF EXISTS skills_fts_ad",
+    "DROP TRIGGER IF EXISTS skills_fts_au", "DROP TABLE IF EXISTS skills_fts",
+    "DROP TRIGGER IF EXISTS employeeskills_fts_ai", "DROP TRIGGER IF EXISTS employeeskills_fts_ad",
+    "DROP TRIGGER IF EXISTS employeeskills_fts_au", "DROP TABLE IF EXISTS employeeskills_fts",
+]
+
+
+# ========= Index =========
+def postgres_index_statements():
+    """CREATE INDEX … USING GIN, un par document et par configuration."""
+    statements = []
+    for config in sorted(set(CONFIGS.values())):
+        statements.append(f"CREATE INDEX IF NOT EXISTS ix_skills_fts_{config} ON skills "
+                          f"USING GIN (({SKILL_DOCUMENT.format(config=config)}))")
+        statements.append(f"CREATE INDEX IF NOT EXISTS ix_employeeskills_remarks_fts_{config} ON employeeskills "
+                          f"USING GIN (({REMARKS_DOCUMENT.format(config=config)}))")
+    return statements
+
+
+def ensure_search_index(connection):
+    """Crée les index de recherche s'ils manquent (idempotent) ; FTS5 reconstruit sous SQLite."""
+    if connection.dialect.name == "postgresql":
+        for statement in postgres_index_statements():
+            connection.execute(text(statement))
+    elif connection.dialect.name == "sqlite":
+        for statement in SQLITE_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(text("INSERT INTO skills_fts(skills_fts) VALUES ('rebuild')"))
+        connection.execute(text("INSERT INTO employeeskills_fts(employeeskills_fts) VALUES ('rebuild')"))
+
+
+# ========= Requêtes =========
+def highlight(value):
+    """Texte ⟦surligné⟧ renvoyé par la base → HTML échappé avec <mark>."""
+    html = str(escape(value or ""))
+    return Markup(html.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>"))
+
+
+def _config(locale):
+    return CONFIGS.get(str(locale or "en").split("_")[0], "english")
+
+
+def _fts5_query(q):
+    """Saisie libre → requête FTS5 sûre : chaque mot entre guillemets, par préfixe, tous requis."""
+    words = re.findall(r"\w+", q or "")
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _page(total, page, per_page):
+    return {"page": page, "per_page": per_page, "total": total, "pages": max(1, -(-total // per_page))}
+
+
+def search_skills(q, locale="en", page=1, per_page=PER_PAGE):
+    """Compétences classées : ([{id, name, category, snippet, rank}], pagination)."""
+    page = max(1, page)
+    if db.session.get_bind().dialect.name == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return [], _page(0, page, per_page)
+        total = db.session.execute(text("SELECT count(*) FROM skills_fts WHERE skills_fts MATCH :q"),
+                                   {"q": match}).scalar()
+        rows = db.session.execute(text(f"""
+            SELECT rowid AS id, bm25(skills_fts, 10.0, 5.0, 1.0) AS rank,
+                   highlight(skills_fts, 0, '{MARK_START}', '{MARK_END}') AS name,
+                   highlight(skills_fts, 1, '{MARK_START}', '{MARK_END}') AS category,
+                   snippet(skills_fts, 2, '{MARK_START}', '{MARK_END}', '…', 24) AS snippet
+            FROM skills_fts WHERE skills_fts MATCH :q
+            ORDER BY rank LIMIT :limit OFFSET :offset
+        """), {"q": match, "limit": per_page, "offset": (page - 1) * per_page}).all()
+        items = [{"id": r.id, "rank": -r.rank, "name": highlight(r.name), "category": highlight(r.category),
+                  "snippet": highlight(r.snippet)} for r in rows]
+        return items, _page(total, page, per_page)
+
+    config = _config(locale)
+    regconfig = literal_column(f"'{config}'")
+    document = literal_column(f"({SKILL_DOCUMENT.format(config=config)})")
+    query = func.websearch_to_tsquery(regconfig, q or "")
+    matches = document.op("@@")(query)
+    total = db.session.execute(select(func.count()).select_from(Skill).where(matches)).scalar()
+    rank = func.ts_rank_cd(document, query).label("rank")
+    rows = db.session.execute(
+        select(Skill.id, rank,
+               func.ts_headline(regconfig, Skill.skill_name, query, HEADLINE_OPTIONS).label("name"),
+               func.ts_headline(regconfig, func.coalesce(Skill.category, ""), query, HEADLINE_OPTIONS).label("category"),
+               func.ts_headline(regconfig, func.coalesce(Skill.description, ""), query, HEADLINE_OPTIONS).label("snippet"))
+        .where(matches).order_by(rank.desc(), Skill.id).limit(per_page).offset((page - 1) * per_page)
+    ).all()
+    items = [{"id": r.id, "rank": float(r.rank), "name": highlight(r.name), "category": highlight(r.category),
+              "snippet": highlight(r.snippet)} for r in rows]
+    return items, _page(total, page, per_page)
+
+
+def search_remarks(q, locale="en", page=1, per_page=PER_PAGE):
+    """Remarques d'affectation classées : ([{id, employee_id, employee, skill, snippet, rank}], pagination)."""
+    page = max(1, page)
+    plants = current_plants()
+    es, e, s = EmployeeSkill.__table__, Employee.__table__, Skill.__table__
+    details = (select(es.c.id, es.c.employee_id, e.c.first_name, e.c.last_name, s.c.skill_name)
+               .select_from(es.join(e, e.c.id == es.c.employee_id).outerjoin(s, s.c.id == es.c.skill_id)))
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return [], _page(0, page, per_page)
+        scope, params = "", {"q": match}
+        if plants is not None:
+            # +rowid : le IN filtre les résultats du MATCH au lieu de piloter FTS5 (un accès par id)
+            scope = " AND +rowid IN (SELECT id FROM employeeskills WHERE plant IN :plants)"
+            params["plants"] = list(plants)
+
+        def fts(sql):
+            statement = text(sql)
+            return statement.bindparams(bindparam("plants", expanding=True)) if scope else statement
+
+        total = db.session.execute(fts(f"SELECT count(*) FROM employeeskills_fts "
+                                       f"WHERE employeeskills_fts MATCH :q{scope}"), params).scalar()
+        ranked = db.session.execute(fts(f"""
+            SELECT rowid AS id, bm25(employeeskills_fts) AS rank,
+                   snippet(employeeskills_fts, 0, '{MARK_START}', '{MARK_END}', '…', 24) AS snippet
+            FROM employeeskills_fts WHERE employeeskills_fts MATCH :q{scope}
+            ORDER BY rank LIMIT :limit OFFSET :offset
+        """), {**params, "limit": per_page, "offset": (page - 1) * per_page}).all()
+        ranks = {r.id: (-r.rank, r.snippet) for r in ranked}
+        rows = {r.id: r for r in db.session.execute(details.where(es.c.id.in_(ranks)))}
+        order = [r.id for r in ranked if r.id in rows]
+    else:
+        config = _config(locale)
+        regconfig = literal_column(f"'{config}'")
+        document = literal_column(f"({REMARKS_DOCUMENT.format(config=config)})")
+        query = func.websearch_to_tsquery(regconfig, q or "")
+        matches = document.op("@@")(query)
+        if plants is not None:
+            matches = matches & es.c.plant.in_(plants)
+        total = db.session.execute(select(func.count()).select_from(es).where(matches)).scalar()
+        rank = func.ts_rank_cd(document, query).label("rank")
+        ranked = db.session.execute(
+            details.add_columns(rank, func.ts_headline(regconfig, es.c.remarks, query, HEADLINE_OPTIONS).label("snippet"))
+            .where(matches).order_by(rank.desc(), es.c.id).limit(per_page).offset((page - 1) * per_page)
+        ).all()
+        ranks = {r.id: (float(r.rank), r.snippet) for r in ranked}
+        rows = {r.id: r for r in ranked}
+        order = [r.id for r in ranked]
+
+    items = [{
+        "id": i,
+        "employee_id": rows[i].employee_id,
+        "employee": f"{rows[i].first_name} {rows[i].last_name}",
+        "skill": rows[i].skill_name,
+        "rank": ranks[i][0],
+        "snippet": highlight(ranks[i][1]),
+    } for i in order]
+    return items, _page(total, page, per_page)
@@ -0,0 +1,231 @@
+"""
+Historique append-only des niveaux de compétence (table employeeskill_history).
+
+Chaque création / modification de niveau / suppression d'une EmployeeSkill ajoute
+une ligne dans la même transaction (after_flush, et DELETE ORM en masse via
+do_orm_execute). Une mutation d'usine ajoute une ligne « transfer » par
+compétence de l'employé (after_flush, et bulk_ops pour les UPDATE en masse). Les lignes ne sont jamais modifiées ni supprimées : l'ORM le
+refuse (HistoryIsAppendOnly) et, sous PostgreSQL, un trigger aussi.
+
+    matrix_as_of(datetime(2026, 1, 1), plant="Electric Galeana")
+    progression(employee_id)
+"""
+from datetime import datetime
+
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event, func, insert, literal, null, select
+from sqlalchemy.orm import aliased, util as orm_util
+
+from models import db, Employee, EmployeeSkill, EmployeeSkillHistory, Skill
+
+
+class HistoryIsAppendOnly(RuntimeError):
+    """Tentative de modification / suppression d'une ligne d'historique."""
+
+
+def _current_user_id():
+    if has_request_context() and getattr(current_user, "is_authenticated", False):
+        return current_user.id
+    return None
+
+
+# ========= Enregistrement =========
+def _plants(session, employee_ids):
+    """{employee_id: plant}, depuis l'identity map puis une seule requête pour le reste."""
+    plants, missing = {}, set()
+    for employee_id in employee_ids:
+        employee = session.identity_map.get(orm_util.identity_key(Employee, employee_id))
+        if employee is not None:
+            plants[employee_id] = employee.plant
+        else:
+            missing.add(employee_id)
+    if missing:
+        rows = session.connection().execute(
+            select(Employee.id, Employee.plant).where(Employee.id.in_(missing)))
+        plants.update(dict(rows.all()))
+    return plants
+
+
+def record_plant_changes(connection, plants):
+    """
+    Lignes « transfer » (niveau inchangé, nouvelle usine) pour chaque compétence
+    des employés mutés ; `plants` = {employee_id: nouvelle usine}.
+    """
+    es, h = EmployeeSkill.__table__, EmployeeSkillHistory.__table__
+    now, user_id = datetime.utcnow(), _current_user_id()
+    by_plant = {}
+    for employee_id, plant in plants.items():
+        by_plant.setdefault(plant, []).append(employee_id)
+    for plant, employee_ids in by_plant.items():
+        source = (
+            select(es.c.id, es.c.employee_id, es.c.skill_id, literal(plant, db.String), literal("transfer"),
+                   es.c.level, es.c.level, es.c.trainer, es.c.trainer_id,
+                   literal(now, db.DateTime), literal(user_id, db.Integer))
+            .where(es.c.employee_id.in_(employee_ids), es.c.skill_id.isnot(None))
+        )
+        connection.execute(insert(h).from_select(
+            [h.c.employee_skill_id, h.c.employee_id, h.c.skill_id, h.c.plant, h.c.change_type,
+             h.c.level, h.c.previous_level, h.c.trainer, h.c.trainer_id, h.c.changed_at, h.c.changed_by],
+            source,
+        ))
+
+
+def _after_flush(session, flush_context):
+    moved = {
+        obj.id: obj.plant for obj in session.dirty
+        if isinstance(obj, Employee) and db.inspect(obj).attrs.plant.history.has_changes()
+    }
+    if moved:
+        record_plant_changes(session.connection(), moved)
+
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, EmployeeSkill):
+            changes.append((obj, "assign", None))
+    for obj in session.dirty:
+        if isinstance(obj, EmployeeSkill):
+            level = db.inspect(obj).attrs.level.history
+            trainer = db.inspect(obj).attrs.trainer.history
+            trainer_id = db.inspect(obj).attrs.trainer_id.history
+            if level.has_changes() or trainer.has_changes() or trainer_id.has_changes():
+                previous = level.deleted[0] if level.deleted else obj.level
+                changes.append((obj, "update", previous))
+    for obj in session.deleted:
+        if isinstance(obj, EmployeeSkill):
+            changes.append((obj, "remove", obj.level))
+    if not changes:
+        return
+
+    plants = _plants(session, {obj.employee_id for obj, _, _ in changes})
+    now, user_id = datetime.utcnow(), _current_user_id()
+    session.connection().execute(insert(EmployeeSkillHistory), [
+        {
+            "employee_skill_id": obj.id,
+            "employee_id": obj.employee_id,
+            "skill_id": obj.skill_id,
+            "plant": plants.get(obj.employee_id),
+            "change_type": change_type,
+            "level": None if change_type == "remove" else obj.level,
+            "previous_level": previous,
+            "trainer": obj.trainer,
+            "trainer_id": obj.trainer_id,
+            "changed_at": now,
+            "changed_by": user_id,
+        }
+        for obj, change_type, previous in changes
+    ])
+
+
+def _on_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    classes = {m.class_ for m in orm_execute_state.all_mappers}
+    if EmployeeSkillHistory in classes:
+        raise HistoryIsAppendOnly("employeeskill_history est en ajout seul")
+    if orm_execute_state.is_delete and EmployeeSkill in classes:
+        # delete(EmployeeSkill)… / Query.delete() : on archive les lignes avant le DELETE
+        statement = orm_execute_state.statement
+        es = EmployeeSkill.__table__
+        source = (
+            select(es.c.id, es.c.employee_id, es.c.skill_id, Employee.__table__.c.plant,
+                   literal("remove"), null(), es.c.level, es.c.trainer, es.c.trainer_id,
+                   literal(datetime.utcnow()), literal(_current_user_id(), db.Integer))
+            .select_from(es.outerjoin(Employee.__table__, Employee.__table__.c.id == es.c.employee_id))
+            .where(es.c.employee_id.isnot(None), es.c.skill_id.isnot(None))
+        )
+        if statement.whereclause is not None:
+            source = source.where(statement.whereclause)
+        h = EmployeeSkillHistory.__table__
+        orm_execute_state.session.connection().execute(insert(h).from_select(
+            [h.c.employee_skill_id, h.c.employee_id, h.c.skill_id, h.c.plant, h.c.change_type,
+             h.c.level, h.c.previous_level, h.c.trainer, h.c.trainer_id, h.c.changed_at, h.c.changed_by],
+            source,
+        ))
+
+
+def backfill_statement():
+    """INSERT … SELECT : une ligne « backfill » par EmployeeSkill existante (date = last_assessed)."""
+    es, e, h = EmployeeSkill.__table__, Employee.__table__, EmployeeSkillHistory.__table__
+    changed_at = func.coalesce(es.c.last_assessed, func.current_date())
+    source = (
+        select(es.c.id, es.c.employee_id, es.c.skill_id, e.c.plant, literal("backfill"),
+               es.c.level, es.c.trainer, es.c.trainer_id, changed_at)
+        .select_from(es.outerjoin(e, e.c.id == es.c.employee_id))
+        .where(es.c.employee_id.isnot(None), es.c.skill_id.isnot(None))
+    )
+    return insert(h).from_select(
+        [h.c.employee_skill_id, h.c.employee_id, h.c.skill_id, h.c.plant, h.c.change_type,
+         h.c.level, h.c.trainer, h.c.trainer_id, h.c.changed_at],
+        source,
+    )
+
+
+def _refuse(mapper, connection, target):
+    raise HistoryIsAppendOnly("employeeskill_history est en ajout seul")
+
+
+# ========= Requêtes =========
+def matrix_as_of(as_of, plant=None, category=None):
+    """
+    État de la matrice juste avant `as_of` (datetime) : dernière ligne par
+    (employé, compétence) via ROW_NUMBER sur l'index (employee_id, skill_id, changed_at).
+
+    `plant` (une usine ou un tuple d'usines) porte sur l'usine de cette
+    dernière ligne, donc l'usine de l'employé à `as_of` (les mutations ajoutent
+    une ligne « transfer »). Avant le classement, seuls les employés passés par
+    ces usines avant `as_of` sont lus (index (plant, changed_at)).
+    """
+    h = EmployeeSkillHistory
+    ranked = select(
+        h.employee_id, h.skill_id, h.level, h.plant, h.changed_at,
+        func.row_number().over(
+            partition_by=(h.employee_id, h.skill_id),
+            order_by=(h.changed_at.desc(), h.id.desc()),
+        ).label("rn"),
+    ).where(h.changed_at < as_of)
+    plants = None
+    if plant:
+        plants = [plant] if isinstance(plant, str) else list(plant)
+        seen = aliased(EmployeeSkillHistory)
+        ranked = ranked.where(h.employee_id.in_(
+            select(seen.employee_id).where(seen.plant.in_(plants), seen.changed_at < as_of)))
+    if category:
+        ranked = ranked.where(h.skill_id.in_(select(Skill.id).where(Skill.category == category)))
+    ranked = ranked.subquery()
+
+    query = (
+        select(ranked.c.employee_id, ranked.c.skill_id, ranked.c.level, ranked.c.plant,
+               ranked.c.changed_at, Employee.first_name, Employee.last_name, Skill.skill_name)
+        .outerjoin(Employee, Employee.id == ranked.c.employee_id)
+        .outerjoin(Skill, Skill.id == ranked.c.skill_id)
+        .where(ranked.c.rn == 1, ranked.c.level.isnot(None))
+        .order_by(ranked.c.employee_id, ranked.c.skill_id)
+    )
+    if plants:
+        query = query.where(ranked.c.plant.in_(plants))
+    return db.session.execute(query).all()
+
+
+def progression(employee_id, skill_id=None):
+    """Changements de niveau d'un opérateur, par compétence puis chronologiques."""
+    h = EmployeeSkillHistory
+    query = (
+        select(h.skill_id, Skill.skill_name, h.change_type, h.previous_level, h.level,
+               h.trainer, h.changed_at)
+        .outerjoin(Skill, Skill.id == h.skill_id)
+        .where(h.employee_id == employee_id, h.change_type != "transfer")
+        .order_by(h.skill_id, h.changed_at, h.id)
+    )
+    if skill_id is not None:
+        query = query.where(h.skill_id == skill_id)
+    return db.session.execute(query).all()
+
+
+def init_skill_history(app):
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "do_orm_execute", _on_orm_execute)
+    if not event.contains(EmployeeSkillHistory, "before_update", _refuse):
+        event.listen(EmployeeSkillHistory, "before_update", _refuse)
+        event.listen(EmployeeSkillHistory, "before_delete", _refuse)
@@ -0,0 +1,242 @@
+"""
+Matrice employés × compétences en mémoire (NumPy) pour la recherche de remplaçants.
+
+Chaque employé est un vecteur de niveaux sur le catalogue de compétences
+(0 = absent, E=1 … D=5, voir LEVEL_SCORES). La matrice est construite une
+fois par worker puis tenue à jour de façon incrémentale :
+
+- niveaux : les lignes de employeeskill_history dont l'id est supérieur au
+  dernier vu (historique append-only, index sur la clé primaire) désignent
+  les couples (employé, compétence) dont le niveau est relu. Les ids n'étant
+  pas commités dans l'ordre, les HISTORY_WINDOW derniers ids sont relus à
+  chaque passage (ceux déjà vus sont ignorés) ;
+- employés ajoutés / supprimés / changés d'usine ou de statut : rechargement
+  de (id, plant, status) seulement, quand la version « employees » de
+  data_versions change ;
+- catalogue de compétences modifié (version « skills ») : reconstruction.
+
+La matrice est partagée par tous les utilisateurs du worker : elle est lue sans
+le filtre d'usine de la session (SKIP_PLANT_SCOPE), les appelants restreignent
+`plant` aux usines de l'utilisateur. Les employés inactifs gardent leur ligne
+(un absent peut l'être) mais ne sont jamais proposés comme candidats.
+
+    similar_employees(42, k=10, plant="Electric Galeana", line="Line 3")
+"""
+import threading
+
+import numpy as np
+from sqlalchemy import func, select
+
+from fragment_cache import current_versions
+from models import db, Employee, EmployeeSkill, EmployeeSkillHistory, Skill
+from plant_scope import SKIP_PLANT_SCOPE
+
+LEVEL_SCORES = {"E": 1, "A": 2, "B": 3, "C": 4, "D": 5}
+METRICS = ("cosine", "coverage")
+CHUNK_ROWS = 4096  # lignes converties en float32 à la fois pour le calcul des normes
+HISTORY_WINDOW = 1000  # ids d'historique relus à chaque passage (transactions commitées en retard)
+ACTIVE_STATUS = "Active"
+
+
+def level_score(level):
+    score = LEVEL_SCORES.get(level)  # chemin rapide : valeur déjà normalisée
+    if score is None:
+        score = LEVEL_SCORES.get((level or "").strip().upper(), 0)
+    return score
+
+
+def _positions(sorted_ids, ids):
+    """Indice de chaque id dans `sorted_ids` (trié), -1 si absent."""
+    ids = np.array([-1 if i is None else i for i in ids], dtype=np.int64)
+    pos = np.searchsorted(sorted_ids, ids)
+    pos[pos >= len(sorted_ids)] = 0
+    return np.where(sorted_ids[pos] == ids, pos, -1)
+
+
+class SkillMatrix:
+    """
+    Niveaux en uint8 (n_employés × n_compétences), lignes et colonnes triées par id.
+    Stockage par colonnes (order="F") : une recherche ne lit que quelques colonnes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.levels = np.zeros((0, 0), dtype=np.uint8)
+        self.employee_ids = np.zeros(0, dtype=np.int64)
+        self.plants = np.zeros(0, dtype=object)
+        self.active = np.zeros(0, dtype=bool)  # statut « Active » (candidats possibles)
+        self.norms = np.zeros(0, dtype=np.float32)  # normes L2 des lignes (cosinus)
+        self.row_of = {}
+        self.skill_ids = np.zeros(0, dtype=np.int64)
+        self.skill_lines = np.zeros(0, dtype=object)
+        self.last_history_id = 0
+        self.seen_history_ids = set()  # ids déjà vus dans la fenêtre (last_history_id - HISTORY_WINDOW, …]
+        self.versions = None
+
+    # ----- Chargement -----
+    def rebuild(self, session):
+        last_history_id = session.execute(select(func.max(EmployeeSkillHistory.id))).scalar() or 0
+        skills = session.execute(select(Skill.id, Skill.category).order_by(Skill.id)).all()
+        self.skill_ids = np.array([s.id for s in skills], dtype=np.int64)
+        self.skill_lines = np.array([s.category for s in skills], dtype=object)
+        self.levels = np.zeros((0, len(skills)), dtype=np.uint8)
+        self.employee_ids = np.zeros(0, dtype=np.int64)
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.row_of = {}
+        self.refresh_employees(session)
+
+        # Colonnes de la table (pas d'entités ORM) : ~1 M lignes à pleine échelle
+        es = EmployeeSkill.__table__
+        rows = session.execute(select(es.c.employee_id, es.c.skill_id, es.c.level),
+                               execution_options=SKIP_PLANT_SCOPE).all()
+        self._set_levels(rows, update_norms=False)
+        for start in range(0, len(self.levels), CHUNK_ROWS):
+            block = self.levels[start:start + CHUNK_ROWS].astype(np.float32)
+            self.norms[start:start + CHUNK_ROWS] = np.linalg.norm(block, axis=1)
+        self.last_history_id = last_history_id
+        self.seen_history_ids = set()  # fenêtre relue au prochain passage : lignes commitées pendant la lecture
+
+    def refresh_employees(self, session):
+        """Recharge (id, plant, status) ; conserve les niveaux des employés toujours présents."""
+        employees = session.execute(select(Employee.id, Employee.plant, Employee.status).order_by(Employee.id),
+                                    execution_options=SKIP_PLANT_SCOPE).all()
+        ids = np.array([e.id for e in employees], dtype=np.int64)
+        levels = np.zeros((len(ids), len(self.skill_ids)), dtype=np.uint8, order="F")
+        _, new_rows, old_rows = np.intersect1d(ids, self.employee_ids, assume_unique=True, return_indices=True)
+        levels[new_rows] = self.levels[old_rows]
+        norms = np.zeros(len(ids), dtype=np.float32)
+        norms[new_rows] = self.norms[old_rows]
+        self.levels, self.norms = levels, norms
+        self.employee_ids = ids
+        self.plants = np.array([e.plant for e in employees], dtype=object)
+        self.active = np.array([e.status == ACTIVE_STATUS for e in employees], dtype=bool)
+        self.row_of = {eid: i for i, eid in enumerate(ids.tolist())}
+
+    def apply_history(self, session):
+        """
+        Applique les changements de niveau survenus depuis le dernier passage.
+        Le niveau des couples touchés est relu dans employeeskills : une ligne
+        arrivée en retard ne peut pas écraser un niveau plus récent.
+        """
+        h = EmployeeSkillHistory
+        low = max(0, self.last_history_id - HISTORY_WINDOW)
+        rows = session.execute(
+            select(h.id, h.employee_id, h.skill_id).where(h.id > low).order_by(h.id)
+        ).all()
+        rows = [r for r in rows if r.id not in self.seen_history_ids]
+        if rows:
+            pairs = {(r.employee_id, r.skill_id) for r in rows}
+            es = EmployeeSkill.__table__
+            current = session.execute(
+                select(es.c.employee_id, es.c.skill_id, es.c.level)
+                .where(es.c.employee_id.in_({employee_id for employee_id, _ in pairs})),
+                execution_options=SKIP_PLANT_SCOPE,
+            ).all()
+            levels = dict.fromkeys(pairs)  # couple sans affectation (retirée) : niveau 0
+            levels.update(((r.employee_id, r.skill_id), r.level) for r in current
+                          if (r.employee_id, r.skill_id) in pairs)
+            self._set_levels((employee_id, skill_id, level) for (employee_id, skill_id), level in levels.items())
+            self.last_history_id = max(self.last_history_id, rows[-1].id)
+        floor = self.last_history_id - HISTORY_WINDOW
+        self.seen_history_ids = {i for i in self.seen_history_ids if i > floor} | {r.id for r in rows if r.id > floor}
+        return len(rows)
+
+    def _set_levels(self, rows, update_norms=True):
+        """Affecte des niveaux (employee_id, skill_id, level) ; à doublon égal, le dernier gagne."""
+        rows = list(rows)
+        if not rows or not len(self.employee_ids) or not len(self.skill_ids):
+            return
+        employee_ids, skill_ids, levels = zip(*rows)
+        row = _positions(self.employee_ids, employee_ids)
+        col = _positions(self.skill_ids, skill_ids)
+        scores = np.array([level_score(level) for level in levels], dtype=np.uint8)
+        ok = (row >= 0) & (col >= 0)
+        self.levels[row[ok], col[ok]] = scores[ok]
+        if update_norms:
+            touched = np.unique(row[ok])
+            self.norms[touched] = np.linalg.norm(self.levels[touched].astype(np.float32), axis=1)
+
+    def sync(self, session):
+        """Met la matrice à jour par rapport à la base (appelé avant chaque recherche)."""
+        versions = current_versions()
+        key = (versions.get("employees", 0), versions.get("skills", 0))
+        with self.lock:
+            if self.versions is None or key[1] != self.versions[1]:
+                self.rebuild(session)
+            elif key[0] != self.versions[0]:
+                self.refresh_employees(session)
+            self.apply_history(session)
+            self.versions = key
+
+    def _plant_rows(self, plant, active_only=False):
+        """Lignes d'une usine, de plusieurs (tuple / liste) ou de toutes (None), actives seulement si demandé."""
+        if not plant:
+            mask = np.ones(len(self.employee_ids), dtype=bool)
+        elif isinstance(plant, str):
+            mask = self.plants == plant
+        else:
+            mask = np.isin(self.plants, list(plant))
+        if active_only:
+            mask &= self.active
+        return np.flatnonzero(mask)
+
+    def block(self, plant=None, line=None, active_only=False):
+        """Copie (employee_ids, skill_ids, niveaux) restreinte à une ou plusieurs usines et / ou une ligne."""
+        with self.lock:
+            rows = self._plant_rows(plant, active_only)
+            cols = np.flatnonzero(self.skill_lines == line) if line else np.arange(len(self.skill_ids))
+            return self.employee_ids[rows], self.skill_ids[cols], self.levels[np.ix_(rows, cols)]
+
+    # ----- Recherche -----
+    def similar(self, employee_id, k=10, plant=None, line=None, metric="cosine"):
+        """[(employee_id, score, compétences communes)] triés par score décroissant."""
+        if metric not in METRICS:
+            raise ValueError(f"metric doit être l'une de {METRICS}")
+        with self.lock:
+            return self._similar(employee_id, k, plant, line, metric)
+
+    def _similar(self, employee_id, k, plant, line, metric):
+        row = self.row_of.get(employee_id)
+        if row is None:
+            raise KeyError(employee_id)
+
+        candidates = self._plant_rows(plant, active_only=True)
+        candidates = candidates[candidates != row]
+        if line:
+            cols = np.flatnonzero(self.skill_lines == line)
+        else:
+            # Matrice creuse (~20 compétences sur 500) : seules les colonnes de l'absent comptent
+            cols = np.flatnonzero(self.levels[row])
+        target = self.levels[row, cols].astype(np.float32)
+        if not target.any() or not len(candidates):
+            return []
+
+        block = self.levels[:, cols][candidates].astype(np.float32)
+        if metric == "cosine":
+            norms = np.linalg.norm(block, axis=1) if line else self.norms[candidates]
+            norms = norms * np.linalg.norm(target)
+            dots = block @ target
+            scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        else:
+            # Part des niveaux de l'absent couverte par le candidat (pondérée par ses niveaux)
+            scores = np.minimum(block, target).sum(axis=1) / target.sum()
+        shared = ((block > 0) & (target > 0)).sum(axis=1)
+
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((-shared[top], -scores[top]))]
+        return [(int(self.employee_ids[candidates[i]]), float(scores[i]), int(shared[i]))
+                for i in top if scores[i] > 0]
+
+
+_matrix = SkillMatrix()
+
+
+def skill_matrix():
+    """Matrice du worker, synchronisée avec la base."""
+    _matrix.sync(db.session)
+    return _matrix
+
+
+def similar_employees(employee_id, k=10, plant=None, line=None, metric="cosine"):
+    return skill_matrix().similar(employee_id, k=k, plant=plant, line=line, metric=metric)
@@ -0,0 +1,9 @@
+(function () {
+  const all = document.getElementById("selectAll");
+  const checks = document.querySelectorAll(".row-check");
+  const counter = document.getElementById("selectedCount");
+  if (!all) return;  // aucun employé filtré
+  const refresh = () => counter.textContent = document.querySelectorAll(".row-check:checked").length;
+  all.addEventListener("change", () => { checks.forEach(c => c.checked = all.checked); refresh(); });
+  checks.forEach(c => c.addEventListener("change", refresh));
+})();
@@ -0,0 +1,6 @@
+const qrModal = document.getElementById('qrModal');
+qrModal.addEventListener('show.bs.modal', event => {
+  const img = event.relatedTarget;
+  const src = img.getAttribute('data-image');
+  document.getElementById('qrModalImage').src = src;
+});
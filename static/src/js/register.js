@@ -0,0 +1,12 @@
+document.getElementById("email").addEventListener("input", function() {
+  const email = this.value.trim();
+  const nameField = document.getElementById("username");
+
+  if (email.includes("@")) {
+    const namePart = email.split("@")[0];       // before @
+    const fullName = namePart.replace(/\./g, " "); // replace . with space
+    nameField.value = fullName;
+  } else {
+    nameField.value = "";
+  }
+});
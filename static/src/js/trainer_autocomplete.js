@@ -0,0 +1,32 @@
+// Autocomplétion des champs « Trainer » (input[data-trainer-autocomplete] + datalist partagée)
+(function () {
+  const list = document.getElementById("trainer-options");
+  const inputs = document.querySelectorAll("input[data-trainer-autocomplete]");
+  if (!list || !inputs.length) return;
+  let timer = null, lastQuery = null;
+
+  const load = (q) => {
+    if (q === lastQuery) return;
+    lastQuery = q;
+    fetch(list.dataset.url + "?q=" + encodeURIComponent(q), { credentials: "same-origin" })
+      .then(r => r.ok ? r.json() : [])
+      .then(items => {
+        list.replaceChildren(...items.map(t => {
+          const option = document.createElement("option");
+          option.value = t.name;
+          return option;
+        }));
+      })
+      .catch(() => {});
+  };
+
+  inputs.forEach(input => {
+    input.setAttribute("list", "trainer-options");
+    input.setAttribute("autocomplete", "off");
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => load(input.value.trim()), 150);
+    });
+    input.addEventListener("focus", () => load(input.value.trim()));
+  });
+})();
@@ -0,0 +1,53 @@
+"""
+Base SQLite jetable générée par generate_data.py (petits volumes), partagée
+par la session de tests. DATABASE_URL doit être fixé avant d'importer app.
+
+    python -m pytest -q
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="skill-matrix-tests-")
+DATABASE_URL = "sqlite:///" + os.path.join(_TMP, "test.db")
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["DB_WARMUP_CONNECTIONS"] = "0"
+os.environ.setdefault("ATTACHMENT_FOLDER", os.path.join(_TMP, "attachments"))
+
+
+@pytest.fixture(scope="session")
+def app():
+    from generate_data import generate
+
+    generate(DATABASE_URL, employees=60, skills=12, skills_per_employee=4, audit_logs=50, drop=True)
+    from app import app as flask_app
+
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield flask_app
+    shutil.rmtree(_TMP, ignore_errors=True)
+
+
+@pytest.fixture
+def db_session(app):
+    from models import db
+
+    with app.app_context():
+        yield db.session
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(app):
+    from generate_data import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+
+    client = app.test_client()
+    response = client.post("/login", data={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+    assert response.status_code == 302
+    return client
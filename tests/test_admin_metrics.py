@@ -0,0 +1,31 @@
+"""Métriques Prometheus : jeton Bearer comparé en temps constant, ou session admin."""
+import pytest
+
+TOKEN = "metrics-test-token"
+
+
+@pytest.fixture
+def metrics_token(app, monkeypatch):
+    monkeypatch.setitem(app.config, "METRICS_TOKEN", TOKEN)
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+
+
+def test_metrics_accepts_bearer_token(client, metrics_token):
+    response = client.get("/admin/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 200 and b"skill_matrix_" in response.data
+
+
+@pytest.mark.parametrize("header", ["", "Bearer ", "Bearer wrong", TOKEN, f"Basic {TOKEN}", "Bearer ¿ñ?"])
+def test_metrics_rejects_bad_headers(client, metrics_token, header):
+    assert client.get("/admin/metrics", headers={"Authorization": header}).status_code == 403
+
+
+def test_metrics_without_configured_token(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "METRICS_TOKEN", "")
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    assert client.get("/admin/metrics", headers={"Authorization": "Bearer "}).status_code == 403
+    assert client.get("/admin/metrics").status_code == 403
+
+
+def test_metrics_admin_session(admin_client):
+    assert admin_client.get("/admin/metrics").status_code == 200
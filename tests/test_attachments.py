@@ -0,0 +1,58 @@
+"""Pièces jointes : taille maximale (413) et téléchargement restreint aux usines de l'utilisateur."""
+import hashlib
+import io
+import os
+
+from sqlalchemy import select
+
+from attachment_store import local_path
+from models import Attachment, Employee, EmployeeSkill, Skill, User
+from plant_scope import assign_plants
+
+
+def test_oversized_upload_is_refused_with_flash(app, admin_client, db_session, monkeypatch):
+    monkeypatch.setitem(app.config, "ATTACHMENT_MAX_BYTES", 1024 * 1024)
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024 * 1024 + 4096)
+    employee_id = db_session.execute(select(Employee.id).limit(1)).scalar()
+    skill_id = db_session.execute(select(Skill.id).limit(1)).scalar()
+
+    response = admin_client.post(f"/employee/{employee_id}/add_skill", data={
+        "skill_id": skill_id, "level": "B",
+        "attachment": (io.BytesIO(b"x" * (2 * 1024 * 1024)), "certificat.pdf"),
+    }, content_type="multipart/form-data")
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith(f"/employee/{employee_id}")
+    with admin_client.session_transaction() as session:
+        assert any("Attachment too large (max 1 MB)" in message for _, message in session["_flashes"])
+
+
+def _attach(session, es, content):
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = local_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as out:
+        out.write(content)
+    attachment = Attachment(sha256=sha256, filename="certificat.pdf", content_type="application/pdf",
+                            size=len(content))
+    session.add(attachment)
+    session.flush()
+    es.attachment_id = attachment.id
+    return attachment.id
+
+
+def test_download_is_limited_to_user_plants(app, client, db_session):
+    with app.test_request_context():
+        user = User(username="assymex", email="assymex@example.com", role="user")
+        user.set_password("assymex")
+        db_session.add(user)
+        assign_plants(user, ["Assymex"])
+        visible = {}
+        for plant in ("Assymex", "Electric Rayones"):
+            es = db_session.execute(select(EmployeeSkill).where(EmployeeSkill.plant == plant).limit(1)).scalar_one()
+            visible[plant] = _attach(db_session, es, f"certificat {plant}".encode())
+        db_session.commit()
+
+    client.post("/login", data={"email": "assymex@example.com", "password": "assymex"})
+    response = client.get(f"/attachment/{visible['Assymex']}")
+    assert response.status_code == 200 and response.data == b"certificat Assymex"
+    assert client.get(f"/attachment/{visible['Electric Rayones']}").status_code == 404
@@ -0,0 +1,15 @@
+"""Modification d'employés en masse : validation des identifiants."""
+from models import Employee
+
+
+def test_bulk_rejects_non_numeric_ids(admin_client):
+    response = admin_client.post("/admin/employees/bulk",
+                                 data={"employee_ids": ["5", "abc"], "action": "deactivate"})
+    assert response.status_code == 400
+
+
+def test_bulk_deactivates_selected_employees(admin_client, db_session):
+    response = admin_client.post("/admin/employees/bulk",
+                                 data={"employee_ids": ["5", " 6 "], "action": "deactivate"})
+    assert response.status_code == 302
+    assert {db_session.get(Employee, i).status for i in (5, 6)} == {"Inactive"}
@@ -0,0 +1,205 @@
+"""Flux de changements : pagination, webhooks (récepteur http.server local), UPDATE / DELETE en masse."""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import hashlib
+import hmac
+import json
+import threading
+
+import pytest
+from sqlalchemy import delete, func, select, update
+
+import change_feed
+from change_feed import push_subscription, read_changes
+from models import AuditLog, ChangeLog, Employee, EmployeeSkill, Skill, WebhookSubscription
+
+TOKEN = "mes-test-token"
+SECRET = "s3cret"
+
+
+class Receiver:
+    """Récepteur webhook : répond avec les statuts programmés (puis 204), garde les requêtes reçues."""
+
+    def __init__(self):
+        self.statuses = []
+        self.requests = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), body))
+                self.send_response(receiver.statuses.pop(0) if receiver.statuses else 204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def payloads(self):
+        return [json.loads(body) for _, body in self.requests]
+
+
+@pytest.fixture
+def receiver():
+    receiver = Receiver()
+    receiver.thread.start()
+    yield receiver
+    receiver.server.shutdown()
+    receiver.server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(change_feed.time, "sleep", delays.append)
+    return delays
+
+
+def _last_seq(session):
+    return session.execute(select(func.max(ChangeLog.id))).scalar() or 0
+
+
+def _subscribe(session, url, name, cursor):
+    subscription = WebhookSubscription(name=name, url=url, secret=SECRET, cursor=cursor)
+    session.add(subscription)
+    session.commit()
+    return subscription
+
+
+def _touch_skills(session, count):
+    for skill in session.execute(select(Skill).order_by(Skill.id).limit(count)).scalars():
+        skill.description = f"{skill.description} ·"
+    session.commit()
+
+
+# ========= Lecture par pages =========
+def test_feed_pages_follow_cursor(app, client, db_session, monkeypatch):
+    monkeypatch.setitem(app.config, "CHANGE_FEED_TOKENS", [TOKEN])
+    start = _last_seq(db_session)
+    _touch_skills(db_session, 7)
+
+    seen, cursor = [], start
+    while True:
+        response = client.get(f"/api/changes?cursor={cursor}&limit=3",
+                              headers={"Authorization": f"Bearer {TOKEN}"})
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page["changes"]) <= 3
+        seen += [c["seq"] for c in page["changes"]]
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+
+    assert seen == sorted(seen) and len(seen) == len(set(seen)) == 7
+    assert seen[0] > start and cursor == _last_seq(db_session)
+    assert client.get(f"/api/changes?cursor={cursor}", headers={"Authorization": f"Bearer {TOKEN}"}
+                      ).get_json() == {"changes": [], "next_cursor": cursor, "has_more": False}
+
+
+def test_feed_requires_token(client):
+    assert client.get("/api/changes").status_code == 403
+    assert client.get("/api/changes", headers={"Authorization": "Bearer wrong"}).status_code == 403
+
+
+# ========= Webhooks =========
+def test_push_signs_body_with_hmac(db_session, receiver, sleeps):
+    subscription = _subscribe(db_session, receiver.url, "hmac", _last_seq(db_session))
+    _touch_skills(db_session, 5)
+
+    assert push_subscription(subscription, batch_size=2) == 5
+    assert [len(p["changes"]) for p in receiver.payloads] == [2, 2, 1]
+    for headers, body in receiver.requests:
+        expected = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        assert hmac.compare_digest(headers["X-SkillMatrix-Signature"], expected)
+    assert subscription.cursor == _last_seq(db_session) and subscription.last_error is None
+    assert sleeps == []
+
+
+def test_push_retries_5xx_with_backoff(db_session, receiver, sleeps):
+    start = _last_seq(db_session)
+    subscription = _subscribe(db_session, receiver.url, "retry", start)
+    _touch_skills(db_session, 2)
+    receiver.statuses = [503, 502]
+
+    assert push_subscription(subscription, retries=3, backoff=0.5) == 2
+    assert len(receiver.requests) == 3
+    assert len({body for _, body in receiver.requests}) == 1  # même lot renvoyé
+    assert sleeps == [0.5, 1.0]
+    assert subscription.cursor == start + 2 and subscription.last_error is None
+
+
+def test_push_gives_up_after_retries(db_session, receiver, sleeps):
+    start = _last_seq(db_session)
+    subscription = _subscribe(db_session, receiver.url, "down", start)
+    _touch_skills(db_session, 1)
+    receiver.statuses = [500] * 3
+
+    assert push_subscription(subscription, retries=2, backoff=1) == 0
+    assert len(receiver.requests) == 3 and sleeps == [1, 2]
+    assert subscription.cursor == start and "500" in subscription.last_error
+
+
+def test_push_does_not_retry_4xx(db_session, receiver, sleeps):
+    start = _last_seq(db_session)
+    subscription = _subscribe(db_session, receiver.url, "rejected", start)
+    _touch_skills(db_session, 1)
+    receiver.statuses = [400]
+
+    assert push_subscription(subscription, retries=3) == 0
+    assert len(receiver.requests) == 1 and sleeps == []
+    assert subscription.cursor == start and "400" in subscription.last_error
+
+
+# ========= UPDATE / DELETE en masse =========
+def test_bulk_update_and_delete_are_logged(db_session):
+    start = _last_seq(db_session)
+    employee_ids = [1, 2, 3]
+    db_session.execute(update(Employee).where(Employee.id.in_(employee_ids)).values(department="Tooling"))
+    skill_ids = db_session.execute(
+        select(EmployeeSkill.id).where(EmployeeSkill.employee_id == 4).order_by(EmployeeSkill.id)).scalars().all()
+    db_session.execute(delete(EmployeeSkill).where(EmployeeSkill.employee_id == 4))
+    db_session.query(Skill).filter(Skill.id == 1).update({"description": "Query.update()"})
+    db_session.commit()
+
+    rows = db_session.execute(
+        select(ChangeLog.entity_type, ChangeLog.entity_id, ChangeLog.operation)
+        .where(ChangeLog.id > start).order_by(ChangeLog.id)).all()
+    assert [tuple(r) for r in rows] == (
+        [("employee", i, "update") for i in employee_ids]
+        + [("employeeskill", i, "delete") for i in skill_ids]
+        + [("skill", 1, "update")]
+    )
+
+    changes = read_changes(start)["changes"]
+    assert [c["data"] for c in changes if c["op"] == "delete"] == [None] * len(skill_ids)
+    assert {c["data"]["department"] for c in changes if c["entity"] == "employee"} == {"Tooling"}
+
+
+# ========= Verrou du flux =========
+def _locked(session):
+    session = session()  # scoped_session → Session
+    return session.info.get(change_feed._LOCKED) is session.get_transaction()
+
+
+def test_untracked_writes_do_not_lock(db_session):
+    db_session.add(AuditLog(action="login", entity_type="User", entity_id="1"))
+    db_session.flush()
+    db_session.execute(update(WebhookSubscription).where(WebhookSubscription.id == 0).values(last_error=None))
+    assert not _locked(db_session)
+    db_session.commit()
+
+
+@pytest.mark.parametrize("write", [
+    lambda s: setattr(s.get(Skill, 1), "description", "verrou") or s.flush(),
+    lambda s: s.execute(update(Employee).where(Employee.id == 1).values(department="Tooling")),
+])
+def test_tracked_writes_lock(db_session, write):
+    db_session.add(AuditLog(action="update_skill"))
+    db_session.flush()
+    write(db_session)
+    assert _locked(db_session)
+    db_session.rollback()
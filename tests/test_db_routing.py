@@ -0,0 +1,104 @@
+"""Routage primaire / réplica avec deux bases SQLite : chaque base répond son nom."""
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, select
+
+from db_routing import STICKY_COOKIE, init_replica, read_only
+from models import db
+
+marker = Table("marker", MetaData(), Column("name", String(20)))
+
+
+def _database(path, name):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        marker.create(conn)
+        conn.execute(insert(marker).values(name=name))
+    engine.dispose()
+    return f"sqlite:///{path}"
+
+
+def _which():
+    return db.session.execute(select(marker.c.name).limit(1)).scalar()
+
+
+def _make_app(primary_url, replica_url):
+    app = Flask(__name__)
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI=primary_url,
+                      SQLALCHEMY_BINDS={"replica": replica_url},
+                      DB_REPLICA_CHECK_SECONDS=3600, DB_REPLICA_STICKY_SECONDS=5)
+    db.init_app(app)
+    init_replica(app, db)
+
+    @app.route("/read")
+    @read_only
+    def read():
+        return jsonify(db=_which())
+
+    @app.route("/read/unmarked")
+    def read_unmarked():
+        return jsonify(db=_which())
+
+    @app.route("/read/for-update")
+    @read_only
+    def read_for_update():
+        return jsonify(db=db.session.execute(select(marker.c.name).limit(1).with_for_update()).scalar())
+
+    @app.route("/write", methods=["POST"])
+    @read_only
+    def write():
+        db.session.execute(insert(marker).values(name="primary"))
+        db.session.commit()
+        return jsonify(db=_which())
+
+    return app
+
+
+@pytest.fixture
+def routed(tmp_path):
+    app = _make_app(_database(tmp_path / "primary.db", "primary"), _database(tmp_path / "replica.db", "replica"))
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _db(client, url, method="get"):
+    response = getattr(client, method)(url)
+    assert response.status_code == 200
+    return response.get_json()["db"]
+
+
+def test_read_only_selects_go_to_replica(routed):
+    client = routed.test_client()
+    assert _db(client, "/read") == "replica"
+    assert routed.extensions["replica_health"].routed == 1
+    assert _db(client, "/read/unmarked") == "primary"
+    assert _db(client, "/read/for-update") == "primary"
+
+
+def test_writes_and_sticky_cookie_use_primary(routed):
+    client = routed.test_client()
+    assert _db(client, "/write", "post") == "primary"  # lecture après écriture dans la même requête
+    assert client.get_cookie(STICKY_COOKIE) is not None
+    assert _db(client, "/read") == "primary"
+
+    client.delete_cookie(STICKY_COOKIE)
+    assert _db(client, "/read") == "replica"
+
+
+def test_replica_marked_down_falls_back_to_primary(routed):
+    client = routed.test_client()
+    assert _db(client, "/read") == "replica"
+    routed.extensions["replica_health"].mark_down("test")
+    assert _db(client, "/read") == "primary"
+
+
+def test_failed_health_check_falls_back_to_primary(tmp_path):
+    app = _make_app(_database(tmp_path / "primary.db", "primary"),
+                    f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")  # dossier absent : connexion impossible
+    assert _db(app.test_client(), "/read") == "primary"
+    assert app.extensions["replica_health"].stats() == {"replica_healthy": 0, "replica_routed": 0}
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
@@ -0,0 +1,61 @@
+"""Budgets SQL des routes (même valeurs que les @query_budget), lazy loads interdits."""
+import pytest
+from sqlalchemy import select
+
+from models import Employee, User
+from plant_scope import assign_plants
+from query_guard import QueryBudgetExceeded, assert_query_budget
+
+ROUTES = [
+    ("/index", 5),
+    ("/index?search=Garc", 5),
+    ("/employee/{employee_id}", 6),
+    ("/employee/{employee_id}/public", 4),
+    ("/admin/dashboard", 5),
+]
+
+
+@pytest.fixture
+def strict(app, monkeypatch):
+    monkeypatch.setitem(app.config, "STRICT_LAZY_LOAD", "raise")
+
+
+@pytest.fixture
+def plant_client(app, db_session):
+    """Utilisateur limité à une usine : le filtre d'usine ne doit pas coûter de requête."""
+    user = db_session.execute(select(User).filter_by(email="budget@example.com")).scalar()
+    if user is None:
+        user = User(username="budget", email="budget@example.com", role="user")
+        user.set_password("budget")
+        db_session.add(user)
+        assign_plants(user, ["Assymex"])
+        db_session.commit()
+    client = app.test_client()
+    client.post("/login", data={"email": "budget@example.com", "password": "budget"})
+    return client
+
+
+def _employee_id(db_session, plant="Assymex"):
+    return db_session.execute(select(Employee.id).where(Employee.plant == plant).order_by(Employee.id)).scalar()
+
+
+@pytest.mark.parametrize("url, budget", ROUTES)
+def test_route_query_budget(admin_client, db_session, strict, url, budget):
+    url = url.format(employee_id=_employee_id(db_session))
+    for _ in range(2):  # à froid puis caches chauds
+        with assert_query_budget(budget):
+            assert admin_client.get(url).status_code == 200
+
+
+@pytest.mark.parametrize("url, budget", ROUTES[:4])
+def test_route_query_budget_with_plant_scope(plant_client, db_session, strict, url, budget):
+    url = url.format(employee_id=_employee_id(db_session))
+    with assert_query_budget(budget):
+        assert plant_client.get(url).status_code == 200
+
+
+def test_assert_query_budget_fails_over_budget(admin_client, db_session):
+    url = f"/employee/{_employee_id(db_session)}"
+    with pytest.raises(QueryBudgetExceeded, match="budget de 1"):
+        with assert_query_budget(1):
+            admin_client.get(url)
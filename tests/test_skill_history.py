@@ -0,0 +1,61 @@
+"""Historique des niveaux : état de la matrice à une date, filtré par l'usine de l'époque."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from bulk_ops import bulk_update_employees
+from models import Employee, EmployeeSkill, EmployeeSkillHistory
+from skill_history import matrix_as_of
+
+
+def _employees_with_skills(session, count):
+    ids = session.execute(
+        select(EmployeeSkill.employee_id).distinct().order_by(EmployeeSkill.employee_id.desc()).limit(count)
+    ).scalars().all()
+    return [session.get(Employee, i) for i in ids]
+
+
+def _rows(as_of, plant, employee_id):
+    return [tuple(r) for r in matrix_as_of(as_of, plant=plant) if r.employee_id == employee_id]
+
+
+def _move(session, employee, new, bulk):
+    if bulk:
+        bulk_update_employees([employee.id], {"plant": new})
+        session.expire_all()
+    else:
+        employee.plant = new
+        session.commit()
+
+
+def _other_plant(plant):
+    return "Electric Rayones" if plant != "Electric Rayones" else "Assymex"
+
+
+def test_plant_move_keeps_past_matrix(app, db_session):
+    with app.test_request_context():
+        for employee, bulk in zip(_employees_with_skills(db_session, 2), (False, True)):
+            old = employee.plant
+            new = _other_plant(old)
+            before = datetime.utcnow()
+            past_old, past_new = _rows(before, old, employee.id), _rows(before, new, employee.id)
+            assert past_old and not past_new
+
+            _move(db_session, employee, new, bulk)
+
+            assert _rows(before, old, employee.id) == past_old
+            assert _rows(before, new, employee.id) == []
+            now = datetime.utcnow() + timedelta(seconds=1)
+            current = _rows(now, new, employee.id)
+            assert current and {r[3] for r in current} == {new}
+            assert _rows(now, old, employee.id) == []
+            assert [r[:3] for r in current] == [r[:3] for r in past_old]  # niveaux inchangés
+
+
+def test_transfer_rows_skip_unmoved_employees(app, db_session):
+    with app.test_request_context():
+        employee = _employees_with_skills(db_session, 3)[2]
+        last = db_session.execute(select(EmployeeSkillHistory.id).order_by(EmployeeSkillHistory.id.desc())).scalar()
+        bulk_update_employees([employee.id], {"plant": employee.plant, "department": "Tooling"})
+        assert db_session.execute(select(EmployeeSkillHistory.id).where(
+            EmployeeSkillHistory.id > last, EmployeeSkillHistory.change_type == "transfer")).first() is None
@@ -0,0 +1,81 @@
+"""Matrice NumPy : mise à jour incrémentale depuis l'historique, y compris les lignes commitées en retard."""
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, insert, select, update
+
+from bulk_ops import bulk_update_employees
+from models import Employee, EmployeeSkill, EmployeeSkillHistory
+from skill_vectors import SkillMatrix, level_score, similar_employees
+
+
+def _level(matrix, employee_id, skill_id):
+    return int(matrix.levels[matrix.row_of[employee_id], int(np.searchsorted(matrix.skill_ids, skill_id))])
+
+
+def _history(session, history_id, es):
+    session.execute(insert(EmployeeSkillHistory.__table__).values(
+        id=history_id, employee_skill_id=es.id, employee_id=es.employee_id, skill_id=es.skill_id,
+        change_type="update", level=es.level, changed_at=datetime.utcnow()))
+
+
+def _set_level(session, es, level):
+    table = EmployeeSkill.__table__
+    session.execute(update(table).where(table.c.id == es.id).values(level=level))
+    session.commit()  # la ligne d'historique est écrite à part, comme par une transaction concurrente
+    return session.get(EmployeeSkill, es.id)
+
+
+def test_sync_applies_orm_changes(app, db_session):
+    with app.test_request_context():
+        matrix = SkillMatrix()
+        matrix.sync(db_session)
+        es = db_session.execute(select(EmployeeSkill).order_by(EmployeeSkill.id).limit(1)).scalar_one()
+        es.level = "D" if es.level != "D" else "E"
+        db_session.commit()
+
+        matrix.sync(db_session)
+        assert _level(matrix, es.employee_id, es.skill_id) == level_score(es.level)
+
+
+def test_sync_picks_up_history_rows_committed_late(app, db_session):
+    with app.test_request_context():
+        matrix = SkillMatrix()
+        matrix.sync(db_session)
+        last = db_session.execute(select(func.max(EmployeeSkillHistory.id))).scalar()
+        first, late = db_session.execute(
+            select(EmployeeSkill).order_by(EmployeeSkill.id.desc()).limit(2)).scalars().all()
+
+        # Id plus grand commité d'abord…
+        first = _set_level(db_session, first, "A")
+        _history(db_session, last + 10, first)
+        db_session.commit()
+        assert matrix.apply_history(db_session) == 1 and matrix.last_history_id == last + 10
+
+        # … puis une transaction plus ancienne (id inférieur) commitée après le passage
+        late = _set_level(db_session, late, "C" if late.level != "C" else "B")
+        _history(db_session, last + 5, late)
+        db_session.commit()
+        assert matrix.apply_history(db_session) == 1
+        assert _level(matrix, late.employee_id, late.skill_id) == level_score(late.level)
+        assert _level(matrix, first.employee_id, first.skill_id) == level_score("A")
+
+        assert matrix.apply_history(db_session) == 0  # ids déjà vus : ignorés
+
+
+def test_similar_skips_inactive_employees(app, db_session):
+    def similar(employee_id, k):
+        with app.app_context(), app.test_request_context():  # nouveau g : versions relues
+            return [eid for eid, _, _ in similar_employees(employee_id, k=k)]
+
+    employee_id = db_session.execute(
+        select(EmployeeSkill.employee_id).join(Employee, Employee.id == EmployeeSkill.employee_id)
+        .where(Employee.status == "Active").order_by(EmployeeSkill.employee_id).limit(1)).scalar()
+    before = similar(employee_id, 5)
+    assert before
+
+    bulk_update_employees([before[0]], {"status": "Inactive"})
+    after = similar(employee_id, 5)
+    assert before[0] not in after and before[1:] == after[:len(before) - 1]
+    inactive = set(db_session.execute(select(Employee.id).where(Employee.status != "Active")).scalars())
+    assert inactive and not inactive & set(similar(employee_id, 100))
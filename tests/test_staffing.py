@@ -0,0 +1,93 @@
+"""Affectation des postes d'une ligne : solveur comparé à la force brute, contraintes de staff_line."""
+from itertools import permutations
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from bulk_ops import bulk_update_employees
+from models import Employee, Skill
+from skill_vectors import level_score
+from staffing import solve_assignment, staff_line
+
+
+def _brute_force(cost):
+    n, m = cost.shape
+    best = None
+    for cols in permutations(range(m), n):
+        total = cost[np.arange(n), cols].sum()
+        if np.isfinite(total) and (best is None or total < best):
+            best = total
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_solve_assignment_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 5))
+    cost = rng.integers(-5, 10, size=(n, int(rng.integers(n, 6)))).astype(np.float64)
+    cost[rng.random(cost.shape) < 0.3] = np.inf
+    cost[np.arange(n), rng.integers(0, cost.shape[1], size=n)] = rng.integers(-5, 10, size=n)  # ≥ 1 colonne par ligne
+
+    best = _brute_force(cost)
+    if best is None:
+        with pytest.raises(ValueError):
+            solve_assignment(cost)
+        return
+    assigned = solve_assignment(cost)
+    assert len(set(assigned.tolist())) == n
+    assert cost[np.arange(n), assigned].sum() == best
+
+
+def test_solve_assignment_infeasible_rows():
+    cost = np.array([[np.inf, np.inf, np.inf], [3, np.inf, 1], [np.inf, 2, 5]])
+    assert solve_assignment(cost).tolist() == [-1, 2, 1]
+    with pytest.raises(ValueError):
+        solve_assignment(np.ones((3, 2)))
+    with pytest.raises(ValueError):  # deux lignes, une seule colonne autorisée
+        solve_assignment(np.array([[1, np.inf], [2, np.inf]]))
+
+
+# ========= staff_line =========
+@pytest.fixture
+def plan(app, db_session):
+    line = db_session.execute(
+        select(Skill.category).group_by(Skill.category).order_by(func.count().desc(), Skill.category)).scalar()
+
+    def plan(**kwargs):
+        with app.app_context(), app.test_request_context():  # nouveau g : versions relues
+            return staff_line(line, **kwargs)
+    return plan
+
+
+def _assigned(result):
+    return [st["employee_id"] for st in result["stations"] if st["employee_id"] is not None]
+
+
+def test_staff_line_respects_levels_and_exclusions(plan):
+    base = plan(min_levels=None)
+    assigned = _assigned(base)
+    assert assigned and len(assigned) == len(set(assigned)) == base["covered"]
+    for st in base["stations"]:
+        if st["employee_id"] is not None:
+            assert level_score(st["level"]) >= level_score(st["min_level"])
+
+    strict = plan(min_levels={st["skill"].id: "D" for st in base["stations"]})
+    assert {st["min_level"] for st in strict["stations"]} == {"D"}
+    assert all(st["level"] == "D" for st in strict["stations"] if st["employee_id"] is not None)
+    assert strict["covered"] <= base["covered"]
+
+    excluded = plan(exclude=set(assigned))
+    assert not set(_assigned(excluded)) & set(assigned)
+    assert excluded["operators"] == base["operators"] - len(assigned)
+
+
+def test_staff_line_skips_inactive_employees(plan, db_session):
+    base = plan()
+    gone = _assigned(base)[0]
+    bulk_update_employees([gone], {"status": "Inactive"})
+
+    after = plan()
+    assert gone not in _assigned(after) and after["operators"] == base["operators"] - 1
+    inactive = set(db_session.execute(select(Employee.id).where(Employee.status != "Active")).scalars())
+    assert not inactive & set(_assigned(after))
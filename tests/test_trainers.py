@@ -0,0 +1,73 @@
+"""Formateurs : rapprochement exact à la saisie, regroupement approché réservé à la reprise."""
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from models import EmployeeSkill, Trainer
+from trainers import assessments_per_month, cluster_names, pending_requalifications, resolve_trainer
+
+
+def test_resolve_trainer_matches_normalized_key_only(db_session):
+    maria = resolve_trainer("María López")
+    assert resolve_trainer("  MARIA   lopez ") is maria
+    for typed in ("Mario Lopez", "Maria Lopes", "M. López"):
+        other = resolve_trainer(typed)
+        assert other is not maria and other.name == typed
+    assert resolve_trainer("Nadie Nuevo", create=False) is None
+    assert resolve_trainer("  ") is None
+    db_session.rollback()
+
+
+def test_backfill_clusters_close_variants():
+    clusters = cluster_names({"María López": 5, "Maria Lopes": 1, "J. Pérez": 1, "Juan Pérez": 4})
+    assert [(name, variants) for name, _, variants in clusters] == [
+        ("Juan Pérez", ["J. Pérez", "Juan Pérez"]),
+        ("María López", ["Maria Lopes", "María López"]),
+    ]
+
+
+def test_skill_update_keeps_typed_trainer(admin_client, db_session):
+    es = db_session.execute(select(EmployeeSkill).order_by(EmployeeSkill.id).limit(1)).scalar_one()
+    response = admin_client.post(f"/employee/{es.employee_id}/skill/{es.id}/update",
+                                 data={"level": "C", "trainer": "Mario Lopez", "remarks": ""})
+    assert response.status_code == 302
+
+    db_session.expire_all()
+    es = db_session.get(EmployeeSkill, es.id)
+    assert es.trainer == "Mario Lopez"
+    assert db_session.get(Trainer, es.trainer_id).name_key == "mario lopez"
+
+
+def test_assessments_per_month_counts_every_history_row(admin_client, db_session):
+    trainer = resolve_trainer("Ana Torres")
+    db_session.commit()
+    today = date.today()
+
+    def this_month():
+        return dict(((y, m), n) for y, m, n in assessments_per_month(trainer.id)).get((today.year, today.month), 0)
+
+    before = this_month()
+    es = db_session.execute(select(EmployeeSkill).order_by(EmployeeSkill.id.desc()).limit(1)).scalar_one()
+    for level in ("A", "B"):  # deux réévaluations de la même affectation : deux évaluations
+        admin_client.post(f"/employee/{es.employee_id}/skill/{es.id}/update",
+                          data={"level": level, "trainer": "ana torres", "remarks": ""})
+    assert this_month() == before + 2
+
+
+def test_requalification_clears_pending_row(admin_client, db_session):
+    trainer = resolve_trainer("Luis Ortega")
+    es = db_session.execute(select(EmployeeSkill).order_by(EmployeeSkill.id).offset(2).limit(1)).scalar_one()
+    es.trainer, es.trainer_id, es.last_assessed = trainer.name, trainer.id, date.today() - timedelta(days=800)
+    db_session.commit()
+    assert es.id in {r.id for r in pending_requalifications(trainer.id)}
+
+    admin_client.post(f"/employee/{es.employee_id}/skill/{es.id}/update",
+                      data={"level": es.level, "trainer": "Luis Ortega", "remarks": ""})
+    db_session.expire_all()
+    assert db_session.get(EmployeeSkill, es.id).last_assessed == date.today()
+    assert es.id not in {r.id for r in pending_requalifications(trainer.id)}
+
+    admin_client.post(f"/employee/{es.employee_id}/skill/{es.id}/update",
+                      data={"level": es.level, "trainer": "Luis Ortega", "remarks": "", "last_assessed": "2026-01-15"})
+    db_session.expire_all()
+    assert db_session.get(EmployeeSkill, es.id).last_assessed == date(2026, 1, 15)
@@ -0,0 +1,172 @@
+"""
+Formateurs normalisés (table trainers) et rapports de charge par formateur.
+
+EmployeeSkill.trainer reste le texte saisi ; EmployeeSkill.trainer_id pointe
+vers le formateur reconnu.
+
+- Saisie : même clé normalisée uniquement (« Juan Pérez » = « juan perez » =
+  « JUAN  PEREZ »), sinon nouveau formateur ; l'autocomplétion propose les
+  formateurs existants.
+- Reprise initiale (backfill_trainers) : les variantes sont aussi regroupées
+  par clé proche (difflib, ratio ≥ MATCH_CUTOFF, « Maria Lopes » → « María
+  López ») ou initiale + nom (« J. Pérez » → « Juan Pérez »), à vérifier dans
+  la liste des formateurs.
+
+Charge et requalifications passent par l'index (trainer_id, last_assessed) ;
+les évaluations par mois lisent l'historique (index (trainer_id, changed_at)).
+"""
+from collections import Counter
+from datetime import date, timedelta
+import difflib
+import re
+import unicodedata
+
+from flask import current_app
+from sqlalchemy import extract, func, select, text
+
+from models import db, Employee, EmployeeSkill, EmployeeSkillHistory, Skill, Trainer
+
+MATCH_CUTOFF = 0.85
+
+
+# ========= Normalisation =========
+def normalize_name(name):
+    """Clé de comparaison : minuscules, sans accents, ponctuation ni espaces multiples."""
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", name).split())[:100]
+
+
+def _initial_match(key, keys):
+    """« j perez » → l'unique clé « juan perez » (même nom, prénom commençant par j)."""
+    tokens = key.split()
+    if len(tokens) < 2 or len(tokens[0]) != 1:
+        return None
+    found = [k for k in keys if k.split()[-1] == tokens[-1] and k.split()[0].startswith(tokens[0])
+             and len(k.split()[0]) > 1]
+    return found[0] if len(found) == 1 else None
+
+
+def match_key(key, keys):
+    """Clé existante correspondant à `key` (exacte, proche ou initiale), sinon None."""
+    if key in keys:
+        return key
+    close = difflib.get_close_matches(key, keys, n=1, cutoff=MATCH_CUTOFF)
+    if close:
+        return close[0]
+    return _initial_match(key, keys)
+
+
+def cluster_names(counts):
+    """
+    {texte saisi: nb d'occurrences} → [(nom retenu, clé, [variantes])].
+    Les clés les plus fréquentes fondent les groupes ; le nom retenu est la
+    variante la plus fréquente (accentuée de préférence à égalité).
+    """
+    by_key = {}
+    for raw, count in counts.items():
+        key = normalize_name(raw)
+        if key:
+            by_key.setdefault(key, Counter())[raw] += count
+
+    clusters = {}  # clé fondatrice → Counter des variantes
+    for key in sorted(by_key, key=lambda k: (-sum(by_key[k].values()), len(k.split()[0]) == 1, k)):
+        target = match_key(key, list(clusters))
+        clusters.setdefault(target or key, Counter()).update(by_key[key])
+
+    result = []
+    for key, variants in clusters.items():
+        name = max(variants, key=lambda v: (variants[v], v != normalize_name(v), len(v)))
+        result.append((name.strip()[:100], key, sorted(variants)))
+    return sorted(result, key=lambda c: c[1])
+
+
+def backfill_trainers(connection):
+    """Crée les formateurs à partir des textes existants et renseigne employeeskills.trainer_id."""
+    counts = dict(connection.execute(text(
+        "SELECT trainer, COUNT(*) FROM employeeskills WHERE trainer IS NOT NULL GROUP BY trainer")).all())
+    known = dict(connection.execute(text("SELECT name_key, id FROM trainers")).all())
+    for name, key, variants in cluster_names(counts):
+        key = match_key(key, list(known)) or key
+        if key not in known:
+            connection.execute(text("INSERT INTO trainers (name, name_key, active) VALUES (:name, :key, :active)"),
+                               {"name": name, "key": key, "active": True})
+            known[key] = connection.execute(text("SELECT id FROM trainers WHERE name_key = :key"),
+                                            {"key": key}).scalar()
+        connection.execute(
+            text("UPDATE employeeskills SET trainer_id = :id WHERE trainer = :variant AND trainer_id IS NULL"),
+            [{"id": known[key], "variant": v} for v in variants],
+        )
+    return len(known)
+
+
+# ========= Saisie =========
+def resolve_trainer(name, create=True):
+    """
+    Formateur de même clé normalisée que le texte saisi (créé au besoin), None
+    si vide. Pas de rapprochement approché : « Mario Lopez » ≠ « María López ».
+    """
+    key = normalize_name(name)
+    if not key:
+        return None
+    trainer = Trainer.query.filter_by(name_key=key).first()
+    if trainer is None and create:
+        trainer = Trainer(name=" ".join(name.split())[:100], name_key=key)
+        db.session.add(trainer)
+        db.session.flush()
+    return trainer
+
+
+def search_trainers(q, limit=10):
+    """Autocomplétion : noms dont la clé ou un mot de la clé commence par `q`."""
+    key = normalize_name(q)
+    query = Trainer.query.filter(Trainer.active.is_(True))
+    if key:
+        query = query.filter(db.or_(Trainer.name_key.like(f"{key}%"), Trainer.name_key.like(f"% {key}%")))
+    return query.order_by(Trainer.name_key).limit(limit).all()
+
+
+# ========= Rapports =========
+def requalification_cutoff():
+    return date.today() - timedelta(days=current_app.config.get("REQUALIFICATION_DAYS", 365))
+
+
+def workload():
+    """[(Trainer, évaluations, requalifications en attente)] pour tous les formateurs."""
+    es = EmployeeSkill
+    pending = func.sum(db.case((es.last_assessed < requalification_cutoff(), 1), else_=0))
+    counts = {row.trainer_id: (row.total, row.pending or 0) for row in db.session.execute(
+        select(es.trainer_id, func.count(es.id).label("total"), pending.label("pending"))
+        .where(es.trainer_id.isnot(None)).group_by(es.trainer_id))}
+    return [(t, *counts.get(t.id, (0, 0))) for t in Trainer.query.order_by(Trainer.name_key).all()]
+
+
+def assessments_per_month(trainer_id, months=12):
+    """
+    [(année, mois, nb)] sur les `months` derniers mois, d'après l'historique :
+    chaque attribution / réévaluation compte, pas seulement la dernière.
+    """
+    h = EmployeeSkillHistory
+    today = date.today()
+    first = today.year * 12 + today.month - 1 - (months - 1)  # mois absolu du début de fenêtre
+    start = date(first // 12, first % 12 + 1, 1)
+    year, month = extract("year", h.changed_at), extract("month", h.changed_at)
+    rows = db.session.execute(
+        select(year.label("year"), month.label("month"), func.count(h.id))
+        .where(h.trainer_id == trainer_id, h.changed_at >= start, h.change_type.notin_(("remove", "transfer")))
+        .group_by(year, month).order_by(year, month)
+    ).all()
+    return [(int(y), int(m), n) for y, m, n in rows]
+
+
+def pending_requalifications(trainer_id, limit=500):
+    """Affectations du formateur évaluées avant la date limite de requalification (plus anciennes d'abord)."""
+    return db.session.execute(
+        select(EmployeeSkill.id, EmployeeSkill.employee_id, EmployeeSkill.level, EmployeeSkill.last_assessed,
+               Employee.first_name, Employee.last_name, Employee.plant, Skill.skill_name, Skill.category)
+        .join(Employee, Employee.id == EmployeeSkill.employee_id)
+        .join(Skill, Skill.id == EmployeeSkill.skill_id)
+        .where(EmployeeSkill.trainer_id == trainer_id, EmployeeSkill.last_assessed < requalification_cutoff())
+        .order_by(EmployeeSkill.last_assessed)
+        .limit(limit)
+    ).all()
@@ -1,4 +1,4 @@
-from flask import request
+from flask import request, abort
 from flask_login import current_user
 from models import AuditLog, db
 
@@ -14,3 +14,25 @@ def audit(action, entity_type=None, entity_id=None, details=None):
         user_agent = request.headers.get("User-Agent")
     )
     db.session.add(log)
+
+def admin_required():
+    if not current_user.is_authenticated or current_user.role != "admin":
+        abort(403)
+
+def audit_log(action, entity_type=None, entity_id=None, details=None):
+    """📜 Enregistre chaque action utilisateur dans AuditLog"""
+    try:
+        log = AuditLog(
+            user_id=current_user.id if getattr(current_user, "is_authenticated", False) else None,
+            action=action,
+            entity_type=entity_type,
+            entity_id=str(entity_id) if entity_id is not None else None,
+            details=details or {},
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get("User-Agent")
+        )
+        db.session.add(log)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print("⚠️ Erreur d’enregistrement dans AuditLog :", e)